@@ -1,5 +1,6 @@
 import streamlit as st
 
+from src.data.storage import iniciar
 from src.ui.sidebar import render_sidebar
 from src.ui.dashboard import page_dashboard
 from src.ui.clientes import page_clientes
@@ -15,6 +16,7 @@ st.set_page_config(
     layout="wide"
 )
 
+iniciar()
 page = render_sidebar()
 
 if page == "Dashboard":
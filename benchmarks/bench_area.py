@@ -0,0 +1,142 @@
+"""
+Benchmark de velocidade e precisão da área projetada (XY).
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_area [--faces 10000 100000 1000000] [--completo]
+        [--formas caixa esfera ...] [--motores raster-normal exata ...]
+        [--saida benchmarks/resultados/x.json] [--comparar anterior.json]
+
+Para cada forma x tamanho x motor: tempo de parede (melhor de --repeticoes),
+pico de memória (tracemalloc, só o processo principal) e erro relativo contra
+a área analítica. O JSON leva o commit do git para comparar execuções.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+
+from benchmarks.malhas import FORMAS
+from src.calc.area_adaptativa import area_adaptativa_xy_mm2
+from src.calc.area_exata import projected_area_exact_xy_mm2
+from src.calc.area_projetada import MIN_FACES_PARALELO, projected_area_xy_mm2, workers_padrao
+
+RAIZ = Path(__file__).resolve().parents[1]
+PASTA_RESULTADOS = RAIZ / "benchmarks" / "resultados"
+
+# mesmos presets da página (Rápido / Normal / Preciso) + motores alternativos
+MOTORES = {
+    "raster-rapido": lambda t: projected_area_xy_mm2(t, resolution=220),
+    "raster-normal": lambda t: projected_area_xy_mm2(t, resolution=350),
+    "raster-preciso": lambda t: projected_area_xy_mm2(t, resolution=500),
+    "raster-normal-paralelo": lambda t: projected_area_xy_mm2(t, resolution=350, workers=max(2, workers_padrao())),
+    "exata": projected_area_exact_xy_mm2,
+    "adaptativa-0.1%": lambda t: area_adaptativa_xy_mm2(t, tolerancia=0.001)["area_mm2"],
+}
+
+FACES_PADRAO = [10_000, 100_000, 1_000_000]
+FACES_COMPLETO = [10_000, 100_000, 1_000_000, 5_000_000]
+
+
+def _commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def medir(motor, tris: np.ndarray, area_ref: float, repeticoes: int) -> dict:
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        area = motor(tris)
+        tempos.append(time.perf_counter() - inicio)
+
+    # pico de memória numa execução à parte (tracemalloc deixa o cálculo mais lento)
+    tracemalloc.start()
+    motor(tris)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "tempo_s": min(tempos),
+        "pico_mb": pico / 2**20,
+        "area_mm2": float(area),
+        "erro_rel": (float(area) - area_ref) / area_ref,
+    }
+
+
+def comparar(atual: list[dict], anterior_json: Path):
+    anterior = json.loads(Path(anterior_json).read_text(encoding="utf-8"))
+    base = {(r["forma"], r["faces_alvo"], r["motor"]): r for r in anterior["resultados"]}
+    print(f"\nComparação com {anterior_json} (commit {anterior.get('commit')}):")
+    for r in atual:
+        b = base.get((r["forma"], r["faces_alvo"], r["motor"]))
+        if not b:
+            continue
+        print(
+            f"  {r['forma']:>15} {r['faces_alvo']:>9} {r['motor']:<24}"
+            f" tempo x{r['tempo_s'] / b['tempo_s']:.2f}"
+            f"  pico x{r['pico_mb'] / max(b['pico_mb'], 1e-9):.2f}"
+            f"  |erro| {abs(b['erro_rel']):.2e} -> {abs(r['erro_rel']):.2e}"
+        )
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.bench_area", description=__doc__.split("\n\n")[0])
+    ap.add_argument("--faces", type=int, nargs="+", help=f"tamanhos (padrão {FACES_PADRAO})")
+    ap.add_argument("--completo", action="store_true", help=f"tamanhos {FACES_COMPLETO}")
+    ap.add_argument("--formas", nargs="+", choices=list(FORMAS), default=list(FORMAS))
+    ap.add_argument("--motores", nargs="+", choices=list(MOTORES), default=list(MOTORES))
+    ap.add_argument("--repeticoes", type=int, default=3)
+    ap.add_argument("--saida", type=Path, help="JSON de saída (padrão: benchmarks/resultados/<data>-<commit>.json)")
+    ap.add_argument("--comparar", type=Path, help="JSON de uma execução anterior")
+    args = ap.parse_args(argv)
+
+    tamanhos = args.faces or (FACES_COMPLETO if args.completo else FACES_PADRAO)
+    commit = _commit()
+    resultados = []
+
+    for forma in args.formas:
+        for faces_alvo in tamanhos:
+            tris, area_ref = FORMAS[forma](faces_alvo)
+            for nome in args.motores:
+                if nome.endswith("-paralelo") and len(tris) < MIN_FACES_PARALELO:
+                    continue  # abaixo do limite o motor paralelo roda em um processo só
+                r = {"forma": forma, "faces_alvo": faces_alvo, "faces": int(len(tris)), "motor": nome, "area_ref_mm2": area_ref}
+                r.update(medir(MOTORES[nome], tris, area_ref, args.repeticoes))
+                resultados.append(r)
+                print(
+                    f"{forma:>15} {len(tris):>9} {nome:<24} {r['tempo_s']:8.3f} s"
+                    f" {r['pico_mb']:8.1f} MB  erro {r['erro_rel']:+.2e}",
+                    flush=True,
+                )
+            del tris
+
+    saida = args.saida or PASTA_RESULTADOS / f"{datetime.now():%Y%m%d-%H%M%S}-{commit or 'sem-commit'}.json"
+    saida.parent.mkdir(parents=True, exist_ok=True)
+    saida.write_text(json.dumps({
+        "commit": commit,
+        "data": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "cpus": workers_padrao(),
+        "resultados": resultados,
+    }, indent=2, ensure_ascii=False), encoding="utf-8")
+    print(f"\nResultados em {saida}")
+
+    if args.comparar:
+        comparar(resultados, args.comparar)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+"""
+Benchmark dos codecs de dados (src/data/codecs.py): tempo de gravação, tempo
+de leitura e tamanho do arquivo para coleções geradas de 10k a 100k registros.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_codecs [--registros 10000 50000 100000] [--saida x.json]
+
+Cada codec JSON é medido com o json da stdlib e, se instalado, com orjson.
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from src.data import codecs
+
+STATUS = ["ABERTA", "EM_ANDAMENTO", "PAUSADA", "CONCLUIDA"]
+
+
+def gerar_colecao(n: int, semente: int = 42) -> dict:
+    """
+    Registros no formato das OS (com horas e checklist), ids de 8 caracteres.
+    """
+    rnd = random.Random(semente)
+    data = {}
+    for i in range(n):
+        rid = f"{i:08x}"
+        data[rid] = {
+            "id": rid,
+            "doc": f"OS-2026-{i:04d}",
+            "cliente_id": f"{rnd.randrange(500):08x}",
+            "cliente_nome": f"Cliente {rnd.randrange(500)} Indústria Ltda",
+            "titulo": "Molde de injeção – tampa",
+            "status": rnd.choice(STATUS),
+            "horas": [
+                {"quando": "2026-03-01 10:00:00", "horas": f"{rnd.randrange(1, 9)}h", "descricao": "Ajustes CAD"}
+                for _ in range(rnd.randrange(6))
+            ],
+            "checklists": {
+                "produto": {
+                    "status": "CRIADO",
+                    "itens": [{"ref_id": f"item_{j}", "nome": f"Item {j}", "ok": rnd.random() < 0.5, "obs": ""} for j in range(12)],
+                },
+            },
+            "created_at": "2026-03-01 09:00:00",
+            "updated_at": "2026-03-02 17:30:00",
+        }
+    return data
+
+
+def medir(codec, data: dict, pasta: Path, repeticoes: int) -> dict:
+    path = pasta / f"colecao-{codec.nome}.dat"
+    gravar, ler = [], []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        raw = codec.dumps(data)
+        with open(path, "wb") as f:
+            f.write(raw)
+            f.flush()
+            os.fsync(f.fileno())
+        gravar.append(time.perf_counter() - t0)
+
+        t0 = time.perf_counter()
+        lido = codecs.decodificar(path.read_bytes())
+        ler.append(time.perf_counter() - t0)
+    assert len(lido) == len(data)
+    return {"gravar_s": min(gravar), "ler_s": min(ler), "bytes": path.stat().st_size}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.bench_codecs", description=__doc__.split("\n\n")[0])
+    ap.add_argument("--registros", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    ap.add_argument("--repeticoes", type=int, default=3)
+    ap.add_argument("--saida", type=Path, help="grava os resultados em JSON")
+    args = ap.parse_args(argv)
+
+    # motores JSON: stdlib sempre; orjson se instalado
+    orjson = codecs.orjson
+    motores = {"stdlib": None}
+    if orjson is not None:
+        motores["orjson"] = orjson
+    print(f"msgpack: {'sim' if codecs.msgpack is not None else 'não instalado'}")
+
+    resultados = []
+    with tempfile.TemporaryDirectory(prefix="plastcalc-codecs-") as tmp:
+        for n in args.registros:
+            data = gerar_colecao(n)
+            for motor, modulo in motores.items():
+                codecs.orjson = modulo
+                for codec in codecs.CODECS.values():
+                    if codec.nome == "binario" and codecs.msgpack is None and motor != "stdlib":
+                        continue  # mesmo que json-compacto
+                    r = {"registros": n, "codec": codec.nome, "descricao": codec.descricao, "motor_json": motor}
+                    r.update(medir(codec, data, Path(tmp), args.repeticoes))
+                    resultados.append(r)
+                    print(
+                        f"{n:>7} {codec.nome:<14} {motor:<7} gravar {r['gravar_s']:7.3f} s"
+                        f"  ler {r['ler_s']:7.3f} s  {r['bytes'] / 2**20:8.1f} MB",
+                        flush=True,
+                    )
+            codecs.orjson = orjson
+
+    if args.saida:
+        args.saida.write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Resultados em {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,131 @@
+"""
+Benchmark dos modelos tipados (src/models/registros.py) contra os dicts do
+JSON: memória ocupada e tempo de carga por coleção, de 10k registros em diante.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_modelos [--registros 10000 50000] [--saida x.json]
+
+"dict" = json.loads do arquivo; "modelos" = json.loads + de_json de cada
+registro (os dicts são descartados). A memória é a que fica alocada depois
+da carga (tracemalloc), sem contar o texto do arquivo.
+"""
+import argparse
+import gc
+import json
+import random
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.bench_codecs import gerar_colecao as gerar_os
+from src.models.registros import MODELOS
+
+CIDADES = ["Joinville", "Caxias do Sul", "Curitiba", "São Paulo", "Manaus"]
+
+
+def gerar_clientes(n: int, semente: int = 42) -> dict:
+    rnd = random.Random(semente)
+    return {
+        f"{i:08x}": {
+            "id": f"{i:08x}",
+            "nome": f"Cliente {i} Indústria Ltda",
+            "documento": f"{rnd.randrange(10**13, 10**14)}",
+            "telefone": f"(47) 9{rnd.randrange(10**7, 10**8)}",
+            "email": f"compras{i}@cliente.com.br",
+            "cidade": rnd.choice(CIDADES),
+            "observacoes": "",
+            "created_at": "2026-03-01 09:00:00",
+            "updated_at": "2026-03-02 17:30:00",
+        }
+        for i in range(n)
+    }
+
+
+def gerar_orcamentos(n: int, semente: int = 42) -> dict:
+    rnd = random.Random(semente)
+    data = {}
+    for i in range(n):
+        rid = f"{i:08x}"
+        itens = {
+            bloco: [
+                {"descricao": f"Item {j}", "qtd": rnd.randrange(1, 10), "valor_unit": round(rnd.uniform(5, 900), 2)}
+                for j in range(rnd.randrange(1, 6))
+            ]
+            for bloco in ("servicos", "materiais", "terceiros")
+        }
+        totais = {b: sum(r["qtd"] * r["valor_unit"] for r in linhas) for b, linhas in itens.items()}
+        totais["geral"] = sum(totais.values())
+        data[rid] = {
+            "id": rid,
+            "doc": f"ORC-2026-{i:04d}",
+            "cliente_id": f"{rnd.randrange(500):08x}",
+            "titulo": "Molde de injeção – tampa",
+            "validade_dias": 15,
+            "itens": itens,
+            "totais": totais,
+            "observacoes": "",
+            "status": rnd.choice(["RASCUNHO", "ENVIADO", "APROVADO"]),
+            "pv_id": "",
+            "os_id": "",
+            "created_at": "2026-03-01 09:00:00",
+            "updated_at": "2026-03-02 17:30:00",
+        }
+    return data
+
+
+GERADORES = {"clientes": gerar_clientes, "orcamentos": gerar_orcamentos, "ordens_servico": gerar_os}
+
+
+def medir(raw: bytes, carregar) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    colecao = carregar(raw)
+    tempo = time.perf_counter() - t0
+    gc.collect()
+    memoria, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del colecao
+    return {"tempo_s": tempo, "bytes": memoria}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.bench_modelos", description=__doc__.split("\n\n")[0])
+    ap.add_argument("--registros", type=int, nargs="+", default=[10_000, 50_000])
+    ap.add_argument("--saida", type=Path, help="grava os resultados em JSON")
+    args = ap.parse_args(argv)
+
+    resultados = []
+    for name, gerar in GERADORES.items():
+        cls = MODELOS[name]
+        formas = {
+            "dict": json.loads,
+            "modelos": lambda raw: {k: cls.de_json(v) for k, v in json.loads(raw).items()},
+        }
+        for n in args.registros:
+            raw = json.dumps(gerar(n), ensure_ascii=False).encode("utf-8")
+            for forma, carregar in formas.items():
+                # tempo sem o tracemalloc (que deixa tudo mais lento); memória com
+                t0 = time.perf_counter()
+                carregar(raw)
+                tempo = time.perf_counter() - t0
+                r = {"colecao": name, "registros": n, "forma": forma}
+                r.update(medir(raw, carregar))
+                r["tempo_s"] = tempo
+                r["mb_por_10k"] = r["bytes"] / 2**20 * 10_000 / n
+                resultados.append(r)
+                print(
+                    f"{name:<15} {n:>7} {forma:<8} carga {tempo:7.3f} s  {r['bytes'] / 2**20:8.1f} MB"
+                    f"  ({r['mb_por_10k']:.1f} MB / 10k)",
+                    flush=True,
+                )
+
+    if args.saida:
+        args.saida.write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Resultados em {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
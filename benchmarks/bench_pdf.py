@@ -0,0 +1,117 @@
+"""
+Benchmark dos PDFs de Orçamento (src/pdf/motor.py): tempo, tamanho e páginas
+para orçamentos gerados com 100 a 5000 linhas de itens.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.bench_pdf [--linhas 100 1000 5000] [--saida x.json]
+
+Compara o motor com a montagem "ingênua" de antes (folha de estilos criada a
+cada documento, uma tabela só por bloco e um Paragraph em cada descrição).
+"""
+import argparse
+import json
+import random
+import re
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+from reportlab.lib.styles import getSampleStyleSheet
+from reportlab.platypus import Paragraph, Spacer, Table
+
+from src.pdf import motor
+
+DESCRICOES = [
+    "Usinagem de cavidade",
+    "Eletrodo de cobre",
+    "Aço P20 beneficiado",
+    "Tratamento térmico e nitretação da placa porta-machos, com certificado do fornecedor",
+    "Polimento espelhado",
+    "Bucha de injeção",
+]
+
+
+def gerar_orcamento(linhas: int, semente: int = 42) -> dict:
+    """
+    Orçamento com `linhas` itens repartidos entre serviços, materiais e terceiros.
+    """
+    rnd = random.Random(semente)
+    itens = {"servicos": [], "materiais": [], "terceiros": []}
+    blocos = list(itens)
+    for i in range(linhas):
+        itens[blocos[i % 3]].append(
+            {"descricao": f"{rnd.choice(DESCRICOES)} {i}", "qtd": rnd.randrange(1, 20), "valor_unit": round(rnd.uniform(5, 900), 2)}
+        )
+    return {
+        "id": "bench",
+        "doc": "ORC-2026-0001",
+        "titulo": "Molde de injeção – tampa",
+        "status": "ENVIADO",
+        "validade_dias": 15,
+        "itens": itens,
+        "observacoes": "Gerado pelo benchmark.",
+        "created_at": "2026-03-01 09:00:00",
+    }
+
+
+def pdf_ingenuo(orc: dict) -> bytes:
+    styles = getSampleStyleSheet()
+    story = [Paragraph(f"Orçamento {orc['doc']}", styles["Title"]), Spacer(1, 8)]
+    for chave, rotulo in motor.BLOCOS_ITENS:
+        data = [["#", "Descrição", "Qtd", "Valor unit", "Total"]]
+        for i, r in enumerate(orc["itens"][chave], start=1):
+            data.append([
+                str(i), Paragraph(r["descricao"], styles["BodyText"]), str(r["qtd"]),
+                motor.dinheiro(r["valor_unit"]), motor.dinheiro(r["qtd"] * r["valor_unit"]),
+            ])
+        story.append(Paragraph(rotulo, styles["Heading2"]))
+        t = Table(data, colWidths=motor.LARGURAS_ITENS, repeatRows=1)
+        t.setStyle(motor.ESTILO_ITENS)
+        story.append(t)
+    buf = BytesIO()
+    motor.documento_a4(buf, orc["doc"]).build(story)
+    return buf.getvalue()
+
+
+def paginas(pdf: bytes) -> int:
+    return len(re.findall(rb"/Type /Page\b(?!s)", pdf))
+
+
+def medir(montar, orc: dict, repeticoes: int) -> dict:
+    tempos = []
+    for _ in range(repeticoes):
+        t0 = time.perf_counter()
+        pdf = montar(orc)
+        tempos.append(time.perf_counter() - t0)
+    return {"tempo_s": min(tempos), "bytes": len(pdf), "paginas": paginas(pdf)}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.bench_pdf", description=__doc__.split("\n\n")[0])
+    ap.add_argument("--linhas", type=int, nargs="+", default=[100, 1000, 5000])
+    ap.add_argument("--repeticoes", type=int, default=3)
+    ap.add_argument("--saida", type=Path, help="grava os resultados em JSON")
+    args = ap.parse_args(argv)
+
+    montadores = {"ingenuo": pdf_ingenuo, "motor": motor.pdf_orcamento}
+    resultados = []
+    for n in args.linhas:
+        orc = gerar_orcamento(n)
+        for nome, montar in montadores.items():
+            r = {"linhas": n, "montagem": nome}
+            r.update(medir(montar, orc, args.repeticoes))
+            resultados.append(r)
+            print(
+                f"{n:>6} {nome:<8} {r['tempo_s']:7.3f} s  {r['bytes'] / 2**10:8.1f} KB  {r['paginas']:>4} pág.",
+                flush=True,
+            )
+
+    if args.saida:
+        args.saida.write_text(json.dumps(resultados, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"Resultados em {args.saida}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""
+Malhas sintéticas com área projetada (XY) conhecida, para o benchmark de área.
+
+Cada gerador recebe um nº aproximado de faces e devolve (tris, area_ref):
+tris float32 (n, 3, 3) como sai de `ler_triangulos_stl`, area_ref em mm².
+A área de referência é a do polígono tesselado (n-ágono, não o círculo ideal),
+exceto na esfera, em que é π r² (o erro inclui a tesselação, ~1e-4 a 20k faces).
+"""
+import math
+
+import numpy as np
+import trimesh
+
+
+def _poligono_regular(r: float, n: int) -> float:
+    return 0.5 * n * r * r * math.sin(2.0 * math.pi / n)
+
+
+def _subdividir(malha: trimesh.Trimesh, faces_alvo: int) -> trimesh.Trimesh:
+    v, f = malha.vertices, malha.faces
+    while len(f) * 4 <= faces_alvo * 2:  # para no múltiplo de 4 mais próximo
+        v, f = trimesh.remesh.subdivide(v, f)
+    return trimesh.Trimesh(v, f, process=False)
+
+
+def _tris(*malhas) -> np.ndarray:
+    return np.concatenate([m.triangles for m in malhas]).astype(np.float32)
+
+
+def caixa(faces_alvo: int):
+    m = _subdividir(trimesh.creation.box((100.0, 60.0, 20.0)), faces_alvo)
+    return _tris(m), 100.0 * 60.0
+
+
+def cilindro(faces_alvo: int):
+    secoes = max(8, faces_alvo // 4)
+    m = trimesh.creation.cylinder(radius=40.0, height=30.0, sections=secoes)
+    return _tris(m), _poligono_regular(40.0, secoes)
+
+
+def placa_furos(faces_alvo: int, nx: int = 8, ny: int = 5, celula: float = 25.0, h: float = 3.0):
+    """
+    Placa nx*celula x ny*celula com um furo redondo por célula: topo e fundo
+    triangulados entre o quadrado da célula e o círculo, paredes dos furos e
+    paredes externas (com junções T: não é uma malha fechada).
+    """
+    n = max(8, int(faces_alvo / (6 * nx * ny)) // 8 * 8)
+    r = 0.3 * celula
+    ang = 2.0 * np.pi * np.arange(n + 1) / n
+    cos, sin = np.cos(ang), np.sin(ang)
+    k = 0.5 * celula / np.maximum(np.abs(cos), np.abs(sin))  # raio até o quadrado (cantos a 45°)
+
+    tris = []
+    for i in range(nx):
+        for j in range(ny):
+            cx, cy = (i + 0.5) * celula, (j + 0.5) * celula
+            circ = np.stack([cx + r * cos, cy + r * sin], axis=1)
+            quad = np.stack([cx + k * cos, cy + k * sin], axis=1)
+            a, b, c, d = circ[:-1], quad[:-1], quad[1:], circ[1:]
+            for z, inverte in ((h, False), (0.0, True)):
+                for t in ((a, b, c), (a, c, d)):
+                    t = t[::-1] if inverte else t
+                    tris.append(np.stack([np.c_[p, np.full(n, z)] for p in t], axis=1))
+            # parede do furo
+            a0, a1 = np.c_[circ[:-1], np.zeros(n)], np.c_[circ[1:], np.zeros(n)]
+            b0, b1 = np.c_[circ[:-1], np.full(n, h)], np.c_[circ[1:], np.full(n, h)]
+            tris.append(np.stack([a0, b1, a1], axis=1))
+            tris.append(np.stack([a0, b0, b1], axis=1))
+
+    W, H = nx * celula, ny * celula
+    for p0, p1 in (((0, 0), (W, 0)), ((W, 0), (W, H)), ((W, H), (0, H)), ((0, H), (0, 0))):
+        q = np.array([[*p0, 0.0], [*p1, 0.0], [*p1, h], [*p0, h]])
+        tris.append(q[[[0, 1, 2], [0, 2, 3]]])
+
+    area = W * H - nx * ny * _poligono_regular(r, n)
+    return np.concatenate(tris).astype(np.float32), area
+
+
+def placa_nervuras(faces_alvo: int, n_nervuras: int = 18):
+    """
+    Placa 200 x 120 com nervuras e ressaltos (boxes e cilindros sobrepostos, como
+    sai de CAD sem união booleana). Tudo fica dentro da placa: área = 200 x 120.
+    """
+    por_peca = max(12, faces_alvo // (n_nervuras + 1))
+    placa = _subdividir(trimesh.creation.box((200.0, 120.0, 4.0)), por_peca)
+    placa.apply_translation((100.0, 60.0, 2.0))
+    pecas = [placa]
+    for i in range(n_nervuras):
+        nervura = _subdividir(trimesh.creation.box((2.0, 110.0, 15.0)), por_peca)
+        nervura.apply_translation((10.0 + i * 10.0, 60.0, 11.0))
+        pecas.append(nervura)
+    for x in (30.0, 100.0, 170.0):
+        ressalto = trimesh.creation.cylinder(radius=6.0, height=20.0, sections=64)
+        ressalto.apply_translation((x, 60.0, 12.0))
+        pecas.append(ressalto)
+    return _tris(*pecas), 200.0 * 120.0
+
+
+def esfera(faces_alvo: int, raio: float = 50.0):
+    sub = max(0, math.ceil(math.log(max(faces_alvo, 20) / 20.0, 4)))
+    m = trimesh.creation.icosphere(subdivisions=sub, radius=raio)
+    return _tris(m), math.pi * raio * raio
+
+
+FORMAS = {
+    "caixa": caixa,
+    "cilindro": cilindro,
+    "placa_furos": placa_furos,
+    "placa_nervuras": placa_nervuras,
+    "esfera": esfera,
+}
@@ -0,0 +1,79 @@
+"""
+Teste de estresse do gerador de números (src/models/sequencias.py).
+
+Vários processos pedem números ao mesmo tempo numa pasta de dados temporária;
+ao final confere que nenhum número se repetiu e mostra lacunas e vazão.
+
+Uso (na raiz do repositório):
+    python -m benchmarks.stress_sequencias [--processos 16] [--por-processo 200]
+        [--backend json|sqlite] [--bloco 10]
+"""
+import argparse
+import multiprocessing as mp
+import os
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parents[1]
+
+
+def _trabalhador(pasta: str, n: int, prefixos: list, inicio, fila):
+    # DATA_DIR é relativo ao diretório atual: muda antes de importar o storage
+    os.chdir(pasta)
+    sys.path.insert(0, str(RAIZ))
+    from src.models.sequencias import next_doc
+
+    inicio.wait()
+    fila.put([next_doc(prefixos[i % len(prefixos)], 2026) for i in range(n)])
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m benchmarks.stress_sequencias", description=__doc__.split("\n\n")[0])
+    ap.add_argument("--processos", type=int, default=16)
+    ap.add_argument("--por-processo", type=int, default=200)
+    ap.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    ap.add_argument("--bloco", type=int, default=10, help="números reservados por ida ao disco")
+    args = ap.parse_args(argv)
+
+    os.environ["PLASTCALC_STORAGE"] = args.backend
+    os.environ["PLASTCALC_SEQ_BLOCO"] = str(args.bloco)
+    prefixos = ["ORC", "PV", "OS"]
+
+    with tempfile.TemporaryDirectory(prefix="plastcalc-seq-") as pasta:
+        ctx = mp.get_context("spawn")
+        inicio, fila = ctx.Event(), ctx.Queue()
+        procs = [
+            ctx.Process(target=_trabalhador, args=(pasta, args.por_processo, prefixos, inicio, fila))
+            for _ in range(args.processos)
+        ]
+        for p in procs:
+            p.start()
+        time.sleep(1.0)  # todos importados e esperando
+
+        t0 = time.perf_counter()
+        inicio.set()
+        docs = [d for _ in procs for d in fila.get()]
+        dt = time.perf_counter() - t0
+        for p in procs:
+            p.join()
+
+    repetidos = [d for d, c in Counter(docs).items() if c > 1]
+    print(f"backend={args.backend} bloco={args.bloco} processos={args.processos}")
+    print(f"{len(docs)} números em {dt:.2f} s ({len(docs) / dt:,.0f}/s)")
+    for prefixo in prefixos:
+        nums = sorted(int(d.rsplit("-", 1)[1]) for d in docs if d.startswith(prefixo + "-"))
+        lacunas = nums[-1] - len(nums) if nums else 0
+        print(f"  {prefixo}: {len(nums)} emitidos, maior {nums[-1] if nums else 0}, lacunas {lacunas}")
+
+    if repetidos:
+        print(f"FALHA: {len(repetidos)} número(s) repetido(s), ex.: {repetidos[:5]}")
+        return 1
+    print("OK: nenhum número repetido")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,112 +1,16 @@
-import io
-import streamlit as st
-import numpy as np
-import trimesh
-
-
-# ---------------------------
-# Helpers
-# ---------------------------
-def format_pt(value: float, decimals: int = 2) -> str:
-    s = f"{value:,.{decimals}f}"
-    return s.replace(",", "X").replace(".", ",").replace("X", ".")
-
-
-def load_stl_to_mesh(uploaded_file) -> trimesh.Trimesh:
-    data = uploaded_file.read()
-    stream = io.BytesIO(data)
-    mesh = trimesh.load(stream, file_type="stl")
-
-    if isinstance(mesh, trimesh.Scene):
-        if len(mesh.geometry) == 0:
-            raise ValueError("STL vazio.")
-        mesh = trimesh.util.concatenate(tuple(mesh.geometry.values()))
-
-    if not isinstance(mesh, trimesh.Trimesh):
-        raise ValueError("Arquivo não gerou uma malha Trimesh válida.")
-
-    if mesh.faces is None or len(mesh.faces) == 0:
-        raise ValueError("Malha sem faces (triângulos).")
-
-    return mesh
-
-
-def points_in_triangle(px, py, ax, ay, bx, by, cx, cy):
-    """
-    Teste ponto-no-triângulo 2D (barycentric) vetorizado.
-    Retorna máscara booleana com o mesmo shape de px/py.
-    """
-    v0x, v0y = cx - ax, cy - ay
-    v1x, v1y = bx - ax, by - ay
-    v2x, v2y = px - ax, py - ay
-
-    den = v0x * v1y - v1x * v0y
-    if den == 0:
-        return np.zeros_like(px, dtype=bool)
-
-    inv_den = 1.0 / den
-    u = (v2x * v1y - v1x * v2y) * inv_den
-    v = (v0x * v2y - v2x * v0y) * inv_den
-
-    return (u >= 0) & (v >= 0) & (u + v <= 1)
-
-
-def projected_area_xy_mm2(mesh: trimesh.Trimesh, resolution: int = 350) -> float:
-    """
-    Área projetada no plano XY SEM rtree e SEM shapely.
-    Método: rasterização de triângulos projetados em um grid (ocupação 2D).
-    """
-    bounds = mesh.bounds
-    min_x, min_y = bounds[0][0], bounds[0][1]
-    max_x, max_y = bounds[1][0], bounds[1][1]
+import os
 
-    if max_x <= min_x or max_y <= min_y:
-        return 0.0
-
-    xs = np.linspace(min_x, max_x, resolution)
-    ys = np.linspace(min_y, max_y, resolution)
-    dx = (max_x - min_x) / (resolution - 1)
-    dy = (max_y - min_y) / (resolution - 1)
-    pixel_area = dx * dy
-
-    occ = np.zeros((resolution, resolution), dtype=bool)  # [iy, ix]
-
-    tris = mesh.triangles[:, :, :2]  # (n,3,2)
-    # Para acelerar buscas de faixa (índices)
-    # xs e ys já são ordenados, então usamos searchsorted.
-    for tri in tris:
-        (ax, ay), (bx, by), (cx, cy) = tri
-
-        tminx = min(ax, bx, cx)
-        tmaxx = max(ax, bx, cx)
-        tminy = min(ay, by, cy)
-        tmaxy = max(ay, by, cy)
-
-        # recorte rápido: tri fora do bounds
-        if tmaxx < min_x or tminx > max_x or tmaxy < min_y or tminy > max_y:
-            continue
-
-        ix0 = int(np.searchsorted(xs, tminx, side="left"))
-        ix1 = int(np.searchsorted(xs, tmaxx, side="right"))
-        iy0 = int(np.searchsorted(ys, tminy, side="left"))
-        iy1 = int(np.searchsorted(ys, tmaxy, side="right"))
-
-        ix0 = max(0, min(ix0, resolution - 1))
-        ix1 = max(0, min(ix1, resolution))
-        iy0 = max(0, min(iy0, resolution - 1))
-        iy1 = max(0, min(iy1, resolution))
-
-        if ix1 <= ix0 or iy1 <= iy0:
-            continue
-
-        sub_x = xs[ix0:ix1]
-        sub_y = ys[iy0:iy1]
-        xx, yy = np.meshgrid(sub_x, sub_y)
-
-        inside = points_in_triangle(xx, yy, ax, ay, bx, by, cx, cy)
-        occ[iy0:iy1, ix0:ix1] |= inside
+import streamlit as st
 
-    return float(occ.sum() * pixel_area)
+from src.calc.area_adaptativa import area_adaptativa_xy_mm2
+from src.calc.area_exata import VarreduraComplexa, projected_area_exact_xy_mm2
+from src.calc.area_projetada import MIN_FACES_PARALELO, projected_area_xy_mm2, workers_padrao
+from src.calc.cache_stl import CACHE_STL, chave_stl, hash_stl
+from src.calc.direcoes import areas_por_direcao, direcoes_candidatas
+from src.calc.preprocessamento import preparar_triangulos_xy
+from src.calc.pressao import forca_fechamento
+from src.calc.stl_io import bounds_triangulos, ler_triangulos_stl, load_stl_to_mesh
+from utils.formatacao import format_pt
 
 
 # ---------------------------
@@ -137,40 +41,189 @@ uploaded = st.file_uploader("Enviar STL", type=["stl"])
 unit = st.selectbox("Unidade do STL", ["mm", "cm", "m"], index=0)
 scale = {"mm": 1.0, "cm": 10.0, "m": 1000.0}[unit]
 
-quality = st.selectbox("Qualidade do cálculo (velocidade x precisão)", ["Rápido", "Normal", "Preciso"], index=1)
-res_map = {"Rápido": 220, "Normal": 350, "Preciso": 500}
+quality = st.selectbox(
+    "Qualidade do cálculo (velocidade x precisão)",
+    ["Rápido", "Normal", "Preciso", "Exato", "Adaptativo"],
+    index=1,
+)
+# "Exato" calcula a união analítica e usa o grid "Normal" só como comparação;
+# "Adaptativo" refina só a borda da silhueta até a tolerância pedida
+res_map = {"Rápido": 220, "Normal": 350, "Preciso": 500, "Exato": 350, "Adaptativo": 0}
 resolution = res_map[quality]
 
+modo = quality
+if quality == "Adaptativo":
+    tol_pct = st.number_input(
+        "Tolerância de área (%)", min_value=0.001, max_value=5.0, value=0.1, step=0.05, format="%.3f",
+        help="Erro máximo garantido da área, relativo à área estimada.",
+    )
+    modo = f"{quality}-{tol_pct:g}"
+
+workers = st.number_input(
+    "Processos (núcleos) para malhas grandes",
+    min_value=1,
+    max_value=max(1, os.cpu_count() or 1),
+    value=workers_padrao(),
+    step=1,
+    help=f"Usado a partir de {MIN_FACES_PARALELO:,} triângulos; o resultado é o mesmo com 1 ou N processos.".replace(",", "."),
+)
+
+uma_face = st.checkbox(
+    "Projetar só as faces de um lado em malhas fechadas",
+    value=True,
+    help="Em peça fechada (watertight) as faces de cima e de baixo cobrem a mesma sombra: "
+    "usar só um lado reduz o trabalho pela metade sem mudar a área.",
+)
+if uma_face:
+    modo = f"{modo}-1face"
+
+comparar = st.checkbox(
+    "Comparar direções de injeção (±X, ±Y, ±Z)",
+    value=False,
+    help="Calcula a área projetada em cada direção com os mesmos triângulos: "
+    "a orientação do STL passa a ser conferida pelo cálculo.",
+)
+n_amostras = 0
+if comparar:
+    n_amostras = st.number_input(
+        "Direções extras (amostradas no hemisfério)", min_value=0, max_value=64, value=0, step=1,
+    )
+
 area_from_stl = None
+areas_direcoes = None
 
-if uploaded and confirm:
+if uploaded and (confirm or comparar):
     try:
-        mesh = load_stl_to_mesh(uploaded)
-        mesh.apply_scale(scale)
-
-        bounds = mesh.bounds
-        size = bounds[1] - bounds[0]
-
-        with st.spinner("Calculando área projetada (sem rtree)..."):
-            area_from_stl = projected_area_xy_mm2(mesh, resolution=resolution)
+        # o hash do upload é guardado por file_id: mudar pressão/FS não re-hasheia o arquivo
+        file_id = getattr(uploaded, "file_id", None) or f"{uploaded.name}-{uploaded.size}"
+        if st.session_state.get("stl_file_id") != file_id:
+            st.session_state["stl_file_id"] = file_id
+            st.session_state["stl_hash"] = hash_stl(uploaded.getbuffer())
+        chave = chave_stl(st.session_state["stl_hash"], scale, resolution, modo)
+
+        resultado = CACHE_STL.get(chave)
+        if resultado is None:
+            # view direta dos registros do STL: sem cópia e sem Trimesh.
+            # A escala é aplicada nos resultados (área × escala²), não nas coordenadas.
+            tris = ler_triangulos_stl(uploaded)
+            bounds = bounds_triangulos(tris)
+            faces = int(len(tris))
+            # fora: faces degeneradas, de perfil (área XY zero) e, se fechada, o lado oposto
+            tris, preparo = preparar_triangulos_xy(tris, uma_face=uma_face)
+
+            area_raster = area_exata = adaptativa = aviso = None
+            # silhuetas que se cruzam demais (VarreduraComplexa) caem para o raster
+            res_raster = resolution or res_map["Normal"]
+            with st.spinner("Calculando área projetada (sem rtree)..."):
+                if quality == "Adaptativo":
+                    try:
+                        adaptativa = area_adaptativa_xy_mm2(tris, tolerancia=tol_pct / 100.0)
+                    except VarreduraComplexa as e:
+                        aviso = f"{e} Área pelo raster {res_raster}×{res_raster}."
+                if adaptativa is None:
+                    area_raster = projected_area_xy_mm2(tris, resolution=res_raster, workers=int(workers)) * scale ** 2
+                if quality == "Exato":
+                    try:
+                        area_exata = projected_area_exact_xy_mm2(tris) * scale ** 2
+                    except VarreduraComplexa as e:
+                        aviso = f"{e} Área pelo raster {res_raster}×{res_raster}."
+
+            if adaptativa is not None:
+                area = adaptativa["area_mm2"] * scale ** 2
+            else:
+                area = area_exata if area_exata is not None else area_raster
+
+            resultado = {
+                "area_mm2": area,
+                "area_raster_mm2": area_raster,
+                "area_exata_mm2": area_exata,
+                "erro_mm2": adaptativa["erro_mm2"] * scale ** 2 if adaptativa else None,
+                "celulas": adaptativa["celulas"] if adaptativa else None,
+                "niveis": adaptativa["niveis"] if adaptativa else None,
+                "bounds": (bounds * scale).tolist(),
+                "faces": faces,
+                "preparo": preparo,
+                "watertight": None,  # só calculado sob demanda (exige Trimesh)
+                "aviso": aviso,
+                "resolution": resolution,
+            }
+            CACHE_STL.put(chave, resultado)
+
+        area_from_stl = resultado["area_mm2"]
+        area_raster = resultado["area_raster_mm2"]
+        bounds = resultado["bounds"]
+        size = [bounds[1][i] - bounds[0][i] for i in range(3)]
 
         st.success(f"Área projetada (XY): **{format_pt(area_from_stl, 2)} mm²**")
+        if resultado.get("aviso"):
+            st.warning(resultado["aviso"])
+
+        if resultado["area_exata_mm2"] is not None:
+            dif = area_raster - area_from_stl
+            dif_pct = (dif / area_from_stl * 100.0) if area_from_stl else 0.0
+            e1, e2, e3 = st.columns(3)
+            e1.metric("Área exata (mm²)", format_pt(area_from_stl, 2))
+            e2.metric(f"Área raster {resolution}×{resolution} (mm²)", format_pt(area_raster, 2))
+            e3.metric("Diferença raster − exata", f"{format_pt(dif, 2)} mm²", f"{format_pt(dif_pct, 3)} %", delta_color="off")
+
+        if resultado["erro_mm2"] is not None:
+            erro_pct = (resultado["erro_mm2"] / area_from_stl * 100.0) if area_from_stl else 0.0
+            a1, a2, a3 = st.columns(3)
+            a1.metric("Erro máximo (mm²)", f"± {format_pt(resultado['erro_mm2'], 2)}", f"± {format_pt(erro_pct, 3)} %", delta_color="off")
+            a2.metric("Células avaliadas", f"{resultado['celulas']:,}".replace(",", "."))
+            a3.metric("Níveis de refino", resultado["niveis"])
+
+        preparo = resultado.get("preparo") or {"total": resultado["faces"], "restantes": resultado["faces"]}
+        if preparo["restantes"] < preparo["total"]:
+            n = {k: f"{v:,}".replace(",", ".") for k, v in preparo.items() if isinstance(v, int)}
+            st.caption(
+                f"Pré-processamento: {n['total']} faces, {n['restantes']} projetadas "
+                f"({n['degenerados']} degeneradas, {n['de_perfil']} de perfil, "
+                f"{n['face_oposta']} do lado oposto fora do cálculo)."
+            )
 
         with st.expander("ℹ️ Informações do STL", expanded=False):
             st.write({
-                "Triângulos": int(len(mesh.faces)),
+                "Triângulos": resultado["faces"],
+                "Triângulos projetados": preparo["restantes"],
                 "Dimensões (mm) X": float(size[0]),
                 "Dimensões (mm) Y": float(size[1]),
                 "Dimensões (mm) Z": float(size[2]),
-                "Watertight (fechado)": bool(mesh.is_watertight),
-                "Resolução usada": resolution,
+                "Watertight (fechado)": "não verificado" if resultado["watertight"] is None else resultado["watertight"],
+                "Resolução usada": resolution or "adaptativa",
             })
 
+            if resultado["watertight"] is None and st.button("Verificar se a malha é fechada (watertight)"):
+                with st.spinner("Montando topologia da malha..."):
+                    watertight = bool(load_stl_to_mesh(uploaded).is_watertight)
+                # cópia: o dict do cache é compartilhado entre sessões, não se altera no lugar
+                CACHE_STL.put(chave, {**resultado, "watertight": watertight})
+                st.rerun()
+
+        if comparar:
+            # raster (grid "Normal" no modo adaptativo) em todas as direções
+            res_dir = resolution or res_map["Normal"]
+            modo_dir = f"direcoes-{int(n_amostras)}" + ("-1face" if uma_face else "")
+            chave_dir = chave_stl(st.session_state["stl_hash"], scale, res_dir, modo_dir)
+            areas_direcoes = CACHE_STL.get(chave_dir)
+            if areas_direcoes is None:
+                with st.spinner("Calculando área projetada por direção..."):
+                    areas_direcoes = areas_por_direcao(
+                        ler_triangulos_stl(uploaded),
+                        direcoes_candidatas(int(n_amostras)),
+                        resolution=res_dir,
+                        workers=int(workers),
+                        uma_face=uma_face,
+                    )
+                for linha in areas_direcoes:
+                    linha["area_mm2"] *= scale ** 2
+                CACHE_STL.put(chave_dir, areas_direcoes)
+
     except Exception as e:
         st.error(f"Erro no STL: {e}")
 
 elif uploaded and not confirm:
-    st.error("Marque a confirmação de orientação do STL para prosseguir.")
+    st.error("Marque a confirmação de orientação do STL (ou compare as direções de injeção) para prosseguir.")
 
 st.divider()
 
@@ -206,14 +259,36 @@ with c3:
 
 st.divider()
 
-forca_n = pressao_mpa * area_mm2
-forca_kn = forca_n / 1000.0
-forca_tf = forca_kn / 9.80665
-forca_tf_rec = forca_tf * fs
+forca = forca_fechamento(area_mm2, pressao_mpa, fs)
+forca_kn = forca["forca_kn"]
+forca_tf = forca["forca_tf"]
+forca_tf_rec = forca["forca_tf_rec"]
 
 m1, m2, m3 = st.columns(3)
 m1.metric("Força (kN)", format_pt(forca_kn, 2))
 m2.metric("Força (tf)", format_pt(forca_tf, 2))
 m3.metric("Força recomendada (tf)", format_pt(forca_tf_rec, 2))
 
+if areas_direcoes:
+    st.subheader("🧭 Área e força por direção de injeção")
+    tabela = []
+    for linha in areas_direcoes:
+        f_dir = forca_fechamento(linha["area_mm2"], pressao_mpa, fs)
+        tabela.append({
+            "Direção": linha["direcao"],
+            "Vetor": "(" + "; ".join(format_pt(c, 3) for c in linha["vetor"]) + ")",
+            "Área projetada (mm²)": format_pt(linha["area_mm2"], 2),
+            "Força (tf)": format_pt(f_dir["forca_tf"], 2),
+            "Força recomendada (tf)": format_pt(f_dir["forca_tf_rec"], 2),
+        })
+    st.dataframe(tabela, use_container_width=True, hide_index=True)
+
+    menor = min(areas_direcoes, key=lambda linha: linha["area_mm2"])
+    z = next(linha for linha in areas_direcoes if linha["direcao"] == "±Z")
+    if menor is not z and menor["area_mm2"] < z["area_mm2"]:
+        st.caption(
+            f"Menor área em **{menor['direcao']}** ({format_pt(menor['area_mm2'], 2)} mm²); "
+            f"no Z atual do STL: {format_pt(z['area_mm2'], 2)} mm²."
+        )
+
 st.info("✅ Este cálculo de área projetada não depende de `rtree` e funciona no Streamlit Cloud.")
@@ -1,5 +1,8 @@
 import streamlit as st
 
+from src.calc.pressao import FATORES_MATERIAL, pressao_cavidade
+from utils.formatacao import format_pt
+
 st.set_page_config(page_title="Pressão na Cavidade | PlastCalc", page_icon="🧮", layout="wide")
 st.title("📈 Pressão na Cavidade (por L/t e espessura)")
 st.caption("Estimativa baseada em tabelas: relação trajeto/espessura (L/t) × espessura da parede. Saída em bar e MPa.")
@@ -15,65 +18,6 @@ with st.expander("📌 Como funciona", expanded=False):
         """
     )
 
-# ---------------------------
-# Tabela (bar)
-# Linhas: R = L/t (sem 50:1 conforme solicitado)
-# Colunas: espessura (mm)
-# ---------------------------
-THK = [0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2, 1.3, 1.4, 1.5, 1.75, 2.0, 2.25, 2.5, 2.75, 3.0, 3.5, 4.0, 4.5, 5.0]
-RATIOS = [75, 100, 150, 200, 250]
-
-# Valores conforme a tabela da sua imagem (sem linha 50:1)
-P = {
-    75:  [400, 375, 325, 300, 270, 240, 220, 200, 180, 180, 180, 180, 180, 180, 180, 180, 180, 180, 180, 180, 180, 180],
-    100: [480, 450, 400, 370, 340, 300, 290, 280, 250, 230, 210, 190, 180, 180, 180, 180, 180, 180, 180, 180, 180, 180],
-    150: [720, 670, 580, 530, 480, 440, 425, 400, 375, 360, 340, 320, 260, 220, 210, 180, 180, 180, 180, 180, 180, 180],
-    200: [900, 850, 750, 720, 700, 630, 580, 520, 500, 450, 430, 410, 360, 320, 290, 260, 240, 220, 180, 180, 180, 180],
-    250: [1050, 1000, 900, 850, 800, 700, 660, 620, 560, 530, 500, 480, 420, 360, 330, 300, 275, 250, 225, 200, 180, 180],
-}
-
-def lerp(x, x0, x1, y0, y1):
-    if x1 == x0:
-        return y0
-    return y0 + (y1 - y0) * ((x - x0) / (x1 - x0))
-
-def clamp(v, vmin, vmax):
-    return max(vmin, min(vmax, v))
-
-def interp_pressao_bar(ratio: float, thk: float) -> float:
-    # limita ao domínio
-    ratio = clamp(ratio, min(RATIOS), max(RATIOS))
-    thk = clamp(thk, min(THK), max(THK))
-
-    # vizinhos em ratio
-    r0 = max([r for r in RATIOS if r <= ratio])
-    r1 = min([r for r in RATIOS if r >= ratio])
-
-    # vizinhos em espessura
-    t0 = max([t for t in THK if t <= thk])
-    t1 = min([t for t in THK if t >= thk])
-
-    i0 = THK.index(t0)
-    i1 = THK.index(t1)
-
-    # “quinas”
-    p_r0_t0 = P[r0][i0]
-    p_r0_t1 = P[r0][i1]
-    p_r1_t0 = P[r1][i0]
-    p_r1_t1 = P[r1][i1]
-
-    # interpola na espessura para cada linha
-    p_r0 = lerp(thk, t0, t1, p_r0_t0, p_r0_t1)
-    p_r1 = lerp(thk, t0, t1, p_r1_t0, p_r1_t1)
-
-    # interpola no ratio
-    p = lerp(ratio, r0, r1, p_r0, p_r1)
-    return float(p)
-
-def fmt_pt(x, dec=2):
-    s = f"{x:,.{dec}f}"
-    return s.replace(",", "X").replace(".", ",").replace("X", ".")
-
 # ---------------------------
 # UI
 # ---------------------------
@@ -83,45 +27,22 @@ with c1:
 with c2:
     t = st.number_input("Espessura da parede t (mm)", min_value=0.2, value=1.5, step=0.05)
 with c3:
-    material = st.selectbox(
-        "Material (fator de fluxo)",
-        [
-            "PP/PE/PS (1,0)",
-            "PA (1,2)", "PA (1,3)", "PA (1,4)",
-            "ABS/SAN (1,3)", "ABS/SAN (1,4)",
-            "POM (1,5)",
-            "PMMA/PPO (1,5)",  # você confirmou a faixa correta; mantive 1,5 como padrão
-            "PC/PVC (1,7)", "PC/PVC (2,0)",
-        ],
-        index=0
-    )
-
-fatores = {
-    "PP/PE/PS (1,0)": 1.0,
-    "PA (1,2)": 1.2,
-    "PA (1,3)": 1.3,
-    "PA (1,4)": 1.4,
-    "ABS/SAN (1,3)": 1.3,
-    "ABS/SAN (1,4)": 1.4,
-    "POM (1,5)": 1.5,
-    "PMMA/PPO (1,5)": 1.5,
-    "PC/PVC (1,7)": 1.7,
-    "PC/PVC (2,0)": 2.0,
-}
-f = fatores[material]
+    material = st.selectbox("Material (fator de fluxo)", list(FATORES_MATERIAL), index=0)
 
-ratio = L / t
-p_base_bar = interp_pressao_bar(ratio, t)
-p_final_bar = p_base_bar * f
-p_final_mpa = p_final_bar * 0.1
+pressao = pressao_cavidade(L, t, material)
+ratio = pressao["ratio"]
+p_base_bar = pressao["p_base_bar"]
+f = pressao["fator"]
+p_final_bar = pressao["p_final_bar"]
+p_final_mpa = pressao["p_final_mpa"]
 
 st.divider()
 
 m1, m2, m3, m4 = st.columns(4)
-m1.metric("Relação L/t", f"{fmt_pt(ratio, 1)}:1")
-m2.metric("Pressão base (bar)", fmt_pt(p_base_bar, 0))
-m3.metric("Fator do material", fmt_pt(f, 2))
-m4.metric("Pressão final (MPa)", fmt_pt(p_final_mpa, 2))
+m1.metric("Relação L/t", f"{format_pt(ratio, 1)}:1")
+m2.metric("Pressão base (bar)", format_pt(p_base_bar, 0))
+m3.metric("Fator do material", format_pt(f, 2))
+m4.metric("Pressão final (MPa)", format_pt(p_final_mpa, 2))
 
 st.markdown("### Resultado")
 st.write(
@@ -0,0 +1,138 @@
+import numpy as np
+
+from src.calc.area_exata import MapaCobertura, arestas_silhueta, arestas_verticais_silhueta
+from src.calc.area_projetada import _triangulos_xy
+
+# Grid inicial (N0 x N0 células) sobre o bounding box XY.
+N0 = 32
+MAX_NIVEIS = 16
+# Teto de pares (aresta x célula de borda) por nível, para limitar memória.
+MAX_PARES = 8_000_000
+
+
+def _cruza_celula(x0, y0, x1, y1, cx0, cy0, cx1, cy1) -> np.ndarray:
+    """
+    Segmento x retângulo fechado (vetorizado): caixas se sobrepõem e os quatro
+    cantos não ficam todos do mesmo lado da reta do segmento.
+    """
+    caixa = (
+        (x0 <= cx1) & (x1 >= cx0)
+        & (np.minimum(y0, y1) <= cy1) & (np.maximum(y0, y1) >= cy0)
+    )
+    dx, dy = x1 - x0, y1 - y0
+    lados = [dx * (cy - y0) - dy * (cx - x0) for cx, cy in ((cx0, cy0), (cx1, cy0), (cx0, cy1), (cx1, cy1))]
+    todos_pos = (lados[0] > 0) & (lados[1] > 0) & (lados[2] > 0) & (lados[3] > 0)
+    todos_neg = (lados[0] < 0) & (lados[1] < 0) & (lados[2] < 0) & (lados[3] < 0)
+    return caixa & ~todos_pos & ~todos_neg
+
+
+def _pares_iniciais(x0, y0, x1, y1, origem, passo):
+    """
+    Pares (aresta, célula) do nível 0 pelos retângulos de células que o
+    bounding box de cada aresta toca.
+    """
+    (ox, oy), (px, py) = origem, passo
+    ix0 = np.clip(np.floor((x0 - ox) / px), 0, N0 - 1).astype(np.int64)
+    ix1 = np.clip(np.floor((x1 - ox) / px), 0, N0 - 1).astype(np.int64)
+    iy0 = np.clip(np.floor((np.minimum(y0, y1) - oy) / py), 0, N0 - 1).astype(np.int64)
+    iy1 = np.clip(np.floor((np.maximum(y0, y1) - oy) / py), 0, N0 - 1).astype(np.int64)
+    nx, ny = ix1 - ix0 + 1, iy1 - iy0 + 1
+    n = nx * ny
+
+    aresta = np.repeat(np.arange(len(x0)), n)
+    k = np.arange(int(n.sum())) - np.repeat(np.cumsum(n) - n, n)
+    return aresta, ix0[aresta] + k % nx[aresta], iy0[aresta] + k // nx[aresta]
+
+
+def area_adaptativa_xy_mm2(mesh, tolerancia: float = 0.001) -> dict:
+    """
+    Área projetada (XY) por quadtree adaptativa com erro controlado.
+
+    Só as células cortadas pela borda da união ("borda") são subdivididas;
+    as demais são inteiramente cobertas ou vazias (decidido pelo centro, via
+    MapaCobertura). A área real de uma célula de borda está entre 0 e a área
+    dela, então estimativa = cheias + metade das bordas, com erro máximo =
+    metade das bordas. Para quando erro / estimativa <= tolerancia.
+
+    Retorna {"area_mm2", "erro_mm2", "erro_rel", "celulas", "niveis"}.
+    """
+    tris = _triangulos_xy(mesh)
+    vazio = {"area_mm2": 0.0, "erro_mm2": 0.0, "erro_rel": 0.0, "celulas": 0, "niveis": 0}
+    if len(tris) == 0:
+        return vazio
+
+    mapa = MapaCobertura(*arestas_silhueta(tris))
+    if len(mapa.arestas) == 0:
+        return vazio
+
+    # segmentos de borda da união: trechos de silhueta + arestas verticais
+    # (estas não entram na varredura em x, mas também separam cheio de vazio)
+    x0, y0, x1, y1 = mapa.bordas_uniao()
+    xv, yv0, yv1 = arestas_verticais_silhueta(tris)
+    x0, y0 = np.concatenate([x0, xv]), np.concatenate([y0, yv0])
+    x1, y1 = np.concatenate([x1, xv]), np.concatenate([y1, yv1])
+
+    ox, oy = min(x0.min(), x1.min()), min(y0.min(), y1.min())
+    lx = max(x0.max(), x1.max()) - ox
+    ly = max(y0.max(), y1.max()) - oy
+    if lx <= 0 or ly <= 0:
+        return vazio
+
+    passo_x, passo_y = lx / N0, ly / N0
+    aresta, ix, iy = _pares_iniciais(x0, y0, x1, y1, (ox, oy), (passo_x, passo_y))
+    n_lado = N0
+
+    area_cheia = 0.0
+    celulas = 0  # folhas já classificadas (cheias ou vazias)
+    nivel = 0
+    todas_ix, todas_iy = np.meshgrid(np.arange(N0), np.arange(N0))
+    cand_ix, cand_iy = todas_ix.ravel(), todas_iy.ravel()
+
+    while True:
+        # 1) pares que realmente cruzam a célula
+        cx0 = ox + ix * passo_x
+        cy0 = oy + iy * passo_y
+        cruza = _cruza_celula(x0[aresta], y0[aresta], x1[aresta], y1[aresta], cx0, cy0, cx0 + passo_x, cy0 + passo_y)
+        aresta, ix, iy = aresta[cruza], ix[cruza], iy[cruza]
+
+        # 2) células de borda deste nível e as demais candidatas (cheias/vazias)
+        chave_borda = np.unique(iy * n_lado + ix)
+        chave_cand = cand_iy * n_lado + cand_ix
+        livre = ~np.isin(chave_cand, chave_borda, assume_unique=True)
+        lx_livre, ly_livre = cand_ix[livre], cand_iy[livre]
+        if len(lx_livre):
+            cheia = mapa.contagem(ox + (lx_livre + 0.5) * passo_x, oy + (ly_livre + 0.5) * passo_y) > 0
+            area_cheia += float(cheia.sum()) * passo_x * passo_y
+            celulas += len(lx_livre)
+
+        area_borda = len(chave_borda) * passo_x * passo_y
+        estimativa = area_cheia + 0.5 * area_borda
+        erro = 0.5 * area_borda
+        pares_filhos = 4 * len(aresta)
+        if (
+            len(chave_borda) == 0
+            or erro <= tolerancia * estimativa
+            or nivel >= MAX_NIVEIS
+            or pares_filhos > MAX_PARES
+        ):
+            break
+
+        # 3) subdivide as células de borda: candidatos = 4 filhos de cada uma
+        bx, by = chave_borda % n_lado, chave_borda // n_lado
+        filho = np.arange(4)
+        cand_ix = (2 * bx[:, None] + filho % 2).ravel()
+        cand_iy = (2 * by[:, None] + filho // 2).ravel()
+        aresta = np.repeat(aresta, 4)
+        ix = (2 * np.repeat(ix, 4) + np.tile(filho % 2, len(ix)))
+        iy = (2 * np.repeat(iy, 4) + np.tile(filho // 2, len(iy)))
+        n_lado *= 2
+        passo_x, passo_y = passo_x / 2, passo_y / 2
+        nivel += 1
+
+    return {
+        "area_mm2": float(estimativa),
+        "erro_mm2": float(erro),
+        "erro_rel": float(erro / estimativa) if estimativa else 0.0,
+        "celulas": int(celulas + len(chave_borda)),
+        "niveis": nivel,
+    }
@@ -0,0 +1,325 @@
+import numpy as np
+
+from src.calc.area_projetada import _triangulos_xy
+
+# Pares (faixa x aresta) processados por vez na varredura.
+PARES_POR_LOTE = 2_000_000
+# Limite de rodadas para achar cruzamentos dentro de uma faixa.
+MAX_REFINOS = 64
+# Teto de pares de um lote depois de dividir as faixas nos cruzamentos (em
+# múltiplos do lote inicial). Silhuetas que se cruzam muito (ex.: centenas de
+# triângulos sobrepostos ao acaso) fazem os pares crescerem ~ arestas²; acima
+# disso a varredura desiste em vez de levar minutos.
+FATOR_MAX_REFINADOS = 2
+
+
+class VarreduraComplexa(ValueError):
+    """
+    Silhueta com cruzamentos demais para a varredura exata: use o raster.
+    """
+
+
+def _vertices_ccw(tris: np.ndarray):
+    """
+    Triângulos XY não degenerados, orientados no sentido anti-horário, como
+    (vertices, indices): vertices é complexo (x + iy, ordena por x e depois y).
+    """
+    t = np.ascontiguousarray(np.asarray(tris, dtype=np.float64)[:, :, :2]) + 0.0  # normaliza -0.0
+    a, b, c = t[:, 0], t[:, 1], t[:, 2]
+    den = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (c[:, 0] - a[:, 0])
+    ok = den != 0
+    t = t[ok]
+    horario = den[ok] < 0
+    t[horario] = t[horario][:, [0, 2, 1]]
+
+    vert, vid = np.unique(t.reshape(-1, 2).view(np.complex128).ravel(), return_inverse=True)
+    return vert, vid.reshape(-1, 3)
+
+
+def arestas_silhueta(tris: np.ndarray):
+    """
+    Arestas que delimitam a união dos triângulos projetados em XY.
+
+    Cada triângulo é orientado no sentido anti-horário; ao longo de uma reta
+    vertical ele soma +1 ao cruzar a aresta de baixo (que vai para +x) e -1 ao
+    cruzar a de cima. Somando esses pesos por aresta (chave = extremos), as
+    arestas internas entre faces de mesma orientação se cancelam e sobram só
+    as de silhueta/borda, com o salto de "cobertura" que provocam.
+
+    Retorna (x0, y0, x1, y1, peso) com x0 < x1. Arestas verticais são descartadas
+    (não cortam retas verticais).
+    """
+    vert, vid = _vertices_ccw(tris)
+    n_vert = len(vert)
+
+    p = np.concatenate([vid[:, 0], vid[:, 1], vid[:, 2]])
+    q = np.concatenate([vid[:, 1], vid[:, 2], vid[:, 0]])
+    px, qx = vert.real[p], vert.real[q]
+    nao_vertical = px != qx
+    p, q, px, qx = p[nao_vertical], q[nao_vertical], px[nao_vertical], qx[nao_vertical]
+
+    para_direita = px < qx
+    peso = np.where(para_direita, 1, -1)
+    esq = np.where(para_direita, p, q)
+    dir_ = np.where(para_direita, q, p)
+
+    chave, inversa = np.unique(esq * n_vert + dir_, return_inverse=True)
+    soma = np.bincount(inversa, weights=peso, minlength=len(chave)).astype(np.int64)
+    fica = soma != 0
+    e, d = vert[chave[fica] // n_vert], vert[chave[fica] % n_vert]
+    return e.real, e.imag, d.real, d.imag, soma[fica]
+
+
+def arestas_verticais_silhueta(tris: np.ndarray):
+    """
+    Arestas verticais (x constante) de silhueta/borda, pelo mesmo cancelamento
+    de pesos de `arestas_silhueta`, mas ao longo de retas horizontais.
+    Retorna (x, y0, y1) com y0 < y1.
+    """
+    vert, vid = _vertices_ccw(tris)
+    n_vert = len(vert)
+
+    p = np.concatenate([vid[:, 0], vid[:, 1], vid[:, 2]])
+    q = np.concatenate([vid[:, 1], vid[:, 2], vid[:, 0]])
+    vertical = vert.real[p] == vert.real[q]
+    p, q = p[vertical], q[vertical]
+
+    # anti-horário: subindo, o interior fica à esquerda (-x)
+    subindo = vert.imag[p] < vert.imag[q]
+    peso = np.where(subindo, -1, 1)
+    baixo = np.where(subindo, p, q)
+    cima = np.where(subindo, q, p)
+
+    chave, inversa = np.unique(baixo * n_vert + cima, return_inverse=True)
+    soma = np.bincount(inversa, weights=peso, minlength=len(chave)).astype(np.int64)
+    fica = soma != 0
+    b, c = vert[chave[fica] // n_vert], vert[chave[fica] % n_vert]
+    return b.real, b.imag, c.imag
+
+
+def _y_em(x, x0, y0, x1, y1):
+    return y0 + (x - x0) * ((y1 - y0) / (x1 - x0))
+
+
+def _pares(xb, x0, x1):
+    """
+    Pares (faixa, aresta) para as faixas [xb[s], xb[s+1]] totalmente cobertas
+    pelo intervalo [x0, x1] de cada aresta.
+    """
+    s0 = np.searchsorted(xb, x0, side="left")
+    s1 = np.minimum(np.searchsorted(xb, x1, side="left"), len(xb) - 1)
+    n = np.maximum(s1 - s0, 0)
+    total = int(n.sum())
+    aresta = np.repeat(np.arange(len(n)), n)
+    inicio = np.cumsum(n) - n
+    faixa = s0[aresta] + (np.arange(total) - inicio[aresta])
+    return faixa, aresta
+
+
+def _cruzamentos(xb, faixa, x0, y0, x1, y1):
+    """
+    Abscissas onde arestas vizinhas (na ordem em y no meio da faixa) trocam de
+    ordem dentro da faixa. Se a ordem numa borda difere da ordem no meio, algum
+    par vizinho está invertido nessa borda; repetir até não haver inversões
+    encontra todos os cruzamentos. Comparar com o meio (e não com uma borda)
+    evita que empates numéricos em cruzamentos já achados escondam os demais.
+    """
+    xl, xr = xb[faixa], xb[faixa + 1]
+    xm = 0.5 * (xl + xr)
+    ym = _y_em(xm, x0, y0, x1, y1)
+    ordem = np.lexsort((ym, faixa))
+    f, xl, xr = faixa[ordem], xl[ordem], xr[ordem]
+    yl = _y_em(xl, x0[ordem], y0[ordem], x1[ordem], y1[ordem])
+    yr = _y_em(xr, x0[ordem], y0[ordem], x1[ordem], y1[ordem])
+
+    mesma = f[:-1] == f[1:]
+    inv = mesma & ((yl[:-1] > yl[1:]) | (yr[:-1] > yr[1:]))
+    if not inv.any():
+        return np.empty(0)
+
+    i = np.nonzero(inv)[0]
+    j = i + 1
+    da = yr[i] - yl[i]
+    db = yr[j] - yl[j]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frac = (yl[j] - yl[i]) / (da - db)
+        x = xl[i] + frac * (xr[i] - xl[i])
+    return x[(x > xl[i]) & (x < xr[i])]
+
+
+def varrer_faixas(x0, y0, x1, y1):
+    """
+    Varredura em x sobre as arestas de silhueta.
+
+    Gera lotes (xb, faixa, aresta) onde `xb` são as bordas das faixas do lote e,
+    dentro de cada faixa, nenhuma aresta cruza outra: a ordem vertical das
+    arestas é fixa e o comprimento coberto numa reta vertical varia linearmente.
+
+    VarreduraComplexa se os cruzamentos não se esgotam em MAX_REFINOS rodadas
+    ou se os pares do lote passam de FATOR_MAX_REFINADOS x o lote inicial
+    (nunca devolve faixas com cruzamentos dentro).
+    """
+    if len(x0) == 0:
+        return
+
+    xs = np.unique(np.concatenate([x0, x1]))
+    # distribui as faixas em lotes com ~PARES_POR_LOTE pares cada
+    s0 = np.searchsorted(xs, x0)
+    s1 = np.searchsorted(xs, x1)
+    ativos = np.zeros(len(xs) + 1, dtype=np.int64)
+    np.add.at(ativos, s0, 1)
+    np.add.at(ativos, s1, -1)
+    acumulado = np.cumsum(np.cumsum(ativos)[:-1])
+
+    inicio = 0
+    n_faixas = len(xs) - 1
+    while inicio < n_faixas:
+        base = acumulado[inicio - 1] if inicio else 0
+        fim = int(np.searchsorted(acumulado, base + PARES_POR_LOTE, side="right"))
+        fim = min(max(fim, inicio + 1), n_faixas)
+
+        xa, xz = xs[inicio], xs[fim]
+        sel = (x0 < xz) & (x1 > xa)
+        idx = np.nonzero(sel)[0]
+        ex0, ey0, ex1, ey1 = x0[idx], y0[idx], x1[idx], y1[idx]
+
+        xb = xs[inicio:fim + 1]
+        teto = None
+        for _ in range(MAX_REFINOS):
+            faixa, aresta = _pares(xb, ex0, ex1)
+            if teto is None:
+                teto = FATOR_MAX_REFINADOS * max(len(faixa), PARES_POR_LOTE)
+            elif len(faixa) > teto:
+                raise VarreduraComplexa(
+                    f"Silhueta com cruzamentos demais para a varredura ({len(faixa)} pares num lote)."
+                )
+            novos = _cruzamentos(xb, faixa, ex0[aresta], ey0[aresta], ex1[aresta], ey1[aresta])
+            if len(novos) == 0:
+                break
+            xb = np.union1d(xb, novos)
+        else:
+            raise VarreduraComplexa(f"Cruzamentos da silhueta não convergiram em {MAX_REFINOS} rodadas.")
+
+        yield xb, faixa, idx[aresta]
+        inicio = fim
+
+
+def projected_area_exact_xy_mm2(mesh) -> float:
+    """
+    Área exata da união dos triângulos projetados no plano XY (sem shapely).
+
+    Só as arestas de silhueta participam. A varredura em x divide o plano em
+    faixas sem cruzamentos; em cada uma o comprimento coberto L(x) é linear,
+    então largura x L(meio da faixa) é a área exata da faixa.
+    Custo ~ O(P log P), com P = pares (faixa, aresta de silhueta ativa).
+    P cresce com o quadrado das arestas quando a silhueta se cruza muito
+    (triângulos sobrepostos ao acaso, não malhas de peças): nesse caso
+    levanta VarreduraComplexa e quem chama cai para o raster.
+    """
+    tris = _triangulos_xy(mesh)
+    if len(tris) == 0:
+        return 0.0
+
+    x0, y0, x1, y1, peso = arestas_silhueta(tris)
+
+    area = 0.0
+    for xb, faixa, aresta in varrer_faixas(x0, y0, x1, y1):
+        if len(faixa) == 0:
+            continue
+        xm = 0.5 * (xb[faixa] + xb[faixa + 1])
+        ym = _y_em(xm, x0[aresta], y0[aresta], x1[aresta], y1[aresta])
+
+        ordem = np.lexsort((ym, faixa))
+        f, ym, w = faixa[ordem], ym[ordem], peso[aresta][ordem]
+
+        # cobertura logo acima de cada aresta (soma acumulada dentro da faixa)
+        acum = np.cumsum(w)
+        inicio_faixa = np.r_[True, f[1:] != f[:-1]]
+        base = np.maximum.accumulate(np.where(inicio_faixa, np.arange(len(f)), 0))
+        antes = np.r_[0, acum[:-1]]
+        cobertura = acum - antes[base]
+
+        coberto = (cobertura[:-1] > 0) & (f[:-1] == f[1:])
+        comprimento = np.bincount(
+            f[:-1][coberto], weights=(ym[1:] - ym[:-1])[coberto], minlength=len(xb) - 1
+        )
+        area += float(np.dot(comprimento, np.diff(xb)))
+
+    return area
+
+
+class MapaCobertura:
+    """
+    Localização de pontos sobre as arestas de silhueta: quantas camadas de
+    triângulos cobrem cada ponto (x, y), sem testar triângulo a triângulo.
+
+    Guarda, para cada faixa da varredura, as arestas ativas ordenadas em y;
+    a cobertura num ponto é a soma dos pesos das arestas abaixo dele,
+    achada por busca binária vetorizada dentro da faixa.
+    """
+
+    def __init__(self, x0, y0, x1, y1, peso):
+        self.x0, self.y0, self.x1, self.y1, self.peso = x0, y0, x1, y1, peso
+
+        bordas, faixas, arestas = [], [], []
+        n_faixas = 0
+        for xb, faixa, aresta in varrer_faixas(x0, y0, x1, y1):
+            xm = 0.5 * (xb[faixa] + xb[faixa + 1])
+            ym = _y_em(xm, x0[aresta], y0[aresta], x1[aresta], y1[aresta])
+            ordem = np.lexsort((ym, faixa))
+            bordas.append(xb if not bordas else xb[1:])
+            faixas.append(faixa[ordem] + n_faixas)
+            arestas.append(aresta[ordem])
+            n_faixas += len(xb) - 1
+
+        self.xb = np.concatenate(bordas) if bordas else np.empty(0)
+        self.faixa = np.concatenate(faixas) if faixas else np.empty(0, dtype=np.int64)
+        self.arestas = np.concatenate(arestas) if arestas else np.empty(0, dtype=np.int64)
+        self.offsets = np.searchsorted(self.faixa, np.arange(n_faixas + 1))
+        self.acumulado = np.r_[0, np.cumsum(peso[self.arestas])]
+
+    @classmethod
+    def de_triangulos(cls, tris):
+        return cls(*arestas_silhueta(tris))
+
+    def bordas_uniao(self):
+        """
+        Trechos (por faixa) das arestas que são borda da união: cobertura zero
+        de um dos lados. Dobras internas (ex.: 2 -> 4 camadas) ficam de fora.
+        Retorna (x0, y0, x1, y1).
+        """
+        pos = np.arange(len(self.arestas))
+        acima = self.acumulado[pos + 1] - self.acumulado[self.offsets[self.faixa]]
+        abaixo = acima - self.peso[self.arestas]
+        borda = (acima == 0) | (abaixo == 0)
+
+        e, f = self.arestas[borda], self.faixa[borda]
+        xa, xz = self.xb[f], self.xb[f + 1]
+        x0, y0, x1, y1 = self.x0[e], self.y0[e], self.x1[e], self.y1[e]
+        return xa, _y_em(xa, x0, y0, x1, y1), xz, _y_em(xz, x0, y0, x1, y1)
+
+    def contagem(self, px, py) -> np.ndarray:
+        px = np.asarray(px, dtype=np.float64)
+        py = np.asarray(py, dtype=np.float64)
+        cont = np.zeros(px.shape, dtype=np.int64)
+        if len(self.xb) < 2:
+            return cont
+
+        dentro = (px >= self.xb[0]) & (px < self.xb[-1])
+        qx, qy = px[dentro], py[dentro]
+        s = np.searchsorted(self.xb, qx, side="right") - 1
+        inicio = self.offsets[s]
+        lo, hi = inicio.copy(), self.offsets[s + 1].copy()
+
+        ativo = lo < hi
+        while ativo.any():
+            i = np.nonzero(ativo)[0]
+            meio = (lo[i] + hi[i]) // 2
+            e = self.arestas[meio]
+            abaixo = _y_em(qx[i], self.x0[e], self.y0[e], self.x1[e], self.y1[e]) <= qy[i]
+            lo[i] = np.where(abaixo, meio + 1, lo[i])
+            hi[i] = np.where(abaixo, hi[i], meio)
+            ativo = lo < hi
+
+        cont[dentro] = self.acumulado[lo] - self.acumulado[inicio]
+        return cont
@@ -0,0 +1,288 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Orçamento de "linhas de varredura" (pares triângulo x linha do grid) por lote.
+# Limita a memória temporária: ~10 arrays float64 desse tamanho por lote.
+SPANS_POR_LOTE = 1_000_000
+# Abaixo disso o custo de subir processos não compensa: roda no processo atual.
+MIN_FACES_PARALELO = 200_000
+# Lado (em pontos do grid) dos tiles distribuídos entre os processos.
+TILE_PX = 128
+
+
+def _triangulos_xy(malha_ou_tris) -> np.ndarray:
+    """
+    Aceita um trimesh.Trimesh ou um array (n,3,2|3) e devolve (n,3,2) em XY.
+    """
+    if hasattr(malha_ou_tris, "triangles"):
+        tris = malha_ou_tris.triangles
+    else:
+        tris = np.asarray(malha_ou_tris)
+    return tris[:, :, :2]
+
+
+def _grid_xy(tris: np.ndarray, resolution: int):
+    """
+    Grid de amostragem (resolution x resolution) sobre o bounding box XY.
+    Retorna (min_x, min_y, dx, dy) ou None se a projeção for degenerada.
+    """
+    # min/max por eixo sem reshape: `tris` pode ser uma view não contígua do STL
+    min_x, min_y = tris.min(axis=(0, 1)).astype(float)
+    max_x, max_y = tris.max(axis=(0, 1)).astype(float)
+
+    if max_x <= min_x or max_y <= min_y:
+        return None
+
+    dx = (max_x - min_x) / (resolution - 1)
+    dy = (max_y - min_y) / (resolution - 1)
+    return min_x, min_y, dx, dy
+
+
+def _spans_lote(tris: np.ndarray, grid, resolution: int, linhas=None):
+    """
+    Intervalos de colunas cobertos por cada triângulo em cada linha do grid.
+
+    Para um lote de triângulos (m,3,2) calcula, de forma vetorizada, todas as
+    linhas do grid que cada triângulo cruza e a faixa [ix0, ix1] de pontos
+    dessa linha que caem dentro dele (borda inclusiva, como o teste baricêntrico).
+    Retorna (iy, ix0, ix1) somente para os spans não vazios.
+    `linhas=(r0, r1)` restringe às linhas r0 <= iy < r1 (tiles).
+    """
+    min_x, min_y, dx, dy = grid
+    r0, r1 = linhas or (0, resolution)
+    t = tris.astype(np.float64, copy=False)
+    ax, ay = t[:, 0, 0], t[:, 0, 1]
+    bx, by = t[:, 1, 0], t[:, 1, 1]
+    cx, cy = t[:, 2, 0], t[:, 2, 1]
+
+    # triângulo degenerado no plano XY (aresta "de pé") não cobre nada
+    den = (cx - ax) * (by - ay) - (bx - ax) * (cy - ay)
+    ok = den != 0
+    if not ok.all():
+        ax, ay, bx, by, cx, cy = ax[ok], ay[ok], bx[ok], by[ok], cx[ok], cy[ok]
+
+    tminy = np.minimum(np.minimum(ay, by), cy)
+    tmaxy = np.maximum(np.maximum(ay, by), cy)
+    iy0 = np.maximum(np.ceil((tminy - min_y) / dy), r0).astype(np.int64)
+    iy1 = np.minimum(np.floor((tmaxy - min_y) / dy), r1 - 1).astype(np.int64)
+
+    n_linhas = np.maximum(iy1 - iy0 + 1, 0)
+    total = int(n_linhas.sum())
+    if total == 0:
+        vazio = np.empty(0, dtype=np.int64)
+        return vazio, vazio, vazio
+
+    # expande (triângulo -> linhas) sem laço Python
+    tri_idx = np.repeat(np.arange(len(n_linhas)), n_linhas)
+    inicio = np.cumsum(n_linhas) - n_linhas
+    iy = iy0[tri_idx] + (np.arange(total) - inicio[tri_idx])
+    y = min_y + iy * dy
+
+    xl = np.full(total, np.inf)
+    xr = np.full(total, -np.inf)
+    for (px, py, qx, qy) in ((ax, ay, bx, by), (bx, by, cx, cy), (cx, cy, ax, ay)):
+        px, py, qx, qy = px[tri_idx], py[tri_idx], qx[tri_idx], qy[tri_idx]
+        cruza = (y >= np.minimum(py, qy)) & (y <= np.maximum(py, qy))
+        horizontal = py == qy
+        with np.errstate(divide="ignore", invalid="ignore"):
+            x = px + (y - py) * (qx - px) / (qy - py)
+
+        inclinada = cruza & ~horizontal
+        xl = np.where(inclinada, np.minimum(xl, x), xl)
+        xr = np.where(inclinada, np.maximum(xr, x), xr)
+
+        # aresta horizontal sobre a linha: o span inclui os dois extremos
+        deitada = cruza & horizontal
+        xl = np.where(deitada, np.minimum(xl, np.minimum(px, qx)), xl)
+        xr = np.where(deitada, np.maximum(xr, np.maximum(px, qx)), xr)
+
+    with np.errstate(invalid="ignore"):
+        ix0 = np.ceil((xl - min_x) / dx)
+        ix1 = np.floor((xr - min_x) / dx)
+    valido = np.isfinite(ix0) & np.isfinite(ix1)
+    ix0 = np.maximum(ix0[valido], 0).astype(np.int64)
+    ix1 = np.minimum(ix1[valido], resolution - 1).astype(np.int64)
+    iy = iy[valido]
+
+    nao_vazio = ix0 <= ix1
+    return iy[nao_vazio], ix0[nao_vazio], ix1[nao_vazio]
+
+
+def _lotes_por_linhas(tris: np.ndarray, grid, resolution: int, linhas=None):
+    """
+    Divide os triângulos em lotes com no máximo SPANS_POR_LOTE linhas de varredura.
+    """
+    _, min_y, _, dy = grid
+    r0, r1 = linhas or (0, resolution)
+    ys = tris[:, :, 1]
+    iy0 = np.maximum(np.ceil((ys.min(axis=1) - min_y) / dy), r0)
+    iy1 = np.minimum(np.floor((ys.max(axis=1) - min_y) / dy), r1 - 1)
+    acumulado = np.cumsum(np.maximum(iy1 - iy0 + 1, 0))
+
+    inicio = 0
+    n = len(tris)
+    while inicio < n:
+        base = acumulado[inicio - 1] if inicio else 0
+        fim = int(np.searchsorted(acumulado, base + SPANS_POR_LOTE, side="right"))
+        fim = max(fim, inicio + 1)  # um triângulo enorme sozinho ainda forma um lote
+        yield inicio, min(fim, n)
+        inicio = fim
+
+
+def rasterizar_xy(tris: np.ndarray, grid, resolution: int, janela=None) -> np.ndarray:
+    """
+    Grid de ocupação ([iy, ix]) dos triângulos projetados.
+
+    Os spans de cada lote são gravados numa matriz de diferenças (+1 no início,
+    -1 após o fim de cada span); a soma acumulada por linha dá quantos triângulos
+    cobrem cada ponto, e a ocupação é "> 0".
+
+    `janela=(r0, r1, c0, c1)` rasteriza só esse bloco do grid global (tiles):
+    os spans são os mesmos do grid inteiro, apenas recortados.
+    """
+    r0, r1, c0, c1 = janela or (0, resolution, 0, resolution)
+    altura, largura = r1 - r0, c1 - c0 + 1
+    dif = np.zeros(altura * largura, dtype=np.int64)
+
+    for i0, i1 in _lotes_por_linhas(tris, grid, resolution, (r0, r1)):
+        iy, ix0, ix1 = _spans_lote(tris[i0:i1], grid, resolution, (r0, r1))
+        if janela is not None:
+            ix0, ix1 = np.maximum(ix0, c0), np.minimum(ix1, c1 - 1)
+            dentro = ix0 <= ix1
+            iy, ix0, ix1 = iy[dentro], ix0[dentro], ix1[dentro]
+        if len(iy) == 0:
+            continue
+        base = (iy - r0) * largura - c0
+        dif += np.bincount(base + ix0, minlength=dif.size)
+        dif -= np.bincount(base + ix1 + 1, minlength=dif.size)
+
+    cobertura = np.cumsum(dif.reshape(altura, largura), axis=1)[:, : largura - 1]
+    return cobertura > 0
+
+
+# ---------------------------
+# Rasterização em tiles (vários processos)
+# ---------------------------
+def _tiles(resolution: int, lado: int):
+    for r0 in range(0, resolution, lado):
+        for c0 in range(0, resolution, lado):
+            yield r0, min(r0 + lado, resolution), c0, min(c0 + lado, resolution)
+
+
+def _distribuir_em_tiles(tris: np.ndarray, grid, resolution: int, lado: int):
+    """
+    Agrupa os índices dos triângulos por tile (pelo bounding box em pontos do grid).
+    Retorna (indices, offsets): os triângulos do tile k são indices[offsets[k]:offsets[k+1]].
+    """
+    min_x, min_y, dx, dy = grid
+    n_tiles_lado = -(-resolution // lado)
+    mins, maxs = tris.min(axis=1), tris.max(axis=1)
+
+    def faixa(vmin, vmax, origem, passo):
+        i0 = np.clip(np.ceil((vmin - origem) / passo), 0, resolution - 1).astype(np.int64) // lado
+        i1 = np.clip(np.floor((vmax - origem) / passo), 0, resolution - 1).astype(np.int64) // lado
+        return i0, i1
+
+    tx0, tx1 = faixa(mins[:, 0], maxs[:, 0], min_x, dx)
+    ty0, ty1 = faixa(mins[:, 1], maxs[:, 1], min_y, dy)
+    nx, ny = tx1 - tx0 + 1, ty1 - ty0 + 1
+
+    # expande (triângulo -> tiles do seu retângulo de tiles)
+    n = nx * ny
+    tri = np.repeat(np.arange(len(tris)), n)
+    k = np.arange(int(n.sum())) - np.repeat(np.cumsum(n) - n, n)
+    tile = (ty0[tri] + k // nx[tri]) * n_tiles_lado + (tx0[tri] + k % nx[tri])
+
+    ordem = np.argsort(tile, kind="stable")
+    offsets = np.searchsorted(tile[ordem], np.arange(n_tiles_lado ** 2 + 1))
+    return tri[ordem], offsets
+
+
+def _para_memoria_compartilhada(arr: np.ndarray):
+    shm = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+    np.ndarray(arr.shape, dtype=arr.dtype, buffer=shm.buf)[...] = arr
+    return shm, (shm.name, arr.shape, arr.dtype.str)
+
+
+def _rasterizar_tile(ref_tris, ref_idx, faixa_idx, grid, resolution, janela):
+    """
+    Executado no processo filho: lê triângulos e índices da memória compartilhada
+    e devolve a ocupação do tile compactada em bits.
+    """
+    shm_t = shared_memory.SharedMemory(name=ref_tris[0])
+    shm_i = shared_memory.SharedMemory(name=ref_idx[0])
+    try:
+        tris = np.ndarray(ref_tris[1], dtype=ref_tris[2], buffer=shm_t.buf)
+        idx = np.ndarray(ref_idx[1], dtype=ref_idx[2], buffer=shm_i.buf)
+        sub = tris[idx[faixa_idx[0]:faixa_idx[1]]]
+        occ = rasterizar_xy(sub, grid, resolution, janela)
+        del tris, idx
+    finally:
+        shm_t.close()
+        shm_i.close()
+    return janela, np.packbits(occ)
+
+
+def rasterizar_xy_paralelo(tris: np.ndarray, grid, resolution: int, workers: int, lado: int = TILE_PX) -> np.ndarray:
+    """
+    Mesma ocupação de `rasterizar_xy`, dividindo o grid em tiles processados
+    num ProcessPoolExecutor. Triângulos e índices por tile vão por memória
+    compartilhada; cada tile volta compactado (packbits) e é montado no grid final.
+    """
+    tris = np.ascontiguousarray(tris)
+    indices, offsets = _distribuir_em_tiles(tris, grid, resolution, lado)
+
+    occ = np.zeros((resolution, resolution), dtype=bool)
+    shm_t, ref_tris = _para_memoria_compartilhada(tris)
+    shm_i, ref_idx = _para_memoria_compartilhada(indices)
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futuros = []
+            for k, janela in enumerate(_tiles(resolution, lado)):
+                if offsets[k + 1] == offsets[k]:
+                    continue
+                futuros.append(pool.submit(
+                    _rasterizar_tile, ref_tris, ref_idx, (int(offsets[k]), int(offsets[k + 1])),
+                    grid, resolution, janela,
+                ))
+            for futuro in futuros:
+                (r0, r1, c0, c1), bits = futuro.result()
+                n = (r1 - r0) * (c1 - c0)
+                occ[r0:r1, c0:c1] = np.unpackbits(bits, count=n).astype(bool).reshape(r1 - r0, c1 - c0)
+    finally:
+        for shm in (shm_t, shm_i):
+            shm.close()
+            shm.unlink()
+    return occ
+
+
+def workers_padrao() -> int:
+    return max(1, min(8, os.cpu_count() or 1))
+
+
+def projected_area_xy_mm2(mesh, resolution: int = 350, workers: int | None = None) -> float:
+    """
+    Área projetada no plano XY SEM rtree e SEM shapely.
+    Método: rasterização de triângulos projetados em um grid (ocupação 2D),
+    vetorizada por lotes de triângulos (varredura por linhas do grid).
+
+    `workers > 1` divide o grid em tiles entre processos (malhas com pelo menos
+    MIN_FACES_PARALELO faces); o resultado é idêntico ao de um processo só.
+    """
+    tris = _triangulos_xy(mesh)
+    if len(tris) == 0:
+        return 0.0
+
+    grid = _grid_xy(tris, resolution)
+    if grid is None:
+        return 0.0
+
+    _, _, dx, dy = grid
+    if workers and workers > 1 and len(tris) >= MIN_FACES_PARALELO:
+        occ = rasterizar_xy_paralelo(tris, grid, resolution, workers)
+    else:
+        occ = rasterizar_xy(tris, grid, resolution)
+    return float(occ.sum() * dx * dy)
@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Dict
+
+from utils.cache_lru import CacheLRU
+
+# Nível em disco desligado por padrão; PLASTCALC_CACHE_STL_DIR=<pasta> liga
+# (fora de data/, de preferência: não é dado do negócio).
+PASTA_CACHE_STL = Path(os.environ["PLASTCALC_CACHE_STL_DIR"]) if os.environ.get("PLASTCALC_CACHE_STL_DIR") else None
+
+
+def hash_stl(data) -> str:
+    """
+    Hash do conteúdo do STL (bytes ou memoryview), independente do nome do arquivo.
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def chave_stl(hash_conteudo: str, scale: float, resolution: int, modo: str = "") -> str:
+    return f"{hash_conteudo}-{scale:g}-{resolution}-{modo}"
+
+
+class CacheSTL:
+    """
+    Resultados derivados da malha (área, bounds, nº de faces, watertight...),
+    indexados por conteúdo do STL + escala + resolução.
+
+    Nível 1: LRU em memória (compartilhado entre reruns e sessões do processo).
+    Nível 2 (opcional, `pasta`): um JSON por chave, sobrevive a reinícios.
+    Gravado em temporário + rename: outra sessão nunca lê uma entrada pela metade.
+    """
+
+    def __init__(self, max_itens: int = 64, pasta: Path | None = None, max_arquivos: int = 512):
+        self.memoria = CacheLRU(max_itens=max_itens)
+        self.pasta = pasta
+        self.max_arquivos = max_arquivos
+
+    def _arquivo(self, chave: str) -> Path:
+        return self.pasta / f"{chave}.json"
+
+    def get(self, chave: str) -> Dict[str, Any] | None:
+        resultado = self.memoria.get(chave)
+        if resultado is not None or self.pasta is None:
+            return resultado
+
+        path = self._arquivo(chave)
+        if not path.exists():
+            return None
+        try:
+            resultado = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            return None
+        self.memoria.put(chave, resultado)
+        return resultado
+
+    def put(self, chave: str, resultado: Dict[str, Any]) -> None:
+        self.memoria.put(chave, resultado)
+        if self.pasta is None:
+            return
+        tmp = None
+        try:
+            self.pasta.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.pasta, prefix=f"{chave}.", suffix=".tmp", delete=False
+            ) as f:
+                tmp = f.name
+                f.write(json.dumps(resultado, ensure_ascii=False))
+            os.replace(tmp, self._arquivo(chave))
+            self._podar_disco()
+        except OSError:
+            # cache em disco é só otimização: falha de escrita não pode quebrar a página
+            if tmp is not None:
+                Path(tmp).unlink(missing_ok=True)
+
+    def _podar_disco(self) -> None:
+        arquivos = list(self.pasta.glob("*.json"))
+        if len(arquivos) <= self.max_arquivos:
+            return
+        arquivos.sort(key=lambda p: p.stat().st_mtime)
+        for path in arquivos[: len(arquivos) - self.max_arquivos]:
+            path.unlink(missing_ok=True)
+
+
+CACHE_STL = CacheSTL(pasta=PASTA_CACHE_STL)
@@ -0,0 +1,77 @@
+import numpy as np
+
+from src.calc.area_projetada import projected_area_xy_mm2
+from src.calc.preprocessamento import malha_fechada, preparar_triangulos_xy
+
+# d e -d projetam no mesmo plano (mesma área): basta um vetor por eixo
+EIXOS = {
+    "±X": (1.0, 0.0, 0.0),
+    "±Y": (0.0, 1.0, 0.0),
+    "±Z": (0.0, 0.0, 1.0),
+}
+
+
+def direcoes_candidatas(n_amostras: int = 0) -> list[tuple[str, np.ndarray]]:
+    """
+    Eixos ±X, ±Y, ±Z + `n_amostras` direções quaisquer, espalhadas de forma
+    uniforme no hemisfério z >= 0 (espiral de Fibonacci).
+    """
+    direcoes = [(nome, np.array(v)) for nome, v in EIXOS.items()]
+    if n_amostras <= 0:
+        return direcoes
+
+    i = np.arange(n_amostras) + 0.5
+    z = 1.0 - i / n_amostras
+    r = np.sqrt(1.0 - z * z)
+    phi = np.pi * (3.0 - np.sqrt(5.0)) * i
+    for x, y, zz in zip(r * np.cos(phi), r * np.sin(phi), z):
+        theta = np.degrees(np.arccos(zz))
+        az = np.degrees(np.arctan2(y, x)) % 360.0
+        direcoes.append((f"θ={theta:.0f}° φ={az:.0f}°", np.array([x, y, zz])))
+    return direcoes
+
+
+def rotacao_para_z(d) -> np.ndarray:
+    """
+    Rotação (3x3) que leva a direção `d` para +Z: linhas = (u, v, d) ortonormais,
+    com u x v = d (não espelha a malha).
+    """
+    d = np.asarray(d, dtype=np.float64)
+    d = d / np.linalg.norm(d)
+    # com d = +Z sai a identidade (mesmo grid do cálculo principal)
+    aux = np.array([0.0, 1.0, 0.0]) if abs(d[1]) < 0.9 else np.array([1.0, 0.0, 0.0])
+    u = np.cross(aux, d)
+    u /= np.linalg.norm(u)
+    v = np.cross(d, u)
+    return np.stack([u, v, d])
+
+
+def areas_por_direcao(
+    tris: np.ndarray,
+    direcoes: list[tuple[str, np.ndarray]],
+    resolution: int = 350,
+    workers: int | None = None,
+    uma_face: bool = True,
+) -> list[dict]:
+    """
+    Área projetada (raster) no plano perpendicular a cada direção.
+
+    Os triângulos já lidos são reaproveitados: por direção, uma multiplicação
+    de matriz (tris @ R.T) e o mesmo cálculo de área do plano XY. A topologia
+    (malha fechada) não muda com a rotação e é verificada uma vez só.
+
+    Retorna [{"direcao", "vetor", "area_mm2", "faces"}] na ordem de `direcoes`.
+    """
+    fechada = malha_fechada(tris) if uma_face else None
+    resultados = []
+    for nome, d in direcoes:
+        R = rotacao_para_z(d).astype(tris.dtype)
+        rot = tris @ R.T
+        rot, preparo = preparar_triangulos_xy(rot, uma_face=uma_face, fechada=fechada)
+        resultados.append({
+            "direcao": nome,
+            "vetor": [float(c) for c in d],
+            "area_mm2": projected_area_xy_mm2(rot, resolution=resolution, workers=workers),
+            "faces": preparo["restantes"],
+        })
+    return resultados
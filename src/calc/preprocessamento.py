@@ -0,0 +1,91 @@
+import numpy as np
+
+
+def _ids_vertices(tris: np.ndarray) -> np.ndarray:
+    """
+    Índice de vértice (n, 3) por coordenada exata (STL repete os vértices por face).
+    """
+    pts = np.asarray(tris, dtype=np.float64).reshape(-1, 3) + 0.0  # normaliza -0.0
+    ordem = np.lexsort((pts[:, 2], pts[:, 1], pts[:, 0]))
+    ordenados = pts[ordem]
+    novo = np.r_[True, np.any(ordenados[1:] != ordenados[:-1], axis=1)]
+    ids = np.empty(len(pts), dtype=np.int64)
+    ids[ordem] = np.cumsum(novo) - 1
+    return ids.reshape(-1, 3)
+
+
+def malha_fechada(tris: np.ndarray) -> bool:
+    """
+    Fechada e com orientação consistente: cada aresta orientada (a -> b) aparece
+    uma única vez e a oposta (b -> a) também. É o que garante que toda reta
+    vertical que atravessa a peça cruza uma face "para cima" e outra "para baixo".
+    Não monta Trimesh (só ordenações sobre as arestas).
+    """
+    if len(tris) == 0:
+        return False
+    vid = _ids_vertices(tris)
+    n_vert = int(vid.max()) + 1
+    a = np.concatenate([vid[:, 0], vid[:, 1], vid[:, 2]])
+    b = np.concatenate([vid[:, 1], vid[:, 2], vid[:, 0]])
+
+    diretas = np.sort(a * n_vert + b)
+    if np.any(diretas[1:] == diretas[:-1]):
+        return False
+    opostas = np.sort(b * n_vert + a)
+    return bool(np.array_equal(diretas, opostas))
+
+
+def preparar_triangulos_xy(tris: np.ndarray, uma_face: bool = True, fechada: bool | None = None):
+    """
+    Pré-processamento antes da projeção em XY.
+
+    - remove triângulos degenerados (área zero em 3D)
+    - remove faces "de perfil" (área zero em XY: não somam área projetada)
+    - com `uma_face=True` e malha fechada, mantém só um sentido de face
+      (as voltadas para cima ou para baixo, o que tiver menos faces): numa peça
+      fechada cada ponto da sombra é coberto pelos dois, então a área não muda.
+
+    `fechada` já conhecida (ex.: mesma malha em outra orientação) evita refazer
+    a verificação de topologia.
+
+    Retorna (tris, relatorio). Sem remoções, devolve o próprio array (sem cópia).
+    """
+    total = len(tris)
+    relatorio = {
+        "total": total,
+        "degenerados": 0,
+        "de_perfil": 0,
+        "face_oposta": 0,
+        "fechada": None,
+        "restantes": total,
+    }
+    if total == 0:
+        return tris, relatorio
+
+    t = np.asarray(tris, dtype=np.float64)
+    u = t[:, 1] - t[:, 0]
+    v = t[:, 2] - t[:, 0]
+    normal = np.cross(u, v)
+    degenerado = ~np.any(normal != 0, axis=1)
+    # mesmo critério do rasterizador (componente z da normal = área XY com sinal)
+    de_perfil = ~degenerado & (normal[:, 2] == 0)
+    manter = ~degenerado & ~de_perfil
+
+    relatorio["degenerados"] = int(degenerado.sum())
+    relatorio["de_perfil"] = int(de_perfil.sum())
+
+    if uma_face:
+        if fechada is None:
+            fechada = malha_fechada(tris)
+        relatorio["fechada"] = fechada
+        if fechada:
+            para_cima = manter & (normal[:, 2] > 0)
+            para_baixo = manter & (normal[:, 2] < 0)
+            sentido = para_cima if para_cima.sum() <= para_baixo.sum() else para_baixo
+            relatorio["face_oposta"] = int(manter.sum() - sentido.sum())
+            manter = sentido
+
+    relatorio["restantes"] = int(manter.sum())
+    if relatorio["restantes"] == total:
+        return tris, relatorio
+    return tris[manter], relatorio
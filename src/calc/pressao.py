@@ -0,0 +1,127 @@
+# ---------------------------
+# Tabela (bar)
+# Linhas: R = L/t (sem 50:1 conforme solicitado)
+# Colunas: espessura (mm)
+# ---------------------------
+THK = [0.4, 0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 1.1, 1.2, 1.3, 1.4, 1.5, 1.75, 2.0, 2.25, 2.5, 2.75, 3.0, 3.5, 4.0, 4.5, 5.0]
+RATIOS = [75, 100, 150, 200, 250]
+
+# Valores conforme a tabela da sua imagem (sem linha 50:1)
+P = {
+    75:  [400, 375, 325, 300, 270, 240, 220, 200, 180, 180, 180, 180, 180, 180, 180, 180, 180, 180, 180, 180, 180, 180],
+    100: [480, 450, 400, 370, 340, 300, 290, 280, 250, 230, 210, 190, 180, 180, 180, 180, 180, 180, 180, 180, 180, 180],
+    150: [720, 670, 580, 530, 480, 440, 425, 400, 375, 360, 340, 320, 260, 220, 210, 180, 180, 180, 180, 180, 180, 180],
+    200: [900, 850, 750, 720, 700, 630, 580, 520, 500, 450, 430, 410, 360, 320, 290, 260, 240, 220, 180, 180, 180, 180],
+    250: [1050, 1000, 900, 850, 800, 700, 660, 620, 560, 530, 500, 480, 420, 360, 330, 300, 275, 250, 225, 200, 180, 180],
+}
+
+# Fator de fluxo por material (rótulos usados na página de pressão)
+FATORES_MATERIAL = {
+    "PP/PE/PS (1,0)": 1.0,
+    "PA (1,2)": 1.2,
+    "PA (1,3)": 1.3,
+    "PA (1,4)": 1.4,
+    "ABS/SAN (1,3)": 1.3,
+    "ABS/SAN (1,4)": 1.4,
+    "POM (1,5)": 1.5,
+    "PMMA/PPO (1,5)": 1.5,  # você confirmou a faixa correta; mantive 1,5 como padrão
+    "PC/PVC (1,7)": 1.7,
+    "PC/PVC (2,0)": 2.0,
+}
+
+G = 9.80665  # kN -> tf
+
+
+def lerp(x, x0, x1, y0, y1):
+    if x1 == x0:
+        return y0
+    return y0 + (y1 - y0) * ((x - x0) / (x1 - x0))
+
+
+def clamp(v, vmin, vmax):
+    return max(vmin, min(vmax, v))
+
+
+def interp_pressao_bar(ratio: float, thk: float) -> float:
+    # limita ao domínio
+    ratio = clamp(ratio, min(RATIOS), max(RATIOS))
+    thk = clamp(thk, min(THK), max(THK))
+
+    # vizinhos em ratio
+    r0 = max([r for r in RATIOS if r <= ratio])
+    r1 = min([r for r in RATIOS if r >= ratio])
+
+    # vizinhos em espessura
+    t0 = max([t for t in THK if t <= thk])
+    t1 = min([t for t in THK if t >= thk])
+
+    i0 = THK.index(t0)
+    i1 = THK.index(t1)
+
+    # “quinas”
+    p_r0_t0 = P[r0][i0]
+    p_r0_t1 = P[r0][i1]
+    p_r1_t0 = P[r1][i0]
+    p_r1_t1 = P[r1][i1]
+
+    # interpola na espessura para cada linha
+    p_r0 = lerp(thk, t0, t1, p_r0_t0, p_r0_t1)
+    p_r1 = lerp(thk, t0, t1, p_r1_t0, p_r1_t1)
+
+    # interpola no ratio
+    p = lerp(ratio, r0, r1, p_r0, p_r1)
+    return float(p)
+
+
+def fator_material(material) -> float:
+    """
+    Aceita o rótulo da tabela ("ABS/SAN (1,3)"), só a família ("ABS", "pa") ou
+    o próprio fator ("1,3" / 1.3). Só a família dá o MAIOR fator dela ("PA" ->
+    1,4): mais pressão, força de fechamento a favor da segurança.
+    """
+    if isinstance(material, (int, float)):
+        return float(material)
+    nome = str(material).strip()
+    if nome in FATORES_MATERIAL:
+        return FATORES_MATERIAL[nome]
+    try:
+        return float(nome.replace(",", "."))
+    except ValueError:
+        pass
+    alvo = nome.upper()
+    familia = [f for rotulo, f in FATORES_MATERIAL.items() if alvo in rotulo.split(" (")[0].split("/")]
+    if familia:
+        return max(familia)
+    raise ValueError(f"Material desconhecido: {material!r}. Use um de: {', '.join(FATORES_MATERIAL)}")
+
+
+def pressao_cavidade(L: float, t: float, material="PP/PE/PS (1,0)") -> dict:
+    """
+    Pressão na cavidade pela tabela L/t x espessura, com fator do material.
+    """
+    ratio = L / t
+    p_base_bar = interp_pressao_bar(ratio, t)
+    f = fator_material(material)
+    p_final_bar = p_base_bar * f
+    return {
+        "ratio": ratio,
+        "p_base_bar": p_base_bar,
+        "fator": f,
+        "p_final_bar": p_final_bar,
+        "p_final_mpa": p_final_bar * 0.1,
+    }
+
+
+def forca_fechamento(area_mm2: float, pressao_mpa: float, fs: float = 1.0) -> dict:
+    """
+    Força = pressão (MPa = N/mm²) × área (mm²), em N, kN e tf; `forca_tf_rec` com o fator de segurança.
+    """
+    forca_n = pressao_mpa * area_mm2
+    forca_kn = forca_n / 1000.0
+    forca_tf = forca_kn / G
+    return {
+        "forca_n": forca_n,
+        "forca_kn": forca_kn,
+        "forca_tf": forca_tf,
+        "forca_tf_rec": forca_tf * fs,
+    }
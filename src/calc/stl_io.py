@@ -0,0 +1,99 @@
+import re
+from pathlib import Path
+
+import numpy as np
+
+# Registro binário: normal (3 float32) + 3 vértices (9 float32) + atributo (uint16) = 50 bytes
+DTYPE_STL_BINARIO = np.dtype([
+    ("normal", "<f4", (3,)),
+    ("vertices", "<f4", (3, 3)),
+    ("atributo", "<u2"),
+])
+CABECALHO_STL = 84  # 80 bytes livres + uint32 com o nº de triângulos
+
+_RE_VERTEX = re.compile(rb"vertex\s+(\S+)\s+(\S+)\s+(\S+)")
+
+
+def _bytes_stl(fonte):
+    """
+    Buffer somente-leitura com o conteúdo do STL, sem cópia quando possível:
+    - caminho (str/Path): memmap do arquivo
+    - bytes/bytearray/memoryview: usado diretamente
+    - objeto com getbuffer() (BytesIO/UploadedFile do Streamlit): view do buffer interno
+    """
+    if isinstance(fonte, (str, Path)):
+        return np.memmap(fonte, dtype=np.uint8, mode="r")
+    if hasattr(fonte, "getbuffer"):
+        return np.frombuffer(fonte.getbuffer(), dtype=np.uint8)
+    return np.frombuffer(fonte, dtype=np.uint8)
+
+
+def _n_binario(buf) -> int | None:
+    if len(buf) < CABECALHO_STL:
+        return None
+    n = int(buf[80:84].view("<u4")[0])
+    if len(buf) < CABECALHO_STL + n * DTYPE_STL_BINARIO.itemsize:
+        return None
+    return n
+
+
+def _eh_ascii(buf, n_binario: int | None) -> bool:
+    if bytes(buf[:5]).lower() != b"solid":
+        return False
+    # alguns exportadores gravam "solid" no cabeçalho do binário (e outros deixam
+    # bytes sobrando no fim): se os n triângulos cabem no arquivo, é binário. Num
+    # ASCII os bytes 80-84 são texto e dão n > 150 milhões (> 7 GB), que não cabe.
+    return not n_binario
+
+
+def ler_triangulos_stl(fonte) -> np.ndarray:
+    """
+    Triângulos do STL como array (n, 3, 3) em unidades do arquivo.
+
+    Binário: view direta dos registros de 50 bytes (np.frombuffer/memmap), sem
+    copiar coordenadas e sem montar Trimesh. ASCII: parse das linhas "vertex".
+    """
+    buf = _bytes_stl(fonte)
+    n = _n_binario(buf)
+
+    if _eh_ascii(buf, n):
+        coords = _RE_VERTEX.findall(bytes(buf))
+        if len(coords) % 3 != 0:
+            raise ValueError("STL ASCII inválido (nº de vértices não é múltiplo de 3).")
+        tris = np.array(coords, dtype=np.float64).reshape(-1, 3, 3)
+    elif n is not None:
+        registros = np.frombuffer(buf, dtype=DTYPE_STL_BINARIO, count=n, offset=CABECALHO_STL)
+        tris = registros["vertices"]
+    else:
+        raise ValueError("Arquivo não é um STL válido (binário truncado ou ASCII sem 'solid').")
+
+    if len(tris) == 0:
+        raise ValueError("Malha sem faces (triângulos).")
+    return tris
+
+
+def bounds_triangulos(tris: np.ndarray) -> np.ndarray:
+    """
+    Bounding box [[min x,y,z], [max x,y,z]] sem achatar (não copia o array).
+    """
+    return np.array([tris.min(axis=(0, 1)), tris.max(axis=(0, 1))], dtype=np.float64)
+
+
+def malha_de_triangulos(tris: np.ndarray):
+    """
+    Monta um trimesh.Trimesh (com fusão de vértices) a partir dos triângulos.
+    Só necessário para consultas de topologia (watertight etc.).
+    """
+    import trimesh
+
+    vertices = np.asarray(tris, dtype=np.float64).reshape(-1, 3)
+    faces = np.arange(len(vertices)).reshape(-1, 3)
+    return trimesh.Trimesh(vertices=vertices, faces=faces, process=True)
+
+
+def load_stl_to_mesh(fonte):
+    """
+    Trimesh completo (com fusão de vértices). Só para consultas de topologia;
+    o cálculo de área usa os triângulos crus de `ler_triangulos_stl`.
+    """
+    return malha_de_triangulos(ler_triangulos_stl(fonte))
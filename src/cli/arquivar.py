@@ -0,0 +1,36 @@
+"""
+Manutenção: move OS concluídas e ORC/PV antigos para o arquivo morto
+(data/arquivo/<coleção>-<ano>.json.gz). Ver src/data/arquivo.py.
+
+Uso:
+    python -m src.cli.arquivar [--dias 365] [--colecoes ordens_servico orcamentos vendas_pv] [--simular]
+
+OS saem assim que concluídas; ORC/PV só sem alteração há mais de `--dias` dias
+(padrão PLASTCALC_ARQUIVO_DIAS ou 365). Rodar com o app parado ou fora do horário
+de uso.
+"""
+import argparse
+import sys
+
+from src.data import arquivo
+from src.data.storage import flush, iniciar
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m src.cli.arquivar", description=__doc__.split("\n\n")[0])
+    ap.add_argument("--dias", type=int, default=arquivo.DIAS_PADRAO, help="idade mínima de ORC/PV (OS: só o status)")
+    ap.add_argument("--colecoes", nargs="+", choices=list(arquivo.COLECOES), default=list(arquivo.COLECOES))
+    ap.add_argument("--simular", action="store_true", help="só conta, não move nada")
+    args = ap.parse_args(argv)
+
+    iniciar()
+    movidos = arquivo.arquivar(args.colecoes, dias=args.dias, simular=args.simular)
+    flush()
+    verbo = "seriam arquivados" if args.simular else "arquivados"
+    for name, n in movidos.items():
+        print(f"{name}: {n} registro(s) {verbo}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
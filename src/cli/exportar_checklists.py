@@ -0,0 +1,53 @@
+"""
+Exporta os checklists (Produto e Molde) das OS em lote.
+
+Uso:
+    python -m src.cli.exportar_checklists --saida checklists.zip|.pdf
+        [--status CONCLUIDA EM_ANDAMENTO] [--de 2026-09-01] [--ate 2026-09-30] [--workers N]
+
+.zip: um PDF por checklist, montados em paralelo; .pdf: todos num documento só
+(até 200 OS, montado em memória). As datas filtram pela última alteração da OS
+(inclusive). OS já arquivadas também entram.
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from src.data.storage import iniciar
+from src.pdf.lote import LIMITE_PDF_UNICO, exportar_pdf_unico, exportar_zip, selecionar_os
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m src.cli.exportar_checklists", description=__doc__.split("\n\n")[0])
+    ap.add_argument("--saida", type=Path, required=True, help="arquivo .zip ou .pdf")
+    ap.add_argument("--status", nargs="+", default=[], help="status da OS (padrão: todos)")
+    ap.add_argument("--de", default="", help="AAAA-MM-DD")
+    ap.add_argument("--ate", default="", help="AAAA-MM-DD")
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    sufixo = args.saida.suffix.lower()
+    if sufixo not in (".zip", ".pdf"):
+        ap.error("--saida deve terminar em .zip ou .pdf")
+
+    iniciar()
+    ids = selecionar_os(args.status, args.de, args.ate)
+    print(f"{len(ids)} OS selecionada(s)", flush=True)
+    if sufixo == ".pdf" and len(ids) > LIMITE_PDF_UNICO:
+        ap.error(f".pdf vai até {LIMITE_PDF_UNICO} OS ({len(ids)} selecionadas): use .zip")
+    t0 = time.perf_counter()
+    if sufixo == ".zip":
+        n = exportar_zip(
+            ids, args.saida, workers=args.workers,
+            progresso=lambda feitas: print(f"\r{feitas}/{len(ids)} OS", end="", file=sys.stderr, flush=True),
+        )
+        print(file=sys.stderr)
+    else:
+        n = exportar_pdf_unico(ids, str(args.saida))
+    print(f"{n} checklist(s) em {args.saida} ({time.perf_counter() - t0:.1f} s)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
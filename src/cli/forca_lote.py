@@ -0,0 +1,194 @@
+"""
+Força de fechamento em lote (sem Streamlit).
+
+Uso:
+    python -m src.cli.forca_lote PASTA [--manifesto PASTA/manifesto.csv]
+        [--saida resultados.csv|.jsonl|.json] [--workers N] [--resolucao 350] [--unidade mm]
+
+Manifesto CSV (separador "," ou ";", decimais com "," ou "."):
+    arquivo;L;t;material;fs
+    tampa.stl;150;1,5;ABS;1,2
+
+`material` aceita o rótulo da página de pressão ("ABS/SAN (1,3)"), só a família
+("ABS") ou o fator ("1,3"). `fs` é opcional (padrão 1,2).
+Cada peça é gravada na saída assim que termina (ordem de conclusão).
+"""
+import argparse
+import csv
+import json
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from src.calc.area_projetada import projected_area_xy_mm2, workers_padrao
+from src.calc.preprocessamento import preparar_triangulos_xy
+from src.calc.pressao import forca_fechamento, pressao_cavidade
+from src.calc.stl_io import ler_triangulos_stl
+
+FS_PADRAO = 1.2
+ESCALAS = {"mm": 1.0, "cm": 10.0, "m": 1000.0}
+
+CAMPOS = [
+    "arquivo", "faces", "area_mm2", "L", "t", "material", "fator", "ratio",
+    "pressao_bar", "pressao_mpa", "fs", "forca_kn", "forca_tf", "forca_tf_rec",
+    "tempo_s", "erro",
+]
+
+
+def _num(valor, padrao=None) -> float:
+    valor = (valor or "").strip()
+    if not valor:
+        if padrao is None:
+            raise ValueError("valor numérico obrigatório vazio")
+        return padrao
+    return float(valor.replace(",", "."))
+
+
+def ler_manifesto(caminho: Path) -> list[dict]:
+    """
+    Linhas do manifesto com L, t, fs já convertidos (cabeçalho sem diferenciar maiúsculas).
+    ValueError se o arquivo estiver vazio (ou só com BOM/linhas em branco).
+    """
+    texto = Path(caminho).read_text(encoding="utf-8-sig").splitlines()
+    cabecalho = next((linha for linha in texto if linha.strip()), None)
+    if cabecalho is None:
+        raise ValueError(f"Manifesto vazio: {caminho}")
+    try:
+        delimitador = csv.Sniffer().sniff(cabecalho, delimiters=";,").delimiter
+    except csv.Error:  # uma coluna só
+        delimitador = ","
+    linhas = []
+    for i, linha in enumerate(csv.DictReader(texto, delimiter=delimitador), start=2):
+        linha = {(k or "").strip().lower(): (v or "").strip() for k, v in linha.items()}
+        if not linha.get("arquivo"):
+            continue
+        try:
+            linhas.append({
+                "arquivo": linha["arquivo"],
+                "L": _num(linha.get("l")),
+                "t": _num(linha.get("t")),
+                "material": linha.get("material") or "PP/PE/PS (1,0)",
+                "fs": _num(linha.get("fs"), FS_PADRAO),
+            })
+        except ValueError as e:
+            raise ValueError(f"Manifesto, linha {i}: {e}") from e
+    return linhas
+
+
+def calcular_peca(caminho_stl: str, linha: dict, resolucao: int, escala: float) -> dict:
+    """
+    Uma peça: área projetada XY (mesmo cálculo da página) + pressão (tabela L/t) + força.
+    Erros viram a coluna "erro" para não derrubar o lote.
+    """
+    inicio = time.perf_counter()
+    res = {campo: None for campo in CAMPOS}
+    res.update({k: linha[k] for k in ("arquivo", "L", "t", "material", "fs")})
+    try:
+        tris = ler_triangulos_stl(caminho_stl)
+        res["faces"] = int(len(tris))
+        tris, _ = preparar_triangulos_xy(tris)
+        area = projected_area_xy_mm2(tris, resolution=resolucao) * escala ** 2
+
+        pressao = pressao_cavidade(linha["L"], linha["t"], linha["material"])
+        forca = forca_fechamento(area, pressao["p_final_mpa"], linha["fs"])
+        res.update({
+            "area_mm2": area,
+            "fator": pressao["fator"],
+            "ratio": pressao["ratio"],
+            "pressao_bar": pressao["p_final_bar"],
+            "pressao_mpa": pressao["p_final_mpa"],
+            "forca_kn": forca["forca_kn"],
+            "forca_tf": forca["forca_tf"],
+            "forca_tf_rec": forca["forca_tf_rec"],
+        })
+    except Exception as e:
+        res["erro"] = str(e)
+    res["tempo_s"] = round(time.perf_counter() - inicio, 3)
+    return res
+
+
+class SaidaStream:
+    """
+    Grava um resultado por vez e dá flush: CSV, JSON Lines (.jsonl) ou
+    array JSON (.json, fechado em `fechar`).
+    """
+
+    def __init__(self, destino=None):
+        self.arquivo = open(destino, "w", encoding="utf-8", newline="") if destino else sys.stdout
+        sufixo = Path(destino).suffix.lower() if destino else ".csv"
+        self.formato = {".jsonl": "jsonl", ".json": "json"}.get(sufixo, "csv")
+        self.n = 0
+        if self.formato == "csv":
+            self.csv = csv.DictWriter(self.arquivo, fieldnames=CAMPOS)
+            self.csv.writeheader()
+        elif self.formato == "json":
+            self.arquivo.write("[\n")
+
+    def gravar(self, resultado: dict):
+        if self.formato == "csv":
+            self.csv.writerow(resultado)
+        elif self.formato == "jsonl":
+            self.arquivo.write(json.dumps(resultado, ensure_ascii=False) + "\n")
+        else:
+            sep = ",\n" if self.n else ""
+            self.arquivo.write(sep + json.dumps(resultado, ensure_ascii=False))
+        self.n += 1
+        self.arquivo.flush()
+
+    def fechar(self):
+        if self.formato == "json":
+            self.arquivo.write("\n]\n")
+        if self.arquivo is not sys.stdout:
+            self.arquivo.close()
+        else:
+            self.arquivo.flush()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m src.cli.forca_lote", description="Força de fechamento para uma pasta de STLs.")
+    ap.add_argument("pasta", type=Path, help="pasta com os arquivos STL")
+    ap.add_argument("--manifesto", type=Path, help="CSV com arquivo, L, t, material, fs (padrão: PASTA/manifesto.csv)")
+    ap.add_argument("--saida", help="arquivo .csv, .jsonl ou .json (padrão: CSV na saída padrão)")
+    ap.add_argument("--workers", type=int, default=workers_padrao(), help="processos em paralelo (uma peça por processo)")
+    ap.add_argument("--resolucao", type=int, default=350, help="grid do raster (220 rápido, 350 normal, 500 preciso)")
+    ap.add_argument("--unidade", choices=list(ESCALAS), default="mm", help="unidade dos STLs")
+    args = ap.parse_args(argv)
+
+    manifesto = args.manifesto or args.pasta / "manifesto.csv"
+    try:
+        linhas = ler_manifesto(manifesto)
+    except (OSError, ValueError) as e:
+        ap.error(str(e))
+    if not linhas:
+        ap.error(f"Manifesto sem peças: {manifesto}")
+    listados = {linha["arquivo"] for linha in linhas}
+    # um glob só, filtrado pela extensão: em sistemas sem diferença de
+    # maiúsculas (Windows/macOS) "*.stl" e "*.STL" achariam os mesmos arquivos
+    stls = {p.resolve(): p for p in args.pasta.glob("*") if p.suffix.lower() == ".stl"}
+    for stl in sorted(stls.values()):
+        if stl.name not in listados:
+            print(f"aviso: {stl.name} fora do manifesto (ignorado)", file=sys.stderr)
+
+    escala = ESCALAS[args.unidade]
+    saida = SaidaStream(args.saida)
+    erros = 0
+    try:
+        with ProcessPoolExecutor(max_workers=max(1, args.workers)) as pool:
+            futuros = [
+                pool.submit(calcular_peca, str(args.pasta / linha["arquivo"]), linha, args.resolucao, escala)
+                for linha in linhas
+            ]
+            for i, futuro in enumerate(as_completed(futuros), start=1):
+                resultado = futuro.result()
+                saida.gravar(resultado)
+                erros += resultado["erro"] is not None
+                status = f"ERRO: {resultado['erro']}" if resultado["erro"] else f"{resultado['forca_tf_rec']:.2f} tf"
+                print(f"[{i}/{len(futuros)}] {resultado['arquivo']}: {status}", file=sys.stderr)
+    finally:
+        saida.fechar()
+    return 1 if erros else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+"""
+Migração única dos arquivos JSON (data/*.json + journal) para o SQLite
+(data/plastcalc.sqlite3). Ver src/data/storage_sqlite.py.
+
+Uso:
+    python -m src.cli.migrar_sqlite [--colecoes clientes orcamentos ...]
+
+Substitui o conteúdo das tabelas; os arquivos JSON não são alterados.
+Depois: PLASTCALC_STORAGE=sqlite streamlit run app.py
+"""
+import argparse
+import sys
+
+from src.data import storage_json, storage_sqlite
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m src.cli.migrar_sqlite", description=__doc__.split("\n\n")[0])
+    ap.add_argument("--colecoes", nargs="+", choices=list(storage_sqlite.COLECOES), default=list(storage_sqlite.COLECOES))
+    args = ap.parse_args(argv)
+
+    storage_json.recuperar_transacoes()  # copia o JSON com os lotes completos
+    for name, n in storage_sqlite.migrar_de_json(args.colecoes).items():
+        print(f"{name}: {n} registro(s) -> {storage_sqlite.DB_PATH}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""
+Arquivo morto: OS concluídas e ORC/PV antigos saem das coleções "vivas" e vão
+para arquivos compactados por ano, lidos só quando alguém pede.
+
+data/arquivo/<coleção>-<ano>.json.gz   registros arquivados daquele ano
+data/arquivo/<coleção>.indice.json     {id: {"ano": ..., doc, status, ...}}
+
+`get` do storage cai aqui quando o id não está na coleção viva; `buscar` varre
+os anos (do mais novo ao mais antigo) só quando chamada. Para arquivar:
+    python -m src.cli.arquivar [--dias 365] [--simular]
+"""
+import gzip
+import os
+import pickle
+import re
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+from src.data.codecs import CODECS, json_loads
+from src.data.storage_json import CAMPOS_INDICE, DATA_DIR, resumo
+from utils.cache_lru import CacheLRU
+
+ARQUIVO_DIR = DATA_DIR / "arquivo"
+
+# coleção -> regra: OS assim que concluída (qualquer idade); ORC/PV só pela
+# idade (sem alteração há mais de `dias`)
+COLECOES = {
+    "ordens_servico": {"status": ["CONCLUIDA"]},
+    "orcamentos": {},
+    "vendas_pv": {},
+}
+DIAS_PADRAO = int(os.environ.get("PLASTCALC_ARQUIVO_DIAS", "365"))
+
+# anos já lidos (pickle, como o cache de leitura do storage_json)
+CACHE_ANOS = CacheLRU(max_itens=8, max_bytes=64 * 2**20, tamanho=len)
+_RE_ANO_DOC = re.compile(r"-(\d{4})-\d+$")
+
+
+def _ano_path(name: str, ano: int) -> Path:
+    return ARQUIVO_DIR / f"{name}-{ano}.json.gz"
+
+
+def _indice_path(name: str) -> Path:
+    return ARQUIVO_DIR / f"{name}.indice.json"
+
+
+def _gravar_atomico(path: Path, raw: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(raw)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def ano_do_registro(registro: Dict[str, Any]) -> int:
+    """
+    Ano do número do documento (ORC-2025-0007 -> 2025); sem número, o de created_at.
+    """
+    m = _RE_ANO_DOC.search(str(registro.get("doc") or ""))
+    if m:
+        return int(m.group(1))
+    criado = str(registro.get("created_at") or "")
+    return int(criado[:4]) if criado[:4].isdigit() else datetime.now().year
+
+
+def elegivel(name: str, registro: Dict[str, Any], limite: str) -> bool:
+    """
+    Se o registro já pode ir para o arquivo. Coleção com regra de status (OS):
+    basta o status. Sem ela (ORC/PV): `limite` é "AAAA-MM-DD HH:MM:SS" e só
+    sai quem não é alterado desde antes dele.
+    """
+    regra = COLECOES.get(name)
+    if regra is None or not isinstance(registro, dict):
+        return False
+    if "status" in regra:
+        return registro.get("status") in regra["status"]
+    quando = registro.get("updated_at") or registro.get("created_at") or ""
+    return bool(quando) and quando < limite
+
+
+def indice(name: str) -> Dict[str, Dict[str, Any]]:
+    path = _indice_path(name)
+    if not path.exists():
+        return {}
+    return json_loads(path.read_bytes())
+
+
+def _ler_ano(name: str, ano: int) -> Dict[str, Any]:
+    path = _ano_path(name, ano)
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return {}
+    chave = (str(path), st.st_mtime_ns, st.st_size)
+    congelado = CACHE_ANOS.get(chave)
+    if congelado is None:
+        data = json_loads(gzip.decompress(path.read_bytes()))
+        congelado = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        CACHE_ANOS.put(chave, congelado)
+    return pickle.loads(congelado)
+
+
+def get(name: str, key: str, default: Any = None) -> Any:
+    entrada = indice(name).get(key)
+    if entrada is None:
+        return default
+    return _ler_ano(name, entrada["ano"]).get(key, default)
+
+
+def anos(name: str) -> List[int]:
+    """
+    Anos com arquivo para a coleção, do mais novo ao mais antigo.
+    """
+    prefixo = f"{name}-"
+    achados = []
+    for path in ARQUIVO_DIR.glob(f"{name}-*.json.gz"):
+        ano = path.name[len(prefixo):-len(".json.gz")]
+        if ano.isdigit():
+            achados.append(int(ano))
+    return sorted(achados, reverse=True)
+
+
+def buscar(name: str, filtro: Callable[[Dict[str, Any]], bool]) -> Iterator[Dict[str, Any]]:
+    """
+    Registros arquivados que passam no filtro, ano a ano (só abre o ano
+    seguinte se quem chama continuar consumindo).
+    """
+    for ano in anos(name):
+        for registro in _ler_ano(name, ano).values():
+            if filtro(registro):
+                yield registro
+
+
+def arquivar(colecoes=None, dias: int = DIAS_PADRAO, simular: bool = False) -> Dict[str, int]:
+    """
+    Move os registros elegíveis para o arquivo do ano de cada um. Ordem segura
+    contra queda: grava o arquivo do ano e o índice, depois apaga da coleção
+    viva (no pior caso o registro fica nos dois lugares; a coleção viva vence
+    e a próxima execução termina o serviço). Retorna registros por coleção.
+    """
+    from src.data import storage  # evita import circular (storage usa este módulo)
+
+    limite = (datetime.now() - timedelta(days=dias)).strftime("%Y-%m-%d %H:%M:%S")
+    movidos = {}
+    for name in colecoes or list(COLECOES):
+        vivos = storage.load(name)
+        saindo = {k: v for k, v in vivos.items() if elegivel(name, v, limite)}
+        movidos[name] = len(saindo)
+        if simular or not saindo:
+            continue
+
+        por_ano: Dict[int, Dict[str, Any]] = {}
+        for key, registro in saindo.items():
+            por_ano.setdefault(ano_do_registro(registro), {})[key] = registro
+        idx = indice(name)
+        campos = CAMPOS_INDICE.get(name, ["doc", "status", "updated_at"])
+        for ano, registros in por_ano.items():
+            data = _ler_ano(name, ano)
+            data.update(registros)
+            _gravar_atomico(_ano_path(name, ano), gzip.compress(CODECS["json-compacto"].dumps(data)))
+            for key, registro in registros.items():
+                idx[key] = {"ano": ano, **resumo(registro, campos)}
+        _gravar_atomico(_indice_path(name), CODECS["json-compacto"].dumps(idx))
+
+        with storage.transacao():
+            for key in saindo:
+                storage.delete(name, key)
+        if storage.BACKEND == "json":
+            from src.data import storage_json
+
+            storage_json.compactar(name)  # o arquivo da coleção encolhe já
+    return movidos
@@ -0,0 +1,91 @@
+"""
+Codecs dos arquivos de dados (snapshots e registros do storage_json).
+
+- "json":          JSON legível (indent=2), o formato de sempre
+- "json-compacto": JSON sem espaços (~metade do tamanho)
+- "binario":       msgpack se instalado; senão JSON compacto
+
+Para JSON usa orjson quando instalado (bem mais rápido), senão o json da stdlib.
+Na leitura o formato vem do próprio arquivo: msgpack começa com CABECALHO_MSGPACK,
+qualquer outra coisa é JSON. Arquivos antigos continuam legíveis com qualquer codec.
+O codec de escrita vem de PLASTCALC_CODEC (padrão "json").
+"""
+import json
+import os
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # opcional
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # opcional
+    msgpack = None
+
+CABECALHO_MSGPACK = b"PLCMSGPK\x01"
+
+
+def _json_dumps(data: Any, indent: bool) -> bytes:
+    if orjson is not None:
+        opcoes = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(data, option=opcoes)
+    if indent:
+        return json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8")
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_loads(raw) -> Any:
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+def json_linha(data: Any) -> bytes:
+    """
+    Uma linha JSON compacta (journal), com "\\n" no fim.
+    """
+    return _json_dumps(data, indent=False) + b"\n"
+
+
+class Codec:
+    def __init__(self, nome: str, dumps, descricao: str):
+        self.nome = nome
+        self.dumps = dumps
+        self.descricao = descricao
+
+    def __repr__(self) -> str:
+        return f"Codec({self.nome!r}: {self.descricao})"
+
+
+def _msgpack_dumps(data: Any) -> bytes:
+    return CABECALHO_MSGPACK + msgpack.packb(data, use_bin_type=True)
+
+
+CODECS = {
+    "json": Codec("json", lambda data: _json_dumps(data, indent=True), "JSON legível"),
+    "json-compacto": Codec("json-compacto", lambda data: _json_dumps(data, indent=False), "JSON compacto"),
+}
+if msgpack is not None:
+    CODECS["binario"] = Codec("binario", _msgpack_dumps, "msgpack")
+else:
+    CODECS["binario"] = Codec("binario", CODECS["json-compacto"].dumps, "JSON compacto (msgpack não instalado)")
+
+
+def codec_escrita() -> Codec:
+    nome = os.environ.get("PLASTCALC_CODEC", "json").strip().lower()
+    if nome not in CODECS:
+        raise ValueError(f"PLASTCALC_CODEC inválido: {nome!r} (use {', '.join(CODECS)})")
+    return CODECS[nome]
+
+
+def decodificar(raw: bytes) -> Any:
+    """
+    Detecta o formato pelo cabeçalho e decodifica.
+    """
+    if raw.startswith(CABECALHO_MSGPACK):
+        if msgpack is None:
+            raise RuntimeError("Arquivo gravado em msgpack, mas o pacote 'msgpack' não está instalado.")
+        return msgpack.unpackb(raw[len(CABECALHO_MSGPACK):], raw=False, strict_map_key=False)
+    return json_loads(raw)
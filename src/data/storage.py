@@ -0,0 +1,84 @@
+"""
+Ponto único de acesso ao armazenamento: as páginas importam daqui.
+
+PLASTCALC_STORAGE=json (padrão) -> arquivos JSON com journal (storage_json)
+PLASTCALC_STORAGE=sqlite        -> data/plastcalc.sqlite3 (storage_sqlite)
+
+`flush()` é a barreira de durabilidade do write-behind (PLASTCALC_WRITE_BEHIND_MS,
+só no JSON): depois dela, tudo o que foi gravado antes está em disco.
+
+`iniciar()` roda uma vez na partida do processo (app.py e CLIs): no JSON,
+reaplica os lotes de `transacao()` que um processo interrompido deixou no log.
+
+`get` de um id que não está na coleção viva procura no arquivo morto
+(src/data/arquivo.py), que só é lido nessa hora.
+
+Registros de clientes, orçamentos, PV e OS também saem como modelos tipados
+(src/models/registros.py): `get(..., modelo=True)` e `load_modelos`; `put`
+aceita o modelo e grava o JSON dele.
+"""
+import os
+import threading
+from typing import Dict
+
+from src.data import arquivo
+from src.models.registros import MODELOS, Registro
+
+BACKEND = os.environ.get("PLASTCALC_STORAGE", "json").strip().lower()
+
+if BACKEND == "sqlite":
+    from src.data.storage_sqlite import buscar_ids, delete, flush, indice, load, query, save, transacao
+    from src.data.storage_sqlite import get as _get_vivo, put as _put
+elif BACKEND == "json":
+    from src.data.storage_json import buscar_ids, delete, flush, indice, load, query, save, transacao
+    from src.data.storage_json import get as _get_vivo, put as _put
+else:
+    raise ValueError(f"PLASTCALC_STORAGE inválido: {BACKEND!r} (use 'json' ou 'sqlite')")
+
+_AUSENTE = object()
+_iniciado = False
+_iniciar_lock = threading.Lock()
+
+
+def iniciar() -> None:
+    """
+    Partida do processo: só a primeira chamada faz algo (as outras sessões do
+    Streamlit esperam ela terminar). Workers e scripts que só importam o
+    módulo não mexem no log de transações.
+    """
+    global _iniciado
+    with _iniciar_lock:
+        if _iniciado:
+            return
+        if BACKEND == "json":
+            from src.data.storage_json import recuperar_transacoes
+
+            recuperar_transacoes()
+        _iniciado = True
+
+
+def get(name: str, key: str, default=None, modelo: bool = False):
+    """
+    Registro da coleção viva; se não estiver lá, o do arquivo morto.
+    modelo=True devolve o modelo da coleção (MODELOS) em vez do dict.
+    """
+    valor = _get_vivo(name, key, _AUSENTE)
+    if valor is _AUSENTE and name in arquivo.COLECOES:
+        valor = arquivo.get(name, key, _AUSENTE)
+    if valor is _AUSENTE:
+        return default
+    return MODELOS[name].de_json(valor) if modelo else valor
+
+
+def load_modelos(name: str) -> Dict[str, Registro]:
+    """
+    Coleção viva inteira como modelos (ErroModelo se algum registro não cabe).
+    """
+    cls = MODELOS[name]
+    return {k: cls.de_json(v) for k, v in load(name).items()}
+
+
+def put(name: str, key: str, value) -> None:
+    if isinstance(value, Registro):
+        value = value.para_json()
+    _put(name, key, value)
@@ -1,22 +1,886 @@
-import json
+import atexit
+import os
+import pickle
+import re
+import tempfile
+import threading
+import uuid
+from contextlib import ExitStack, contextmanager
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
+
+from src.data.codecs import codec_escrita, decodificar, json_linha, json_loads
+from utils.cache_lru import CacheLRU
+from utils.trava_arquivo import trava_arquivo
 
 DATA_DIR = Path("data")
 DATA_DIR.mkdir(exist_ok=True)
 
+# Cada coleção = snapshot (<nome>.json) + journal (<nome>.journal.jsonl).
+# put/delete só acrescentam uma linha no journal; quando ele passa do limite,
+# uma thread em segundo plano grava um snapshot novo e zera o journal.
+LIMITE_JOURNAL_BYTES = 256 * 1024
+
+_locks: Dict[str, threading.RLock] = {}
+_locks_guard = threading.Lock()
+_com_trava_arquivo: Dict[str, bool] = {}  # nome -> esta thread (dona do _lock) já tem a trava do arquivo
+_compactando: set = set()
+_tx = threading.local()  # operações pendentes de `transacao()` nesta thread
+
+# Cache de leitura (processo inteiro, todas as sessões): coleção já parseada,
+# guardada em pickle. A chave leva mtime/tamanho dos arquivos e um contador de
+# escritas deste processo; qualquer mudança vira outra chave (miss).
+CACHE_LEITURA = CacheLRU(max_itens=64, max_bytes=256 * 2**20, tamanho=len)
+_versoes: Dict[str, int] = {}
+_chave_cache: Dict[str, tuple] = {}
+
+# Coleções fragmentadas: um arquivo por registro (data/<nome>/<id>.json) +
+# índice com os campos das listas (data/<nome>/_indice.json, com journal).
+# PLASTCALC_FRAGMENTADAS="" volta tudo para arquivo único.
+# (também os campos de `indice()` das coleções de arquivo único; "a.b" = campo
+# aninhado)
+CAMPOS_INDICE = {
+    "ordens_servico": ["doc", "cliente_nome", "status", "titulo", "updated_at"],
+    "orcamentos": ["doc", "cliente_id", "titulo", "status", "totais.geral", "updated_at"],
+    "clientes": ["nome", "cidade"],
+}
+FRAGMENTADAS = {
+    nome.strip()
+    for nome in os.environ.get("PLASTCALC_FRAGMENTADAS", "ordens_servico").split(",")
+    if nome.strip()
+}
+_RE_ID_ARQUIVO = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+# Índices secundários (data/<nome>.idx.json): campo -> valor -> ids, mantidos a
+# cada put/delete/save. O arquivo guarda o "carimbo" (mtime/tamanho) dos dados
+# que ele descreve; se não bater (outro processo, queda), é refeito na leitura.
+INDICES = {
+    "orcamentos": ["cliente_id", "status", "doc"],
+    "ordens_servico": ["status", "pv_id"],
+    "clientes": ["documento", "cidade"],
+}
+_indices: Dict[str, Dict[str, Any]] = {}  # nome -> {"carimbo", "campos", "por_id", "valores"}
+
+# Write-behind (opcional): put/delete/save ficam numa fila em memória, agrupados
+# por coleção (só a última versão de cada registro), e uma thread grava tudo a
+# cada intervalo. Leituras deste processo já enxergam a fila. `flush()` é a
+# barreira de durabilidade; também roda na saída do processo.
+# PLASTCALC_WRITE_BEHIND_MS=200 liga com intervalo de 200 ms (0/vazio = desligado).
+_wb: Dict[str, Any] = {"intervalo": None, "thread": None}
+_wb_lock = threading.Lock()  # protege _pendentes
+_wb_flush_lock = threading.Lock()  # um esvaziamento da fila por vez
+_wb_evento = threading.Event()
+_pendentes: Dict[str, Dict[str, Any]] = {}  # nome -> {"save": dados|None, "ops": {id: op}}
+
+# Log de transações (data/_transacoes.jsonl): o lote inteiro de `transacao()`
+# vira uma linha só, gravada com fsync antes de tocar nas coleções; esse é o
+# ponto de confirmação. Depois de aplicado recebe uma marca {"feito": id}.
+# Na abertura, lotes confirmados sem marca (queda no meio) são reaplicados;
+# put/delete gravam o registro inteiro, então reaplicar não duplica nada.
+_log_lock = threading.Lock()
+
+
 def _file_path(name: str) -> Path:
     return DATA_DIR / f"{name}.json"
 
-def load(name: str) -> Dict[str, Any]:
+
+def _journal_path(name: str) -> Path:
+    return DATA_DIR / f"{name}.journal.jsonl"
+
+
+def _pasta_fragmentos(name: str) -> Path:
+    return DATA_DIR / name
+
+
+def _nome_indice(name: str) -> str:
+    # o índice é uma coleção comum (snapshot + journal) dentro da pasta
+    return f"{name}/_indice"
+
+
+def _fragmento_path(name: str, key: str) -> Path:
+    if not _RE_ID_ARQUIVO.match(key) or key.startswith("_") or key.startswith("."):
+        raise ValueError(f"id inválido para arquivo: {key!r}")
+    return _pasta_fragmentos(name) / f"{key}.json"
+
+
+def _transacoes_path() -> Path:
+    return DATA_DIR / "_transacoes.jsonl"
+
+
+def _trava_log_path() -> Path:
+    # separado do log: o log pode ser apagado com a trava em uso
+    return DATA_DIR / "_transacoes.lock"
+
+
+def _idx_path(name: str) -> Path:
+    return DATA_DIR / f"{name}.idx.json"
+
+
+def _trava_path(name: str) -> Path:
+    return DATA_DIR / f"{name}.lock"
+
+
+def _lock(name: str) -> threading.RLock:
+    with _locks_guard:
+        if name not in _locks:
+            _locks[name] = threading.RLock()
+        return _locks[name]
+
+
+@contextmanager
+def _travar(name: str):
+    """
+    _lock(name) + trava exclusiva entre processos (data/<nome>.lock), reentrante
+    na mesma thread. Toda escrita na coleção (linha no journal, snapshot novo,
+    compactação) passa por aqui: outro worker do Streamlit ou a CLI não
+    acrescentam uma linha no journal entre a leitura e o apagar da compactação.
+    """
+    with _lock(name):
+        if _com_trava_arquivo.get(name):
+            yield
+            return
+        with trava_arquivo(_trava_path(name)):
+            _com_trava_arquivo[name] = True
+            try:
+                yield
+            finally:
+                _com_trava_arquivo[name] = False
+
+
+def _ler_snapshot(name: str) -> Dict[str, Any]:
     path = _file_path(name)
     if not path.exists():
         return {}
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return decodificar(path.read_bytes())
+    except RuntimeError:  # formato sem o pacote instalado: não mascarar como vazio
+        raise
     except Exception:
         return {}
 
-def save(name: str, data: Dict[str, Any]) -> None:
-    path = _file_path(name)
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+
+def _aplicar_journal(name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Reaplica as operações do journal sobre o snapshot. put/delete gravam o
+    registro inteiro, então reaplicar uma linha já incluída no snapshot não muda
+    nada. Linha incompleta (queda no meio da escrita) é ignorada.
+    """
+    path = _journal_path(name)
+    if not path.exists():
+        return data
+    with open(path, "rb") as f:
+        for linha in f:
+            try:
+                op = json_loads(linha)
+            except ValueError:
+                continue
+            if op.get("op") == "put":
+                data[op["id"]] = op["dados"]
+            elif op.get("op") == "del":
+                data.pop(op["id"], None)
+    return data
+
+
+def _gravar_bytes(path: Path, conteudo: bytes, fsync: bool = True) -> None:
+    # temporário com nome único na mesma pasta + rename: nunca fica pela metade,
+    # e dois processos gravando o mesmo arquivo não trocam o temporário um do outro
+    f = tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False)
+    try:
+        with f:
+            f.write(conteudo)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        os.replace(f.name, path)
+    except BaseException:
+        Path(f.name).unlink(missing_ok=True)
+        raise
+
+
+def _gravar_atomico(path: Path, data: Any) -> None:
+    _gravar_bytes(path, codec_escrita().dumps(data))
+
+
+def _gravar_snapshot(name: str, data: Dict[str, Any]) -> None:
+    _gravar_atomico(_file_path(name), data)
+
+
+def _stat(path: Path):
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _invalidar(name: str) -> None:
+    with _locks_guard:
+        _versoes[name] = _versoes.get(name, 0) + 1
+
+
+def _copia(data: Any) -> Any:
+    return pickle.loads(pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def load(name: str, usar_cache: bool = True) -> Dict[str, Any]:
+    """
+    Coleção inteira (snapshot + journal). Cada chamada devolve uma cópia
+    própria: quem chama pode alterar à vontade sem afetar o cache.
+    """
+    with _lock(name):  # o flush do write-behind não passa no meio
+        data = _ler_colecao(name, usar_cache)
+        if _pendentes:
+            data = _com_pendentes(name, data)
+        return data
+
+
+def _ler_colecao(name: str, usar_cache: bool = True) -> Dict[str, Any]:
+    # só o que está em disco (sem a fila do write-behind)
+    with _lock(name):
+        if name in FRAGMENTADAS:
+            _preparar_fragmentos(name)
+            base = _nome_indice(name)  # toda escrita passa pelo journal do índice
+        else:
+            base = name
+        chave = (name, _versoes.get(name, 0), _stat(_file_path(base)), _stat(_journal_path(base)))
+        if usar_cache:
+            congelado = CACHE_LEITURA.get(chave)
+            if congelado is not None:
+                return pickle.loads(congelado)
+
+        if name in FRAGMENTADAS:
+            data = _ler_fragmentos(name)
+        else:
+            data = _aplicar_journal(name, _ler_snapshot(name))
+        if usar_cache:
+            anterior = _chave_cache.get(name)
+            if anterior is not None and anterior != chave:
+                CACHE_LEITURA.pop(anterior)
+            CACHE_LEITURA.put(chave, pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL))
+            _chave_cache[name] = chave
+        return data
+
+
+def estatisticas_cache() -> Dict[str, int]:
+    """
+    Hits/misses e uso de memória do cache de leitura (para monitoramento).
+    """
+    return CACHE_LEITURA.stats()
+
+
+def save(name: str, data: Dict[str, Any], imediato: bool = False) -> None:
+    """
+    Regrava a coleção inteira (snapshot) e descarta o journal.
+    Para alterar um registro só, prefira `put` / `delete`.
+    Com write-behind ligado vai para a fila, a não ser que `imediato=True`.
+    """
+    if _wb["intervalo"] is not None and not imediato:
+        _enfileirar(name=name, data=data)
+        return
+    _salvar_direto(name, data)
+
+
+def _salvar_direto(name: str, data: Dict[str, Any]) -> None:
+    with _travar(name):
+        if name in FRAGMENTADAS:
+            _preparar_fragmentos(name)
+            _salvar_fragmentos(name, data)
+        else:
+            _gravar_snapshot(name, data)
+            _journal_path(name).unlink(missing_ok=True)
+        _invalidar(name)
+        if name in INDICES:
+            _gravar_indices(name, _montar_indices(name, data))
+
+
+def _anexar(name: str, ops: List[Dict[str, Any]]) -> None:
+    pendentes = getattr(_tx, "ops", None)
+    if pendentes is not None:
+        pendentes.setdefault(name, []).extend(ops)
+        return
+    if _wb["intervalo"] is not None:
+        _enfileirar({name: ops})
+        return
+    _escrever(name, ops)
+
+
+def _escrever(name: str, ops: List[Dict[str, Any]]) -> None:
+    if name in FRAGMENTADAS:
+        _aplicar_fragmentos(name, ops)
+    else:
+        _gravar_journal(name, ops)
+
+
+def _gravar_journal(name: str, ops: List[Dict[str, Any]]) -> None:
+    bloco = b"".join(json_linha(op) for op in ops)
+    with _travar(name):
+        antes = _carimbo(name) if name in INDICES else None
+        with open(_journal_path(name), "ab+") as f:
+            # última linha cortada por uma queda: começa numa linha nova
+            if f.seek(0, os.SEEK_END) > 0:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    bloco = b"\n" + bloco
+            f.write(bloco)
+            f.flush()
+            os.fsync(f.fileno())
+            tamanho = f.tell()
+        _invalidar(name)
+        if name in INDICES:
+            _atualizar_indices(name, ops, antes)
+    if tamanho > LIMITE_JOURNAL_BYTES:
+        compactar_em_segundo_plano(name)
+
+
+def get(name: str, key: str, default: Any = None) -> Any:
+    if _pendentes:
+        with _wb_lock:
+            p = _pendentes.get(name)
+            if p is not None:
+                op = p["ops"].get(key)
+                if op is not None:
+                    return _copia(op["dados"]) if op["op"] == "put" else default
+                if p["save"] is not None:
+                    return _copia(p["save"].get(key, default))
+    if name in FRAGMENTADAS:
+        with _lock(name):
+            _preparar_fragmentos(name)
+            try:
+                return decodificar(_fragmento_path(name, key).read_bytes())
+            except (FileNotFoundError, ValueError):
+                return default
+    return load(name).get(key, default)
+
+
+def indice(name: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Só os campos de lista de cada registro ({id: {doc, status, ...}}), sem abrir
+    os registros. Em coleção de arquivo único, é extraído da coleção inteira.
+    """
+    campos = CAMPOS_INDICE.get(name, ["doc", "status", "updated_at"])
+    if name in FRAGMENTADAS:
+        with _lock(name):  # o flush do write-behind não passa no meio
+            _preparar_fragmentos(name)
+            idx = load(_nome_indice(name))
+            with _wb_lock:
+                p = _pendentes.get(name)
+                if p is not None:
+                    if p["save"] is not None:
+                        idx = {k: resumo(v, campos) for k, v in p["save"].items()}
+                    for op in p["ops"].values():
+                        if op["op"] == "put":
+                            idx[op["id"]] = resumo(op["dados"], campos)
+                        else:
+                            idx.pop(op["id"], None)
+        return idx
+    return {k: resumo(v, campos) for k, v in load(name).items()}
+
+
+def put(name: str, key: str, value: Any) -> None:
+    """
+    Grava (cria ou substitui) um registro da coleção: uma linha no journal.
+    """
+    _anexar(name, [{"op": "put", "id": key, "dados": value}])
+
+
+def delete(name: str, key: str) -> None:
+    _anexar(name, [{"op": "del", "id": key}])
+
+
+def query(name: str, **filtros) -> Dict[str, Any]:
+    """
+    Registros cujos campos batem com todos os filtros (ex.: status="ABERTA").
+    """
+    campos = CAMPOS_INDICE.get(name, [])
+    if filtros and _usa_indices(name, filtros):
+        ids = buscar_ids(name, **filtros)
+        if name in FRAGMENTADAS:
+            return {k: r for k in ids if (r := get(name, k)) is not None}
+        data = load(name)
+        return {k: data[k] for k in ids if k in data}
+    if name in FRAGMENTADAS and all(c in campos for c in filtros):
+        # filtra pelo índice e só abre os registros que batem
+        ids = [k for k, v in indice(name).items() if all(v.get(c) == x for c, x in filtros.items())]
+        return {k: r for k in ids if (r := get(name, k)) is not None}
+    return {
+        k: v for k, v in load(name).items()
+        if isinstance(v, dict) and all(v.get(campo) == valor for campo, valor in filtros.items())
+    }
+
+
+@contextmanager
+def transacao():
+    """
+    Agrupa put/delete da thread, mesmo em várias coleções: nada é gravado até o
+    fim do bloco e, se houver exceção, nada é gravado. O lote é confirmado com
+    uma linha no log de transações; depois de uma queda, ou entra inteiro ou não
+    entra. Com write-behind, vai para a fila e o `flush()` confirma do mesmo jeito.
+    """
+    if getattr(_tx, "ops", None) is not None:  # bloco aninhado: usa o de fora
+        yield
+        return
+    _tx.ops = {}
+    try:
+        yield
+        pendentes = _tx.ops
+    finally:
+        _tx.ops = None
+    if not pendentes:
+        return
+    if _wb["intervalo"] is not None:
+        _enfileirar(pendentes)
+        return
+    with ExitStack() as pilha:
+        for name in sorted(pendentes):  # sempre na mesma ordem: sem deadlock
+            pilha.enter_context(_lock(name))
+        _confirmar(pendentes)
+
+
+def _confirmar(lote: Dict[str, List[Dict[str, Any]]]) -> None:
+    """
+    Grava o lote no log (uma linha, fsync), aplica nas coleções e marca feito.
+    """
+    tx = uuid.uuid4().hex
+    # trava compartilhada do log do início ao "feito": a recuperação (exclusiva)
+    # de outro processo nunca reaplica um lote que ainda está sendo gravado
+    with trava_arquivo(_trava_log_path(), compartilhada=True):
+        with _log_lock:
+            with open(_transacoes_path(), "ab") as f:
+                f.write(json_linha({"tx": tx, "ops": lote}))
+                f.flush()
+                os.fsync(f.fileno())
+        for name, ops in lote.items():
+            _escrever(name, ops)
+        with _log_lock:
+            with open(_transacoes_path(), "ab") as f:
+                f.write(json_linha({"feito": tx}))
+                tamanho = f.tell()
+    if tamanho > LIMITE_JOURNAL_BYTES:
+        # só zera se nenhum processo estiver no meio de um lote
+        with trava_arquivo(_trava_log_path(), esperar=False) as livre, _log_lock:
+            if livre and not _transacoes_abertas():
+                _transacoes_path().unlink(missing_ok=True)
+
+
+def _transacoes_abertas() -> Dict[str, Dict[str, List[Dict[str, Any]]]]:
+    # lotes confirmados no log e ainda sem a marca de feito (na ordem do log)
+    path = _transacoes_path()
+    abertas = {}
+    if not path.exists():
+        return abertas
+    with open(path, "rb") as f:
+        for linha in f:
+            try:
+                registro = json_loads(linha)
+            except ValueError:
+                continue  # linha cortada: lote não confirmado
+            if "feito" in registro:
+                abertas.pop(registro["feito"], None)
+            elif "tx" in registro:
+                abertas[registro["tx"]] = registro["ops"]
+    return abertas
+
+
+def recuperar_transacoes() -> int:
+    """
+    Reaplica os lotes confirmados que não chegaram ao fim e zera o log;
+    retorna quantos lotes foram reaplicados. Chamada na partida do processo
+    (`storage.iniciar()`), não ao importar.
+
+    Espera a trava exclusiva do log: com ela, nenhum processo está no meio de
+    um lote, então o que está aberto no log é de um processo que caiu.
+    """
+    travadas = []
+    while True:
+        with ExitStack() as pilha:
+            # mesma ordem do transacao(): travas das coleções antes da do log
+            for name in travadas:
+                pilha.enter_context(_lock(name))
+            pilha.enter_context(trava_arquivo(_trava_log_path()))
+            pilha.enter_context(_log_lock)
+            abertas = _transacoes_abertas()
+            nomes = sorted({name for lote in abertas.values() for name in lote})
+            if not set(nomes) <= set(travadas):
+                travadas = sorted(set(travadas) | set(nomes))
+                continue  # solta tudo e trava as coleções que faltavam
+            for lote in abertas.values():
+                for name, ops in lote.items():
+                    _escrever(name, ops)
+            _transacoes_path().unlink(missing_ok=True)
+            return len(abertas)
+
+
+def compactar(name: str) -> None:
+    """
+    Snapshot + journal -> snapshot novo; o journal é zerado. Lê do disco (sem
+    cache) e grava sob a mesma trava entre processos.
+    """
+    with _travar(name):
+        if not _journal_path(name).exists():
+            return
+        _salvar_direto(name, _ler_colecao(name, usar_cache=False))
+
+
+def compactar_em_segundo_plano(name: str) -> None:
+    with _locks_guard:
+        if name in _compactando:
+            return
+        _compactando.add(name)
+
+    def _rodar():
+        try:
+            compactar(name)
+        finally:
+            with _locks_guard:
+                _compactando.discard(name)
+
+    threading.Thread(target=_rodar, name=f"compactar-{name}", daemon=True).start()
+
+
+# ---------------------------
+# Coleções fragmentadas (um arquivo por registro)
+# ---------------------------
+def resumo(value: Any, campos: List[str]) -> Dict[str, Any]:
+    """
+    Campos de lista de um registro; "totais.geral" desce nos dicts aninhados.
+    """
+    if not isinstance(value, dict):
+        return {}
+    saida = {}
+    for c in campos:
+        v = value
+        for parte in c.split("."):
+            v = v.get(parte) if isinstance(v, dict) else None
+        saida[c] = v
+    return saida
+
+
+def _migracao_path(name: str) -> Path:
+    return _pasta_fragmentos(name) / "_migracao.json"
+
+
+def _fragmentos_prontos(name: str) -> bool:
+    if _migracao_path(name).exists():
+        return True
+    # pastas migradas antes do marcador: o arquivo único já foi renomeado
+    return _pasta_fragmentos(name).is_dir() and not (_file_path(name).exists() or _journal_path(name).exists())
+
+
+def _preparar_fragmentos(name: str) -> None:
+    """
+    Cria a pasta da coleção; na primeira vez, migra o arquivo único
+    (data/<nome>.json + journal), que fica renomeado como *.migrado.
+
+    A pasta só conta como pronta com o marcador _migracao.json, gravado depois
+    de todos os registros e do índice: uma migração interrompida é refeita
+    inteira na próxima vez (o arquivo único continua lá até o marcador).
+    """
+    if _fragmentos_prontos(name):
+        return
+    with _travar(name):
+        if not _fragmentos_prontos(name):  # outro processo pode ter migrado enquanto esperava
+            _migrar_para_fragmentos(name)
+
+
+def _migrar_para_fragmentos(name: str) -> None:
+    antigo = _aplicar_journal(name, _ler_snapshot(name))
+    _pasta_fragmentos(name).mkdir(parents=True, exist_ok=True)
+    if antigo:
+        _salvar_fragmentos(name, antigo)
+    _gravar_atomico(_migracao_path(name), {"registros": len(antigo)})
+    for path in (_file_path(name), _journal_path(name)):
+        if path.exists():
+            path.rename(path.with_name(path.name + ".migrado"))
+
+
+def ler_sem_migrar(name: str) -> Dict[str, Any]:
+    """
+    Coleção como está em disco, sem disparar a migração para a pasta
+    fragmentada: se ela ainda não foi feita, lê o arquivo único (+ journal).
+    """
+    if name not in FRAGMENTADAS or _fragmentos_prontos(name):
+        return load(name)
+    with _lock(name):
+        return _aplicar_journal(name, _ler_snapshot(name))
+
+
+def _ler_fragmentos(name: str) -> Dict[str, Any]:
+    data = {}
+    for key in indice(name):
+        try:
+            data[key] = decodificar(_fragmento_path(name, key).read_bytes())
+        except (FileNotFoundError, ValueError):
+            continue
+    return data
+
+
+def _salvar_fragmentos(name: str, data: Dict[str, Any]) -> None:
+    campos = CAMPOS_INDICE.get(name, ["doc", "status", "updated_at"])
+    pasta = _pasta_fragmentos(name)
+    for key, value in data.items():
+        _gravar_atomico(_fragmento_path(name, key), value)
+    for path in pasta.glob("*.json"):
+        if not path.name.startswith("_") and path.stem not in data:
+            path.unlink()
+    _salvar_direto(_nome_indice(name), {k: resumo(v, campos) for k, v in data.items()})
+
+
+def _aplicar_fragmentos(name: str, ops: List[Dict[str, Any]]) -> None:
+    """
+    put/delete numa coleção fragmentada: o registro é gravado no próprio
+    arquivo (temp + rename) e o índice recebe uma linha no journal dele.
+    """
+    campos = CAMPOS_INDICE.get(name, ["doc", "status", "updated_at"])
+    ops_indice = []
+    with _travar(name):
+        _preparar_fragmentos(name)
+        antes = _carimbo(name) if name in INDICES else None
+        for op in ops:
+            path = _fragmento_path(name, op["id"])
+            if op["op"] == "put":
+                _gravar_atomico(path, op["dados"])
+                ops_indice.append({"op": "put", "id": op["id"], "dados": resumo(op["dados"], campos)})
+            else:
+                path.unlink(missing_ok=True)
+                ops_indice.append(op)
+        _gravar_journal(_nome_indice(name), ops_indice)
+        _invalidar(name)
+        if name in INDICES:
+            _atualizar_indices(name, ops, antes)
+
+
+# ---------------------------
+# Índices secundários
+# ---------------------------
+def _carimbo(name: str) -> List[Any]:
+    # estado dos arquivos que toda escrita na coleção altera
+    base = _nome_indice(name) if name in FRAGMENTADAS else name
+    return [list(st) if st else None for st in (_stat(_file_path(base)), _stat(_journal_path(base)))]
+
+
+def _chave_valor(valor: Any) -> Any:
+    if valor is None or isinstance(valor, (str, int, float, bool)):
+        return valor
+    return json_linha(valor).decode("utf-8")  # lista/dict: texto estável
+
+
+def _indexar(idx: Dict[str, Any], key: str, valores: List[Any]) -> None:
+    idx["por_id"][key] = valores
+    for campo, valor in zip(idx["campos"], valores):
+        idx["valores"][campo].setdefault(_chave_valor(valor), set()).add(key)
+
+
+def _desindexar(idx: Dict[str, Any], key: str) -> None:
+    antigos = idx["por_id"].pop(key, None)
+    if antigos is None:
+        return
+    for campo, valor in zip(idx["campos"], antigos):
+        ids = idx["valores"][campo].get(_chave_valor(valor))
+        if ids is not None:
+            ids.discard(key)
+            if not ids:
+                del idx["valores"][campo][_chave_valor(valor)]
+
+
+def _novo_indice(campos: List[str], carimbo: List[Any]) -> Dict[str, Any]:
+    return {"carimbo": carimbo, "campos": list(campos), "por_id": {}, "valores": {c: {} for c in campos}}
+
+
+def _montar_indices(name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    campos = INDICES[name]
+    idx = _novo_indice(campos, _carimbo(name))
+    for key, value in data.items():
+        if isinstance(value, dict):
+            _indexar(idx, key, [value.get(c) for c in campos])
+    return idx
+
+
+def _gravar_indices(name: str, idx: Dict[str, Any]) -> None:
+    # sem fsync: se o arquivo se perder numa queda, o carimbo não bate e ele é refeito
+    _indices[name] = idx
+    conteudo = json_linha({"carimbo": idx["carimbo"], "campos": idx["campos"], "por_id": idx["por_id"]})
+    _gravar_bytes(_idx_path(name), conteudo, fsync=False)
+
+
+def _ler_indices(name: str) -> Dict[str, Any] | None:
+    try:
+        gravado = json_loads(_idx_path(name).read_bytes())
+    except (FileNotFoundError, ValueError):
+        return None
+    idx = _novo_indice(gravado.get("campos", []), gravado.get("carimbo"))
+    for key, valores in gravado.get("por_id", {}).items():
+        _indexar(idx, key, valores)
+    return idx
+
+
+def _atualizar_indices(name: str, ops: List[Dict[str, Any]], antes: List[Any]) -> None:
+    """
+    Aplica put/delete no índice, se ele estava em dia antes da escrita; se
+    não estava, fica para ser refeito na próxima consulta.
+    """
+    idx = _indices.get(name) or _ler_indices(name)
+    if idx is None or idx["carimbo"] != antes or idx["campos"] != INDICES[name]:
+        _indices.pop(name, None)
+        return
+    for op in ops:
+        _desindexar(idx, op["id"])
+        if op["op"] == "put" and isinstance(op["dados"], dict):
+            _indexar(idx, op["id"], [op["dados"].get(c) for c in idx["campos"]])
+    idx["carimbo"] = _carimbo(name)
+    _gravar_indices(name, idx)
+
+
+def _indices_em_dia(name: str) -> Dict[str, Any]:
+    with _lock(name):
+        if name in FRAGMENTADAS:
+            _preparar_fragmentos(name)
+        carimbo = _carimbo(name)
+        idx = _indices.get(name)
+        if idx is None or idx["carimbo"] != carimbo:
+            idx = _ler_indices(name)
+        if idx is None or idx["carimbo"] != carimbo or idx["campos"] != INDICES[name]:
+            idx = _montar_indices(name, _ler_colecao(name))
+            _gravar_indices(name, idx)
+        _indices[name] = idx
+        return idx
+
+
+def _usa_indices(name: str, filtros: Dict[str, Any]) -> bool:
+    # com a fila do write-behind cheia o índice em disco está atrasado: varre
+    return all(c in INDICES.get(name, []) for c in filtros) and name not in _pendentes
+
+
+def buscar_ids(name: str, **filtros) -> List[str]:
+    """
+    Ids dos registros cujos campos batem com os filtros, sem abrir os registros
+    quando todos os campos têm índice secundário (ver INDICES).
+    """
+    if not filtros or not _usa_indices(name, filtros):
+        return list(query(name, **filtros))
+    with _lock(name):
+        idx = _indices_em_dia(name)
+        achados = None
+        for campo, valor in filtros.items():
+            ids = idx["valores"][campo].get(_chave_valor(valor), set())
+            achados = set(ids) if achados is None else achados & ids
+    return sorted(achados)
+
+
+# ---------------------------
+# Write-behind
+# ---------------------------
+def _enfileirar(lote: Dict[str, List[Dict[str, Any]]] = None, name: str = None, data: Dict[str, Any] = None) -> None:
+    """
+    Põe na fila put/delete de várias coleções ({nome: ops}) de uma vez só (um
+    flush pega o lote inteiro ou nada dele) ou o save de uma coleção.
+    """
+    # cópia na hora: quem chamou pode continuar alterando o próprio dict
+    with _wb_lock:
+        if data is not None:  # save substitui tudo o que estava na fila
+            _pendentes[name] = {"save": _copia(data), "ops": {}}
+        for nome, ops in (lote or {}).items():
+            p = _pendentes.setdefault(nome, {"save": None, "ops": {}})
+            for op in ops:
+                p["ops"].pop(op["id"], None)  # reinsere no fim: mantém a ordem das operações
+                p["ops"][op["id"]] = _copia(op)
+
+
+def _com_pendentes(name: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    with _wb_lock:
+        p = _pendentes.get(name)
+        if p is None:
+            return data
+        if p["save"] is not None:
+            data = _copia(p["save"])
+        for op in p["ops"].values():
+            if op["op"] == "put":
+                data[op["id"]] = _copia(op["dados"])
+            else:
+                data.pop(op["id"], None)
+    return data
+
+
+def _reenfileirar(name: str, p: Dict[str, Any]) -> None:
+    # gravação falhou: devolve à fila, antes do que chegou nesse meio-tempo
+    if p["save"] is None and not p["ops"]:
+        return
+    with _wb_lock:
+        novo = _pendentes.get(name)
+        if novo is None:
+            _pendentes[name] = p
+        elif novo["save"] is None:
+            p["ops"].update(novo["ops"])
+            _pendentes[name] = p
+
+
+def flush() -> None:
+    """
+    Barreira de durabilidade: quando retorna, tudo o que foi para a fila do
+    write-behind antes da chamada está gravado em disco (com fsync).
+    Sem write-behind (ou com a fila vazia) não faz nada.
+    """
+    with _wb_flush_lock:
+        # trava as coleções da fila (em ordem) antes de tirar da fila: leitores
+        # não veem o intervalo entre sair da fila e chegar ao disco. Se entrou
+        # coleção nova nesse meio-tempo, trava de novo: a fila sai inteira e um
+        # lote de `transacao()` não se divide entre dois flushes.
+        while True:
+            pilha = ExitStack()
+            travadas = sorted(_pendentes)
+            for name in travadas:
+                pilha.enter_context(_lock(name))
+            with _wb_lock:
+                if set(_pendentes) <= set(travadas):
+                    lote = {name: _pendentes.pop(name) for name in travadas if name in _pendentes}
+                    break
+            pilha.close()
+
+        with pilha:
+            try:
+                for name, p in lote.items():
+                    if p["save"] is not None:
+                        _salvar_direto(name, p["save"])
+                        p["save"] = None
+                ops = {name: list(p["ops"].values()) for name, p in lote.items() if p["ops"]}
+                if ops:
+                    _confirmar(ops)  # put/delete de todas as coleções num lote só
+            except BaseException:
+                for name, p in lote.items():
+                    _reenfileirar(name, p)
+                raise
+
+
+def _loop_write_behind() -> None:
+    while True:
+        _wb_evento.wait(_wb["intervalo"] or 0.2)
+        _wb_evento.clear()
+        try:
+            flush()
+        except Exception:
+            pass  # ficou na fila; tenta de novo no próximo intervalo (e no flush da saída)
+
+
+def ativar_write_behind(intervalo_s: float = 0.2) -> None:
+    """
+    Liga o write-behind: gravações vão para a fila e uma thread as grava a
+    cada `intervalo_s` segundos. Quem precisa de durabilidade chama `flush()`.
+    """
+    _wb["intervalo"] = intervalo_s
+    if _wb["thread"] is None:
+        _wb["thread"] = threading.Thread(target=_loop_write_behind, name="write-behind", daemon=True)
+        _wb["thread"].start()
+        atexit.register(flush)
+
+
+def desativar_write_behind() -> None:
+    """
+    Volta às gravações síncronas; o que estava na fila é gravado antes.
+    """
+    _wb["intervalo"] = None
+    flush()
+
+
+_ms = int(os.environ.get("PLASTCALC_WRITE_BEHIND_MS", "0") or 0)
+if _ms > 0:
+    ativar_write_behind(_ms / 1000)
+
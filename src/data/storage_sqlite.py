@@ -0,0 +1,195 @@
+"""
+Storage em SQLite (stdlib sqlite3, modo WAL), com a mesma API de storage_json.
+
+Cada coleção é uma tabela (id, dados JSON) com colunas indexadas copiadas do
+documento (os campos de storage_json.INDICES) para consultas sem ler a coleção
+inteira. Colunas novas entram em tabelas antigas na primeira abertura.
+
+Migração única dos arquivos JSON (`migrar_de_json`, pela linha de comando):
+    python -m src.cli.migrar_sqlite
+"""
+import json
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict
+
+from src.data import storage_json
+from src.data.storage_json import DATA_DIR
+
+DB_PATH = DATA_DIR / "plastcalc.sqlite3"
+
+COLECOES = ["clientes", "orcamentos", "vendas_pv", "ordens_servico", "sequencias"]
+CAMPOS_INDEXADOS = sorted({c for campos in storage_json.INDICES.values() for c in campos} | {"cliente_id", "status", "doc"})
+
+_RE_NOME = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+_local = threading.local()  # conexão e profundidade de transação por thread
+_tabelas: set = set()
+_tabelas_lock = threading.Lock()
+
+
+def _conexao() -> sqlite3.Connection:
+    con = getattr(_local, "con", None)
+    if con is None:
+        # isolation_level=None: autocommit; transações só via `transacao()`
+        con = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None, check_same_thread=False)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        _local.con = con
+        _local.nivel = 0
+    return con
+
+
+def _tabela(name: str) -> str:
+    if not _RE_NOME.match(name):
+        raise ValueError(f"Nome de coleção inválido: {name!r}")
+    with _tabelas_lock:
+        if name not in _tabelas:
+            con = _conexao()
+            colunas = ", ".join(f"{c} TEXT" for c in CAMPOS_INDEXADOS)
+            con.execute(f'CREATE TABLE IF NOT EXISTS "{name}" (id TEXT PRIMARY KEY, dados TEXT NOT NULL, {colunas})')
+            existentes = {row[1] for row in con.execute(f'PRAGMA table_info("{name}")')}
+            for c in CAMPOS_INDEXADOS:
+                if c not in existentes:  # tabela de uma versão anterior: cria e preenche
+                    con.execute(f'ALTER TABLE "{name}" ADD COLUMN {c} TEXT')
+                    con.execute(f"""UPDATE "{name}" SET {c} = CAST(json_extract(dados, '$.{c}') AS TEXT)""")
+            for c in CAMPOS_INDEXADOS:
+                con.execute(f'CREATE INDEX IF NOT EXISTS "ix_{name}_{c}" ON "{name}" ({c})')
+            _tabelas.add(name)
+    return f'"{name}"'
+
+
+def _linha(key: str, value: Any) -> tuple:
+    indexados = [value.get(c) if isinstance(value, dict) else None for c in CAMPOS_INDEXADOS]
+    return (key, json.dumps(value, ensure_ascii=False), *[None if v is None else str(v) for v in indexados])
+
+
+def _upsert_sql(tabela: str) -> str:
+    colunas = ", ".join(["id", "dados", *CAMPOS_INDEXADOS])
+    marcas = ", ".join("?" * (2 + len(CAMPOS_INDEXADOS)))
+    return f"INSERT OR REPLACE INTO {tabela} ({colunas}) VALUES ({marcas})"
+
+
+@contextmanager
+def transacao():
+    """
+    Lote transacional: put/delete/save dentro do bloco são confirmados juntos
+    (COMMIT) ou descartados (ROLLBACK) se houver exceção. Pode ser aninhado.
+    """
+    con = _conexao()
+    if _local.nivel == 0:
+        con.execute("BEGIN IMMEDIATE")
+    _local.nivel += 1
+    try:
+        yield
+    except BaseException:
+        _local.nivel -= 1
+        if _local.nivel == 0:
+            con.execute("ROLLBACK")
+            with _tabelas_lock:
+                _tabelas.clear()  # CREATE TABLE também pode ter sido desfeito
+        raise
+    _local.nivel -= 1
+    if _local.nivel == 0:
+        con.execute("COMMIT")
+
+
+def load(name: str) -> Dict[str, Any]:
+    tabela = _tabela(name)
+    return {k: json.loads(d) for k, d in _conexao().execute(f"SELECT id, dados FROM {tabela}")}
+
+
+def save(name: str, data: Dict[str, Any]) -> None:
+    tabela = _tabela(name)
+    with transacao():
+        con = _conexao()
+        con.execute(f"DELETE FROM {tabela}")
+        con.executemany(_upsert_sql(tabela), [_linha(k, v) for k, v in data.items()])
+
+
+def get(name: str, key: str, default: Any = None) -> Any:
+    tabela = _tabela(name)
+    row = _conexao().execute(f"SELECT dados FROM {tabela} WHERE id = ?", (key,)).fetchone()
+    return json.loads(row[0]) if row else default
+
+
+def put(name: str, key: str, value: Any) -> None:
+    tabela = _tabela(name)
+    _conexao().execute(_upsert_sql(tabela), _linha(key, value))
+
+
+def delete(name: str, key: str) -> None:
+    tabela = _tabela(name)
+    _conexao().execute(f"DELETE FROM {tabela} WHERE id = ?", (key,))
+
+
+def query(name: str, **filtros) -> Dict[str, Any]:
+    """
+    Registros cujos campos batem com todos os filtros. Campos de CAMPOS_INDEXADOS
+    usam os índices; outros campos, json_extract sobre o documento.
+    """
+    tabela = _tabela(name)
+    where, params = _where(filtros)
+    sql = f"SELECT id, dados FROM {tabela}" + where
+    return {k: json.loads(d) for k, d in _conexao().execute(sql, params)}
+
+
+def buscar_ids(name: str, **filtros) -> list:
+    """
+    Só os ids dos registros que batem com os filtros (sem ler os documentos).
+    """
+    tabela = _tabela(name)
+    where, params = _where(filtros)
+    return [row[0] for row in _conexao().execute(f"SELECT id FROM {tabela}{where} ORDER BY id", params)]
+
+
+def _where(filtros: Dict[str, Any]) -> tuple:
+    where, params = [], []
+    for campo, valor in filtros.items():
+        if campo in CAMPOS_INDEXADOS:
+            where.append(f"{campo} IS ?")  # IS: filtro None acha a coluna vazia
+            params.append(None if valor is None else str(valor))
+        elif _RE_NOME.match(campo):
+            where.append(f"json_extract(dados, '$.{campo}') = ?")
+            params.append(valor)
+        else:
+            raise ValueError(f"Campo de consulta inválido: {campo!r}")
+    return (" WHERE " + " AND ".join(where) if where else ""), params
+
+
+def indice(name: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Só os campos de lista de cada registro, extraídos no próprio SQLite.
+    """
+    tabela = _tabela(name)
+    campos = storage_json.CAMPOS_INDICE.get(name, ["doc", "status", "updated_at"])
+    colunas = ", ".join(f"json_extract(dados, '$.{c}')" for c in campos)
+    return {
+        row[0]: dict(zip(campos, row[1:]))
+        for row in _conexao().execute(f"SELECT id, {colunas} FROM {tabela}")
+    }
+
+
+def flush() -> None:
+    """
+    Mesma API do storage_json; aqui toda gravação já é confirmada na hora.
+    """
+
+
+def migrar_de_json(colecoes=None) -> Dict[str, int]:
+    """
+    Copia data/<colecao>.json (+ journal) para o SQLite (ou a pasta, se a
+    coleção já foi fragmentada). Substitui o conteúdo das tabelas; os arquivos
+    JSON não são alterados. Retorna registros por coleção.
+    """
+    if colecoes is None:
+        colecoes = COLECOES
+    contagem = {}
+    with transacao():
+        for name in colecoes:
+            data = storage_json.ler_sem_migrar(name)
+            save(name, data)
+            contagem[name] = len(data)
+    return contagem
+
@@ -0,0 +1,322 @@
+"""
+Modelos tipados dos registros gravados (clientes, orçamentos, PV e OS) e das
+partes aninhadas (linhas de itens, horas, checklists).
+
+São dataclasses com __slots__: ocupam bem menos memória que o dict do JSON e
+garantem os tipos na entrada (`de_json`), sem os `.get(..., "")` espalhados.
+Campos que o modelo não conhece ficam em `extras` e voltam no `para_json`.
+`para_json` devolve as mesmas chaves que vieram no `de_json` (mais os campos
+alterados depois); os valores saem normalizados no tipo do campo (None vira
+"" / 0.0 / False, "2" num campo numérico vira 2.0, listas gravadas como
+{índice: linha} voltam como lista).
+
+As conversões de cada campo são montadas uma vez, a partir das anotações,
+quando a classe é criada (`@modelo`).
+"""
+import sys
+from dataclasses import MISSING, dataclass, field, fields
+from typing import Any, Callable, Dict, List, Optional, Tuple, get_args, get_origin
+
+
+class ErroModelo(ValueError):
+    """Registro gravado que não cabe no modelo (com o caminho do campo)."""
+
+
+# textos curtos se repetem muito entre registros (status, ref_id e nome dos
+# itens de checklist, datas): uma cópia só de cada, via sys.intern
+CURTO = 40
+
+
+def _txt(v) -> str:
+    if v is None:
+        return ""
+    if isinstance(v, (dict, list)):
+        raise TypeError(f"esperado texto, veio {type(v).__name__}")
+    v = v if isinstance(v, str) else str(v)
+    return sys.intern(v) if len(v) <= CURTO else v
+
+
+def _num(v) -> float:
+    if v is None or v == "":
+        return 0.0
+    if isinstance(v, bool):
+        raise TypeError("esperado número, veio bool")
+    return float(v)
+
+
+def _int(v) -> int:
+    if v is None or v == "":
+        return 0
+    if isinstance(v, bool):
+        raise TypeError("esperado inteiro, veio bool")
+    return int(float(v)) if isinstance(v, str) else int(v)
+
+
+def _bool(v) -> bool:
+    if v is None:
+        return False
+    if isinstance(v, bool):
+        return v
+    if v in (0, 1):
+        return bool(v)
+    raise TypeError(f"esperado bool, veio {v!r}")
+
+
+def _linhas(v) -> list:
+    # o data_editor já gravou listas como {índice: linha}
+    if v is None:
+        return []
+    if isinstance(v, dict):
+        return list(v.values())
+    if isinstance(v, list):
+        return v
+    raise TypeError(f"esperada lista, veio {type(v).__name__}")
+
+
+def _mapa(v) -> dict:
+    if v is None:
+        return {}
+    if isinstance(v, dict):
+        return v
+    raise TypeError(f"esperado objeto, veio {type(v).__name__}")
+
+
+def _conversores(tipo) -> Tuple[Callable[[Any], Any], Optional[Callable[[Any], Any]]]:
+    """
+    (entrada, saída) de um campo pelo tipo anotado; saída None = o próprio valor.
+    """
+    simples = {str: _txt, float: _num, int: _int, bool: _bool}
+    if tipo in simples:
+        return simples[tipo], None
+    if tipo is list:
+        return (lambda v: list(_linhas(v))), list
+    if tipo is dict:
+        return (lambda v: dict(_mapa(v))), dict
+    if isinstance(tipo, type) and issubclass(tipo, Registro):
+        return tipo.de_json, (lambda x: x.para_json())
+
+    origem, args = get_origin(tipo), get_args(tipo)
+    if origem is list and args and isinstance(args[0], type) and issubclass(args[0], Registro):
+        sub = args[0]
+        return (
+            (lambda v: [sub.de_json(x) for x in _linhas(v)]),
+            (lambda xs: [x.para_json() for x in xs]),
+        )
+    if origem is dict and len(args) == 2:
+        sub = args[1]
+        if isinstance(sub, type) and issubclass(sub, Registro):
+            return (
+                (lambda v: {str(k): sub.de_json(x) for k, x in _mapa(v).items()}),
+                (lambda m: {k: x.para_json() for k, x in m.items()}),
+            )
+        item = get_args(sub)[0] if get_origin(sub) is list and get_args(sub) else None
+        if isinstance(item, type) and issubclass(item, Registro):
+            return (
+                (lambda v: {str(k): [item.de_json(x) for x in _linhas(xs)] for k, xs in _mapa(v).items()}),
+                (lambda m: {k: [x.para_json() for x in xs] for k, xs in m.items()}),
+            )
+    raise TypeError(f"tipo de campo sem conversão: {tipo!r}")
+
+
+@dataclass(slots=True)
+class Registro:
+    # campos gravados que o modelo não conhece (None quando não há nenhum)
+    extras: Optional[Dict[str, Any]] = None
+
+    # campos que vieram no de_json (None = todos): os ausentes só voltam no
+    # para_json se mudarem do padrão
+    _presentes: Optional[frozenset] = field(default=None, repr=False, compare=False)
+
+    _CAMPOS = {}  # nome -> (entrada, saída); preenchido por @modelo
+    _DIRETOS = {}  # nome -> tipo: valor já desse tipo entra sem conversão
+    _PADROES = {}  # nome -> fábrica do valor padrão
+    _CONJUNTOS = {}  # cache dos frozensets de campos presentes (um por formato)
+
+    @classmethod
+    def de_json(cls, d: Dict[str, Any]):
+        if not isinstance(d, dict):
+            raise ErroModelo(f"{cls.__name__}: esperado objeto, veio {type(d).__name__}")
+        campos, diretos = cls._CAMPOS, cls._DIRETOS
+        valores = {}
+        extras = None
+        for k, v in d.items():
+            tipo = type(v)
+            if diretos.get(k) is tipo:
+                valores[k] = sys.intern(v) if tipo is str and len(v) <= CURTO else v
+                continue
+            conv = campos.get(k)
+            if conv is None:
+                if extras is None:
+                    extras = {}
+                extras[k] = v
+                continue
+            try:
+                valores[k] = conv[0](v)
+            except (TypeError, ValueError) as e:
+                raise ErroModelo(f"{cls.__name__}.{k}: {e}") from None
+        presentes = None
+        if len(valores) < len(campos):
+            chave = tuple(valores)
+            presentes = cls._CONJUNTOS.get(chave)
+            if presentes is None:
+                presentes = cls._CONJUNTOS.setdefault(chave, frozenset(chave))
+        return cls(extras=extras, _presentes=presentes, **valores)
+
+    def para_json(self) -> Dict[str, Any]:
+        d = {}
+        presentes = self._presentes
+        for nome, (_, saida) in self._CAMPOS.items():
+            v = getattr(self, nome)
+            if presentes is not None and nome not in presentes and v == self._PADROES[nome]():
+                continue
+            d[nome] = v if saida is None else saida(v)
+        if self.extras:
+            d.update(self.extras)
+        return d
+
+
+def modelo(cls):
+    cls = dataclass(slots=True)(cls)
+    proprios = [f for f in fields(cls) if f.name not in ("extras", "_presentes")]
+    cls._CAMPOS = {f.name: _conversores(f.type) for f in proprios}
+    cls._DIRETOS = {f.name: f.type for f in proprios if f.type in (str, float, int, bool)}
+    cls._PADROES = {
+        f.name: f.default_factory if f.default is MISSING else (lambda v=f.default: v) for f in proprios
+    }
+    cls._CONJUNTOS = {}
+    return cls
+
+
+# ---------- partes aninhadas ----------
+@modelo
+class ItemLinha(Registro):
+    descricao: str = ""
+    qtd: float = 0.0
+    valor_unit: float = 0.0
+
+    @property
+    def total(self) -> float:
+        return self.qtd * self.valor_unit
+
+
+@modelo
+class Itens(Registro):
+    servicos: List[ItemLinha] = field(default_factory=list)
+    materiais: List[ItemLinha] = field(default_factory=list)
+    terceiros: List[ItemLinha] = field(default_factory=list)
+
+
+@modelo
+class Totais(Registro):
+    servicos: float = 0.0
+    materiais: float = 0.0
+    terceiros: float = 0.0
+    geral: float = 0.0
+
+
+@modelo
+class ItemChecklist(Registro):
+    ref_id: str = ""
+    nome: str = ""
+    ok: bool = False
+    obs: str = ""
+
+
+@modelo
+class Checklist(Registro):
+    status: str = "NAO_CRIADO"
+    itens: List[ItemChecklist] = field(default_factory=list)  # Produto
+    secoes: Dict[str, List[ItemChecklist]] = field(default_factory=dict)  # Molde
+    riscos: str = ""
+    pendencias: str = ""
+    decisoes: str = ""
+    aprovacao: str = ""
+
+
+@modelo
+class LancamentoHoras(Registro):
+    quando: str = ""
+    horas: str = ""  # como digitado: "2h30", "0h45"
+    descricao: str = ""
+
+
+# ---------- coleções ----------
+@modelo
+class Cliente(Registro):
+    id: str = ""
+    nome: str = ""
+    documento: str = ""
+    telefone: str = ""
+    email: str = ""
+    cidade: str = ""
+    observacoes: str = ""
+    created_at: str = ""
+    updated_at: str = ""
+
+
+@modelo
+class Orcamento(Registro):
+    id: str = ""
+    doc: str = ""
+    cliente_id: str = ""
+    titulo: str = ""
+    validade_dias: int = 0
+    itens: Itens = field(default_factory=Itens)
+    totais: Totais = field(default_factory=Totais)
+    observacoes: str = ""
+    status: str = ""
+    pv_id: str = ""
+    os_id: str = ""
+    created_at: str = ""
+    updated_at: str = ""
+
+
+@modelo
+class PedidoVenda(Registro):
+    id: str = ""
+    doc: str = ""
+    orc_id: str = ""
+    orc_doc: str = ""
+    cliente_id: str = ""
+    cliente_nome: str = ""
+    titulo: str = ""
+    validade_dias: int = 0
+    itens: Itens = field(default_factory=Itens)
+    totais: Totais = field(default_factory=Totais)
+    observacoes: str = ""
+    status: str = ""
+    created_at: str = ""
+    updated_at: str = ""
+
+
+@modelo
+class OrdemServico(Registro):
+    id: str = ""
+    doc: str = ""
+    pv_id: str = ""
+    pv_doc: str = ""
+    orc_id: str = ""
+    orc_doc: str = ""
+    cliente_id: str = ""
+    cliente_nome: str = ""
+    titulo: str = ""
+    status: str = ""
+    horas: List[LancamentoHoras] = field(default_factory=list)
+    compras: list = field(default_factory=list)
+    anexos: list = field(default_factory=list)
+    checklists: Dict[str, Checklist] = field(default_factory=dict)
+    created_at: str = ""
+    updated_at: str = ""
+
+
+# coleção -> modelo dos registros
+MODELOS = {
+    "clientes": Cliente,
+    "orcamentos": Orcamento,
+    "vendas_pv": PedidoVenda,
+    "ordens_servico": OrdemServico,
+}
+
+
+def de_json(name: str, registro: Dict[str, Any]) -> Registro:
+    return MODELOS[name].de_json(registro)
@@ -1,16 +1,57 @@
+import os
+import threading
 from datetime import datetime
-from src.data.storage_json import load, save
+
+from src.data import storage_json
+from src.data.storage import BACKEND, get, put, transacao
+from utils.trava_arquivo import trava_arquivo
 
 DB_SEQ = "sequencias"
 
+# Cada processo reserva um bloco de números por vez (uma ida ao disco a cada
+# BLOCO documentos). O valor gravado é o último número já reservado, então dois
+# processos nunca recebem o mesmo número; números de um bloco não usado (processo
+# encerrado) ficam como lacuna. PLASTCALC_SEQ_BLOCO=1 = sem lacunas.
+BLOCO = max(1, int(os.environ.get("PLASTCALC_SEQ_BLOCO", "10")))
+
+_blocos = {}  # chave -> [próximo número, último do bloco]
+_blocos_lock = threading.Lock()
+
+
+def _reservar_bloco(key: str, n: int) -> int:
+    """
+    Reserva n números para a chave; devolve o último número reservado.
+    """
+    if BACKEND == "sqlite":
+        # BEGIN IMMEDIATE trava a escrita no banco: leitura + gravação atômicas
+        with transacao():
+            teto = int(get(DB_SEQ, key, 0)) + n
+            put(DB_SEQ, key, teto)
+        return teto
+
+    # JSON: lê sem cache e regrava o arquivo (pequeno) inteiro, sob a trava
+    # exclusiva entre processos (data/sequencias.lock); `save` não entra em lotes
+    # de `transacao()` e, com imediato=True, nem na fila do write-behind: grava
+    # já aqui dentro
+    with trava_arquivo(storage_json.DATA_DIR / f"{DB_SEQ}.lock"):
+        db = storage_json.load(DB_SEQ, usar_cache=False)  # ex.: {"ORC-2026": 12}
+        teto = int(db.get(key, 0)) + n
+        db[key] = teto
+        storage_json.save(DB_SEQ, db, imediato=True)
+    return teto
+
+
 def next_doc(prefixo: str, ano: int | None = None) -> str:
     if ano is None:
         ano = datetime.now().year
 
-    db = load(DB_SEQ)  # ex.: {"ORC-2026": 12}
     key = f"{prefixo}-{ano}"
-    atual = int(db.get(key, 0)) + 1
-    db[key] = atual
-    save(DB_SEQ, db)
+    with _blocos_lock:
+        bloco = _blocos.get(key)
+        if bloco is None or bloco[0] > bloco[1]:
+            teto = _reservar_bloco(key, BLOCO)
+            bloco = _blocos[key] = [teto - BLOCO + 1, teto]
+        atual = bloco[0]
+        bloco[0] += 1
 
     return f"{prefixo}-{ano}-{atual:04d}"
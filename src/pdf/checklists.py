@@ -0,0 +1,90 @@
+"""
+PDFs dos checklists da OS (Produto e Molde), fora do Streamlit: usados pela
+página de Operação, pela exportação em lote e pela CLI.
+"""
+from typing import Any, Dict, List, Tuple
+
+from reportlab.lib.units import mm
+from reportlab.platypus import Paragraph, Spacer, Table
+
+from src.pdf.motor import ESTILO_CHECKLIST, agora, bloco_texto, estilos, renderizar, tabela_meta
+
+
+def _cabecalho(titulo: str, os_item: dict, checklist: dict, styles) -> list:
+    story = [Paragraph(titulo, styles["Title"]), Spacer(1, 8)]
+
+    meta = [
+        ["OS", os_item.get("doc", "")],
+        ["Cliente", os_item.get("cliente_nome", "")],
+        ["Título", os_item.get("titulo", "")],
+        ["Status OS", os_item.get("status", "")],
+        ["Aprovação", checklist.get("aprovacao", "") or "-"],
+        ["Gerado em", agora()],
+    ]
+    story.append(tabela_meta(meta))
+    story.append(Spacer(1, 10))
+    return story
+
+
+def _tabela_itens(itens: list) -> Table:
+    # Mantém igual visualmente (não imprime ref_id no PDF por enquanto)
+    data = [["OK", "Item", "Observação"]]
+    for it in itens:
+        ok = "✔" if it.get("ok") else ""
+        data.append([ok, it.get("nome", ""), it.get("obs", "")])
+
+    t = Table(data, colWidths=[10 * mm, 70 * mm, 105 * mm])
+    t.setStyle(ESTILO_CHECKLIST)
+    return t
+
+
+def _blocos_texto(checklist: dict, espaco: int) -> list:
+    story = []
+    for label, campo in (("Riscos", "riscos"), ("Pendências", "pendencias"), ("Decisões", "decisoes")):
+        story.extend(bloco_texto(label, checklist.get(campo, ""), espaco))
+    return story
+
+
+def historia_checklist_produto(os_item: dict, checklist: dict, styles) -> list:
+    story = _cabecalho("Ata Técnica — Projeto de Produto (Checklist Produto)", os_item, checklist, styles)
+    story.append(Paragraph("Itens do Checklist", styles["Heading2"]))
+    story.append(Spacer(1, 6))
+    story.append(_tabela_itens(checklist.get("itens", []) or []))
+    story.append(Spacer(1, 10))
+    return story + _blocos_texto(checklist, 8)
+
+
+def historia_checklist_molde(os_item: dict, checklist: dict, styles) -> list:
+    story = _cabecalho("Ata Técnica — Projeto de Molde (Checklist Molde)", os_item, checklist, styles)
+    for secao, itens in checklist.get("secoes", {}).items():
+        story.append(Paragraph(secao, styles["Heading2"]))
+        story.append(_tabela_itens(itens))
+        story.append(Spacer(1, 8))
+    return story + _blocos_texto(checklist, 6)
+
+
+def build_checklist_produto_pdf(os_item: dict, checklist: dict) -> bytes:
+    return renderizar(historia_checklist_produto(os_item, checklist, estilos()), "Checklist Produto")
+
+
+def build_checklist_molde_pdf(os_item: dict, checklist: dict) -> bytes:
+    return renderizar(historia_checklist_molde(os_item, checklist, estilos()), "Checklist Molde")
+
+
+# tipo -> (rótulo, função do PDF, função da história)
+CHECKLISTS = {
+    "produto": ("Produto", build_checklist_produto_pdf, historia_checklist_produto),
+    "molde": ("Molde", build_checklist_molde_pdf, historia_checklist_molde),
+}
+
+
+def checklists_criados(os_item: Dict[str, Any]) -> List[Tuple[str, dict]]:
+    """
+    (tipo, checklist) dos checklists já criados na OS, na ordem de CHECKLISTS.
+    """
+    checklists = os_item.get("checklists", {}) or {}
+    return [
+        (tipo, checklists[tipo])
+        for tipo in CHECKLISTS
+        if isinstance(checklists.get(tipo), dict) and checklists[tipo].get("status") == "CRIADO"
+    ]
@@ -0,0 +1,147 @@
+"""
+Exportação em lote dos checklists das OS (fechamento do mês etc.).
+
+- ZIP: um PDF por checklist (<OS>/Checklist_<Tipo>_<OS>.pdf), montados em
+  processos paralelos e gravados no ZIP à medida que ficam prontos; só uma
+  janela de OS fica em memória por vez.
+- PDF único: todos os checklists num documento só, montado num processo e
+  inteiro em memória (o ReportLab só grava no fim): por isso vai até
+  LIMITE_PDF_UNICO OS; acima disso, ZIP.
+
+OS concluídas que já foram para o arquivo morto também entram. Na página,
+exportações acima de LIMITE_DOWNLOAD_BYTES não passam pelo navegador (o
+download_button carrega o arquivo inteiro na memória): ficam gravadas em
+PASTA_EXPORTACOES.
+"""
+import os
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from reportlab.platypus import PageBreak
+
+from src.data import arquivo
+from src.data.storage import buscar_ids, get, indice
+from src.data.storage_json import DATA_DIR
+from src.pdf.checklists import CHECKLISTS, checklists_criados
+from src.pdf.motor import documento_a4, estilos
+
+DB_OS = "ordens_servico"
+LIMITE_PDF_UNICO = 200
+LIMITE_DOWNLOAD_BYTES = 50 * 2**20
+PASTA_EXPORTACOES = DATA_DIR / "exportacoes"
+
+
+def selecionar_os(status: Optional[List[str]] = None, de: str = "", ate: str = "") -> List[str]:
+    """
+    Ids das OS (vivas e arquivadas) com algum dos status (todos se vazio) e
+    atualizadas entre `de` e `ate` ("AAAA-MM-DD", inclusive; vazio = sem
+    limite), em ordem de número.
+    """
+    vivas = indice(DB_OS)
+    resumo = {**arquivo.indice(DB_OS), **vivas}
+    if status:
+        # vivas pelo índice secundário; arquivadas pelo resumo do arquivo
+        ids = {k for s in status for k in buscar_ids(DB_OS, status=s)}
+        resumo = {
+            k: v for k, v in resumo.items()
+            if k in ids or (k not in vivas and v.get("status") in status)
+        }
+    escolhidas = []
+    for k, v in resumo.items():
+        dia = (v.get("updated_at") or "")[:10]
+        if de and dia < de:
+            continue
+        if ate and dia > ate:
+            continue
+        escolhidas.append(k)
+    return sorted(escolhidas, key=lambda k: resumo[k].get("doc") or "")
+
+
+def pdfs_da_os(os_item: Dict[str, Any]) -> List[Tuple[str, bytes]]:
+    """
+    (caminho no ZIP, PDF) de cada checklist criado da OS. Roda no processo
+    trabalhador: só recebe o registro e devolve bytes.
+    """
+    doc = os_item.get("doc") or os_item.get("id", "OS")
+    saida = []
+    for tipo, checklist in checklists_criados(os_item):
+        rotulo, montar, _ = CHECKLISTS[tipo]
+        saida.append((f"{doc}/Checklist_{rotulo}_{doc}.pdf", montar(os_item, checklist)))
+    return saida
+
+
+def exportar_zip(
+    ids: Iterable[str],
+    destino,
+    workers: Optional[int] = None,
+    progresso: Optional[Callable[[int], None]] = None,
+) -> int:
+    """
+    Grava os PDFs das OS em `destino` (caminho ou arquivo binário) como ZIP.
+    Cada OS é lida só quando entra na janela de trabalho (2 por worker).
+    Retorna quantos PDFs foram gravados.
+    """
+    workers = workers or max(1, (os.cpu_count() or 2) - 1)
+    ids = iter(ids)
+    gravados = feitas = 0
+
+    def proxima():
+        for os_id in ids:
+            registro = get(DB_OS, os_id)
+            if registro is not None:
+                return registro
+        return None
+
+    with zipfile.ZipFile(destino, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        if workers == 1:
+            while (registro := proxima()) is not None:
+                for nome, pdf in pdfs_da_os(registro):
+                    zf.writestr(nome, pdf)
+                    gravados += 1
+                feitas += 1
+                if progresso:
+                    progresso(feitas)
+            return gravados
+
+        with ProcessPoolExecutor(max_workers=workers) as ex:
+            pendentes = set()
+            while True:
+                while len(pendentes) < 2 * workers and (registro := proxima()) is not None:
+                    pendentes.add(ex.submit(pdfs_da_os, registro))
+                if not pendentes:
+                    break
+                prontas, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                for fut in prontas:
+                    for nome, pdf in fut.result():
+                        zf.writestr(nome, pdf)
+                        gravados += 1
+                    feitas += 1
+                    if progresso:
+                        progresso(feitas)
+    return gravados
+
+
+def exportar_pdf_unico(ids: Iterable[str], destino) -> int:
+    """
+    Todos os checklists das OS num PDF só (uma quebra de página entre eles).
+    Retorna quantos checklists entraram. ValueError acima de LIMITE_PDF_UNICO OS.
+    """
+    ids = list(ids)
+    if len(ids) > LIMITE_PDF_UNICO:
+        raise ValueError(f"PDF único vai até {LIMITE_PDF_UNICO} OS ({len(ids)} selecionadas): use o ZIP.")
+    styles = estilos()
+    story = []
+    total = 0
+    for os_id in ids:
+        registro = get(DB_OS, os_id)
+        if registro is None:
+            continue
+        for tipo, checklist in checklists_criados(registro):
+            if story:
+                story.append(PageBreak())
+            story.extend(CHECKLISTS[tipo][2](registro, checklist, styles))
+            total += 1
+    if total:
+        documento_a4(destino, "Checklists").build(story)
+    return total
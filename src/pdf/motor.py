@@ -0,0 +1,257 @@
+"""
+Motor dos documentos PDF (ReportLab): estilos e estilos de tabela montados uma
+vez por processo, modelo A4 e os documentos de Orçamento, PV e OS a partir dos
+registros gravados. Os checklists (src/pdf/checklists.py) usam as mesmas peças.
+
+Tabelas de itens longas saem em pedaços de LINHAS_POR_TABELA linhas (cabeçalho
+repetido a cada página): dividir uma tabela única de milhares de linhas custa
+muito mais ao ReportLab do que emendar tabelas menores.
+"""
+import threading
+from datetime import datetime
+from io import BytesIO
+from typing import Any, Dict, List
+from xml.sax.saxutils import escape
+
+from reportlab.lib import colors
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.lib.units import mm
+from reportlab.platypus import Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+from utils.formatacao import format_pt
+
+BLOCOS_ITENS = [
+    ("servicos", "Serviços"),
+    ("materiais", "Materiais / Insumos"),
+    ("terceiros", "Terceiros / Outros"),
+]
+LINHAS_POR_TABELA = 100
+DESCRICAO_CURTA = 60  # até aqui a descrição vai como texto simples (sem Paragraph)
+
+ESTILO_META = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (0, -1), colors.whitesmoke),
+        ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
+        ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+    ]
+)
+ESTILO_CHECKLIST = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("BOX", (0, 0), (-1, -1), 0.6, colors.black),
+        ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+    ]
+)
+ESTILO_ITENS = TableStyle(
+    [
+        ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
+        ("BOX", (0, 0), (-1, -1), 0.6, colors.black),
+        ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("FONTSIZE", (0, 0), (-1, -1), 8),
+        ("VALIGN", (0, 0), (-1, -1), "TOP"),
+        ("ALIGN", (2, 1), (-1, -1), "RIGHT"),
+    ]
+)
+ESTILO_TOTAIS = TableStyle(
+    [
+        ("BOX", (0, 0), (-1, -1), 0.6, colors.black),
+        ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
+        ("FONTSIZE", (0, 0), (-1, -1), 9),
+        ("ALIGN", (1, 0), (1, -1), "RIGHT"),
+        ("BACKGROUND", (0, -1), (-1, -1), colors.whitesmoke),
+        ("FONTNAME", (0, -1), (-1, -1), "Helvetica-Bold"),
+    ]
+)
+LARGURAS_ITENS = [10 * mm, 95 * mm, 20 * mm, 30 * mm, 30 * mm]
+
+_estilos = None
+_estilos_lock = threading.Lock()
+
+
+def agora() -> str:
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+
+
+def estilos():
+    """
+    Folha de estilos do ReportLab (com os estilos próprios), criada uma vez.
+    """
+    global _estilos
+    with _estilos_lock:
+        if _estilos is None:
+            ss = getSampleStyleSheet()
+            ss.add(ParagraphStyle("Celula", parent=ss["BodyText"], fontSize=8, leading=10))
+            _estilos = ss
+    return _estilos
+
+
+def documento_a4(destino, titulo: str) -> SimpleDocTemplate:
+    return SimpleDocTemplate(
+        destino,
+        pagesize=A4,
+        leftMargin=15 * mm,
+        rightMargin=15 * mm,
+        topMargin=15 * mm,
+        bottomMargin=15 * mm,
+        title=titulo,
+    )
+
+
+def renderizar(story: list, titulo: str) -> bytes:
+    buf = BytesIO()
+    documento_a4(buf, titulo).build(story)
+    return buf.getvalue()
+
+
+def dinheiro(x: float) -> str:
+    return f"R$ {format_pt(x)}"
+
+
+def _num(valor) -> float:
+    try:
+        return float(valor or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def tabela_meta(linhas: List[List[Any]]) -> Table:
+    t = Table(linhas, colWidths=[35 * mm, 150 * mm])
+    t.setStyle(ESTILO_META)
+    return t
+
+
+def bloco_texto(label: str, texto: str, espaco: int = 8) -> list:
+    est = estilos()
+    return [
+        Paragraph(label, est["Heading3"]),
+        Paragraph(escape(texto or "-").replace("\n", "<br/>"), est["BodyText"]),
+        Spacer(1, espaco),
+    ]
+
+
+def tabelas_itens(itens: List[Dict[str, Any]]) -> List[Table]:
+    """
+    Itens (descricao, qtd, valor_unit) em tabelas de até LINHAS_POR_TABELA
+    linhas. Descrição curta vai como texto simples; só a longa vira Paragraph
+    (que quebra linha, mas custa bem mais para medir).
+    """
+    celula = estilos()["Celula"]
+    linhas = []
+    for i, row in enumerate(itens, start=1):
+        descricao = str(row.get("descricao") or "")
+        if len(descricao) > DESCRICAO_CURTA:
+            descricao = Paragraph(escape(descricao), celula)
+        qtd, unit = _num(row.get("qtd")), _num(row.get("valor_unit"))
+        linhas.append([str(i), descricao, format_pt(qtd), dinheiro(unit), dinheiro(qtd * unit)])
+
+    cabecalho = ["#", "Descrição", "Qtd", "Valor unit", "Total"]
+    tabelas = []
+    for inicio in range(0, len(linhas), LINHAS_POR_TABELA):
+        t = Table([cabecalho] + linhas[inicio:inicio + LINHAS_POR_TABELA], colWidths=LARGURAS_ITENS, repeatRows=1)
+        t.setStyle(ESTILO_ITENS)
+        tabelas.append(t)
+    return tabelas
+
+
+def _historia_itens(registro: Dict[str, Any]) -> list:
+    est = estilos()
+    story = []
+    itens = registro.get("itens", {}) or {}
+    subtotais = {}
+    for chave, rotulo in BLOCOS_ITENS:
+        bloco = itens.get(chave) or []
+        subtotais[chave] = sum(_num(r.get("qtd")) * _num(r.get("valor_unit")) for r in bloco)
+        if not bloco:
+            continue
+        story.append(Paragraph(rotulo, est["Heading2"]))
+        story.extend(tabelas_itens(bloco))
+        story.append(Spacer(1, 8))
+
+    totais = registro.get("totais", {}) or {}
+    linhas = [[rotulo, dinheiro(_num(totais.get(chave, subtotais[chave])))] for chave, rotulo in BLOCOS_ITENS]
+    linhas.append(["TOTAL", dinheiro(_num(totais.get("geral", sum(subtotais.values()))))])
+    t = Table(linhas, colWidths=[45 * mm, 40 * mm], hAlign="RIGHT")
+    t.setStyle(ESTILO_TOTAIS)
+    story.append(t)
+    story.append(Spacer(1, 10))
+    return story
+
+
+def historia_orcamento(orc: Dict[str, Any], cliente_nome: str = "") -> list:
+    est = estilos()
+    story = [Paragraph(f"Orçamento {orc.get('doc', '')}", est["Title"]), Spacer(1, 8)]
+    story.append(tabela_meta([
+        ["Cliente", cliente_nome or orc.get("cliente_nome", "")],
+        ["Título", orc.get("titulo", "")],
+        ["Status", orc.get("status", "")],
+        ["Validade", f"{orc.get('validade_dias', '')} dias"],
+        ["Criado em", orc.get("created_at", "")],
+        ["Gerado em", agora()],
+    ]))
+    story.append(Spacer(1, 10))
+    story.extend(_historia_itens(orc))
+    story.extend(bloco_texto("Observações", orc.get("observacoes", "")))
+    return story
+
+
+def historia_pv(pv: Dict[str, Any]) -> list:
+    est = estilos()
+    story = [Paragraph(f"Pedido de Venda {pv.get('doc', '')}", est["Title"]), Spacer(1, 8)]
+    story.append(tabela_meta([
+        ["Cliente", pv.get("cliente_nome", "")],
+        ["Título", pv.get("titulo", "")],
+        ["Orçamento", pv.get("orc_doc", "")],
+        ["Status", pv.get("status", "")],
+        ["Criado em", pv.get("created_at", "")],
+        ["Gerado em", agora()],
+    ]))
+    story.append(Spacer(1, 10))
+    story.extend(_historia_itens(pv))
+    story.extend(bloco_texto("Observações", pv.get("observacoes", "")))
+    return story
+
+
+def historia_os(os_item: Dict[str, Any]) -> list:
+    est = estilos()
+    story = [Paragraph(f"Ordem de Serviço {os_item.get('doc', '')}", est["Title"]), Spacer(1, 8)]
+    checklists = os_item.get("checklists", {}) or {}
+    story.append(tabela_meta([
+        ["Cliente", os_item.get("cliente_nome", "")],
+        ["Título", os_item.get("titulo", "")],
+        ["Status", os_item.get("status", "")],
+        ["PV / Orçamento", f"{os_item.get('pv_doc', '')} / {os_item.get('orc_doc', '')}"],
+        ["Checklists", " • ".join(f"{k}: {(v or {}).get('status', '')}" for k, v in checklists.items()) or "-"],
+        ["Gerado em", agora()],
+    ]))
+    story.append(Spacer(1, 10))
+
+    horas = os_item.get("horas", []) or []
+    story.append(Paragraph("Horas lançadas", est["Heading2"]))
+    if horas:
+        linhas = [["Quando", "Horas", "Descrição"]]
+        for h in horas:
+            descricao = str(h.get("descricao") or "")
+            if len(descricao) > DESCRICAO_CURTA:
+                descricao = Paragraph(escape(descricao), est["Celula"])
+            linhas.append([h.get("quando", ""), h.get("horas", ""), descricao])
+        t = Table(linhas, colWidths=[40 * mm, 25 * mm, 120 * mm], repeatRows=1)
+        t.setStyle(ESTILO_CHECKLIST)
+        story.append(t)
+    else:
+        story.append(Paragraph("-", est["BodyText"]))
+    return story
+
+
+def pdf_orcamento(orc: Dict[str, Any], cliente_nome: str = "") -> bytes:
+    return renderizar(historia_orcamento(orc, cliente_nome), f"Orçamento {orc.get('doc', '')}")
+
+
+def pdf_pv(pv: Dict[str, Any]) -> bytes:
+    return renderizar(historia_pv(pv), f"Pedido de Venda {pv.get('doc', '')}")
+
+
+def pdf_os(os_item: Dict[str, Any]) -> bytes:
+    return renderizar(historia_os(os_item), f"Ordem de Serviço {os_item.get('doc', '')}")
@@ -0,0 +1,81 @@
+import math
+from typing import Any, Callable, Dict, List, Optional
+
+import streamlit as st
+
+TAMANHOS_PAGINA = [25, 50, 100]
+
+
+def _chave_ordem(valor: Any) -> tuple:
+    # números pelo valor, o resto como texto (sem diferenciar maiúsculas)
+    if isinstance(valor, (int, float)) and not isinstance(valor, bool):
+        return (0, valor, "")
+    return (1, 0, str(valor or "").lower())
+
+
+def lista_paginada(
+    chave: str,
+    linhas: List[Dict[str, Any]],
+    colunas: Dict[str, str],
+    ordem_padrao: str,
+    decrescente: bool = False,
+    rotulo: Optional[Callable[[Dict[str, Any]], str]] = None,
+) -> Optional[str]:
+    """
+    Lista compacta com filtro, ordenação e paginação (tudo feito aqui, antes de
+    desenhar): só a página atual vira tabela. Devolve o id escolhido em "Abrir"
+    (ou None); quem chama monta o detalhe só desse registro.
+
+    linhas:  projeção leve dos registros, cada uma com "id" + os campos da tabela
+             (campos extras, sem coluna, também entram no filtro)
+    colunas: campo -> título da coluna
+    """
+    col_f, col_o, col_d, col_t = st.columns([3, 2, 1, 1])
+    filtro = col_f.text_input("Filtrar", key=f"{chave}_filtro", placeholder="Qualquer coluna...")
+    campos = list(colunas)
+    ordem = col_o.selectbox(
+        "Ordenar por", campos, index=campos.index(ordem_padrao),
+        format_func=lambda c: colunas[c], key=f"{chave}_ordem",
+    )
+    desc = col_d.checkbox("Decrescente", value=decrescente, key=f"{chave}_desc")
+    tamanho = col_t.selectbox("Por página", TAMANHOS_PAGINA, key=f"{chave}_tamanho")
+
+    if filtro.strip():
+        termo = filtro.strip().lower()
+        linhas = [
+            linha for linha in linhas
+            if termo in " ".join(str(v) for k, v in linha.items() if k != "id" and v is not None).lower()
+        ]
+    linhas = sorted(linhas, key=lambda linha: _chave_ordem(linha.get(ordem)), reverse=desc)
+
+    total = len(linhas)
+    paginas = max(1, math.ceil(total / tamanho))
+    chave_pagina = f"{chave}_pagina"
+    # o filtro pode ter encolhido a lista: volta para uma página que existe
+    st.session_state[chave_pagina] = min(max(1, int(st.session_state.get(chave_pagina, 1))), paginas)
+    col_p, col_c = st.columns([1, 3])
+    pagina = int(col_p.number_input("Página", min_value=1, max_value=paginas, step=1, key=chave_pagina))
+    inicio = (pagina - 1) * tamanho
+    visiveis = linhas[inicio:inicio + tamanho]
+    col_c.caption(f"Total: {total} • página {pagina} de {paginas}")
+
+    if not visiveis:
+        return None
+
+    st.dataframe(
+        [{titulo: linha.get(campo) for campo, titulo in colunas.items()} for linha in visiveis],
+        use_container_width=True,
+        hide_index=True,
+    )
+
+    if rotulo is None:
+        rotulo = lambda linha: " • ".join(str(linha.get(c) or "") for c in campos[:3])
+    por_id = {linha["id"]: linha for linha in visiveis}
+    return st.selectbox(
+        "Abrir",
+        list(por_id),
+        index=None,
+        format_func=lambda k: rotulo(por_id[k]),
+        placeholder="Selecione um registro da página",
+        key=f"{chave}_sel",
+    )
@@ -1,23 +1,28 @@
 import streamlit as st
 from datetime import datetime
-from io import BytesIO
+import os
 import re
+import shutil
+import tempfile
 import unicodedata
 
-from src.data.storage_json import load, save
+from src.data import arquivo
+from src.data.storage import buscar_ids, get, indice, put
+from src.ui.lista import lista_paginada
+from src.ui.pdf_sob_demanda import botao_pdf
 
 # NOVO: ref_id do Produto (você já criou esse arquivo)
 from data.checklist_ref_ids import CHECKLIST_PRODUTO
 
-# PDF (ReportLab)
-from reportlab.lib.pagesizes import A4
-from reportlab.lib import colors
-from reportlab.lib.units import mm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet
+# PDF (ReportLab) dos checklists e da OS
+from src.pdf.checklists import CHECKLISTS, build_checklist_molde_pdf, build_checklist_produto_pdf, checklists_criados
+from src.pdf.motor import pdf_os
+from src.pdf.lote import (
+    LIMITE_DOWNLOAD_BYTES, LIMITE_PDF_UNICO, PASTA_EXPORTACOES, exportar_pdf_unico, exportar_zip, selecionar_os,
+)
 
 DB_OS = "ordens_servico"
-
+STATUS_OS = ["ABERTA", "EM_ANDAMENTO", "PAUSADA", "CONCLUIDA"]
 
 def _now() -> str:
     return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
@@ -47,10 +52,10 @@ def _slugify(texto: str) -> str:
 # -----------------------------
 # Estrutura base (OS -> checklists)
 # -----------------------------
-def _ensure_checklists_struct(os_db: dict, os_id: str):
-    os_db[os_id].setdefault("checklists", {})
+def _ensure_checklists_struct(os_item: dict):
+    os_item.setdefault("checklists", {})
 
-    os_db[os_id]["checklists"].setdefault(
+    os_item["checklists"].setdefault(
         "produto",
         {
             "status": "NAO_CRIADO",  # NAO_CRIADO / CRIADO
@@ -62,7 +67,7 @@ def _ensure_checklists_struct(os_db: dict, os_id: str):
         },
     )
 
-    os_db[os_id]["checklists"].setdefault(
+    os_item["checklists"].setdefault(
         "molde",
         {
             "status": "NAO_CRIADO",  # NAO_CRIADO / CRIADO
@@ -74,13 +79,13 @@ def _ensure_checklists_struct(os_db: dict, os_id: str):
         },
     )
 
-    os_db[os_id].setdefault("horas", [])
+    os_item.setdefault("horas", [])
 
 
 # -----------------------------
 # Checklist Produto (com ref_id)
 # -----------------------------
-def _init_checklist_produto_items(os_db: dict, os_id: str):
+def _init_checklist_produto_items(os_item: dict):
     """
     Cria o checklist do Produto com ref_id.
 
@@ -88,7 +93,7 @@ def _init_checklist_produto_items(os_db: dict, os_id: str):
     - se os itens já existirem mas não tiverem ref_id,
       ele adiciona ref_id pelo nome do item.
     """
-    prod = os_db[os_id]["checklists"]["produto"]
+    prod = os_item["checklists"]["produto"]
 
     # Mapa titulo -> ref_id vindo do seu arquivo data/checklist_ref_ids.py
     mapa = {x["titulo"]: x["ref_id"] for x in CHECKLIST_PRODUTO}
@@ -123,81 +128,6 @@ def _init_checklist_produto_items(os_db: dict, os_id: str):
     return
 
 
-def _build_checklist_produto_pdf(os_item: dict, checklist: dict) -> bytes:
-    buf = BytesIO()
-    doc = SimpleDocTemplate(
-        buf,
-        pagesize=A4,
-        leftMargin=15 * mm,
-        rightMargin=15 * mm,
-        topMargin=15 * mm,
-        bottomMargin=15 * mm,
-        title="Checklist Produto",
-    )
-    styles = getSampleStyleSheet()
-    story = []
-
-    story.append(Paragraph("Ata Técnica — Projeto de Produto (Checklist Produto)", styles["Title"]))
-    story.append(Spacer(1, 8))
-
-    meta = [
-        ["OS", os_item.get("doc", "")],
-        ["Cliente", os_item.get("cliente_nome", "")],
-        ["Título", os_item.get("titulo", "")],
-        ["Status OS", os_item.get("status", "")],
-        ["Aprovação", checklist.get("aprovacao", "") or "-"],
-        ["Gerado em", _now()],
-    ]
-    t_meta = Table(meta, colWidths=[35 * mm, 150 * mm])
-    t_meta.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (0, -1), colors.whitesmoke),
-                ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
-                ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("FONTSIZE", (0, 0), (-1, -1), 9),
-            ]
-        )
-    )
-    story.append(t_meta)
-    story.append(Spacer(1, 10))
-
-    story.append(Paragraph("Itens do Checklist", styles["Heading2"]))
-    story.append(Spacer(1, 6))
-
-    # Mantém igual visualmente (não imprime ref_id no PDF por enquanto)
-    data = [["OK", "Item", "Observação"]]
-    for it in checklist.get("itens", []) or []:
-        ok = "✔" if it.get("ok") else ""
-        data.append([ok, it.get("nome", ""), it.get("obs", "")])
-
-    t = Table(data, colWidths=[10 * mm, 70 * mm, 105 * mm])
-    t.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                ("BOX", (0, 0), (-1, -1), 0.6, colors.black),
-                ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("FONTSIZE", (0, 0), (-1, -1), 9),
-            ]
-        )
-    )
-    story.append(t)
-    story.append(Spacer(1, 10))
-
-    def add_block(label: str, text: str):
-        story.append(Paragraph(label, styles["Heading3"]))
-        story.append(Paragraph((text or "-").replace("\n", "<br/>"), styles["BodyText"]))
-        story.append(Spacer(1, 8))
-
-    add_block("Riscos", checklist.get("riscos", ""))
-    add_block("Pendências", checklist.get("pendencias", ""))
-    add_block("Decisões", checklist.get("decisoes", ""))
-
-    doc.build(story)
-    return buf.getvalue()
-
-
 # -----------------------------
 # Checklist Molde (seções)
 # -----------------------------
@@ -252,12 +182,12 @@ SECAO_DOCUMENTACAO = [
 ]
 
 
-def _init_checklist_molde(os_db: dict, os_id: str):
+def _init_checklist_molde(os_item: dict):
     """
     Cria checklist do Molde com ref_id para cada item.
     Também migra OS antigas (se não tiver ref_id, adiciona).
     """
-    molde = os_db[os_id]["checklists"]["molde"]
+    molde = os_item["checklists"]["molde"]
 
     def make_items(lista, prefixo):
         items = []
@@ -297,277 +227,325 @@ def _init_checklist_molde(os_db: dict, os_id: str):
     return
 
 
-def _build_checklist_molde_pdf(os_item: dict, checklist: dict) -> bytes:
-    buf = BytesIO()
-    doc = SimpleDocTemplate(
-        buf,
-        pagesize=A4,
-        leftMargin=15 * mm,
-        rightMargin=15 * mm,
-        topMargin=15 * mm,
-        bottomMargin=15 * mm,
-        title="Checklist Molde",
-    )
-    styles = getSampleStyleSheet()
-    story = []
-
-    story.append(Paragraph("Ata Técnica — Projeto de Molde (Checklist Molde)", styles["Title"]))
-    story.append(Spacer(1, 8))
-
-    meta = [
-        ["OS", os_item.get("doc", "")],
-        ["Cliente", os_item.get("cliente_nome", "")],
-        ["Título", os_item.get("titulo", "")],
-        ["Status OS", os_item.get("status", "")],
-        ["Aprovação", checklist.get("aprovacao", "") or "-"],
-        ["Gerado em", _now()],
-    ]
-    t_meta = Table(meta, colWidths=[35 * mm, 150 * mm])
-    t_meta.setStyle(
-        TableStyle(
-            [
-                ("BACKGROUND", (0, 0), (0, -1), colors.whitesmoke),
-                ("BOX", (0, 0), (-1, -1), 0.5, colors.black),
-                ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                ("FONTSIZE", (0, 0), (-1, -1), 9),
-            ]
-        )
-    )
-    story.append(t_meta)
-    story.append(Spacer(1, 10))
-
-    for secao, itens in checklist.get("secoes", {}).items():
-        story.append(Paragraph(secao, styles["Heading2"]))
-        data = [["OK", "Item", "Observação"]]
-        for it in itens:
-            ok = "✔" if it.get("ok") else ""
-            data.append([ok, it.get("nome", ""), it.get("obs", "")])
-
-        t = Table(data, colWidths=[10 * mm, 70 * mm, 105 * mm])
-        t.setStyle(
-            TableStyle(
-                [
-                    ("BACKGROUND", (0, 0), (-1, 0), colors.lightgrey),
-                    ("BOX", (0, 0), (-1, -1), 0.6, colors.black),
-                    ("INNERGRID", (0, 0), (-1, -1), 0.25, colors.grey),
-                    ("FONTSIZE", (0, 0), (-1, -1), 9),
-                ]
-            )
-        )
-        story.append(t)
-        story.append(Spacer(1, 8))
-
-    def add_block(label, txt):
-        story.append(Paragraph(label, styles["Heading3"]))
-        story.append(Paragraph((txt or "-").replace("\n", "<br/>"), styles["BodyText"]))
-        story.append(Spacer(1, 6))
-
-    add_block("Riscos", checklist.get("riscos", ""))
-    add_block("Pendências", checklist.get("pendencias", ""))
-    add_block("Decisões", checklist.get("decisoes", ""))
-
-    doc.build(story)
-    return buf.getvalue()
+def _conteudo_checklist(os_item: dict, checklist: dict) -> dict:
+    # cabeçalho da OS que aparece no PDF + checklist inteiro
+    return {"os": {c: os_item.get(c) for c in ("doc", "cliente_nome", "titulo", "status")}, "checklist": checklist}
 
 
 # -----------------------------
 # UI – Operação (com TABS)
 # -----------------------------
+def _exportacao_em_lote():
+    with st.expander("📦 Exportar checklists em lote"):
+        status = st.multiselect("Status", STATUS_OS, default=["CONCLUIDA"], key="lote_status")
+        colD, colA, colF = st.columns(3)
+        de = colD.date_input("Alteradas de", value=None, key="lote_de")
+        ate = colA.date_input("até", value=None, key="lote_ate")
+        formato = colF.radio("Formato", ["ZIP (um PDF por checklist)", "PDF único"], key="lote_formato")
+
+        if not st.button("Gerar exportação", key="lote_gerar"):
+            return
+        ids = selecionar_os(status, de.isoformat() if de else "", ate.isoformat() if ate else "")
+        if not ids:
+            st.info("Nenhuma OS no filtro.")
+            return
+
+        zip_ = formato.startswith("ZIP")
+        if not zip_ and len(ids) > LIMITE_PDF_UNICO:
+            st.error(f"PDF único vai até {LIMITE_PDF_UNICO} OS ({len(ids)} no filtro): use o ZIP ou estreite o filtro.")
+            return
+        nome = f"checklists_{datetime.now():%Y%m%d_%H%M}{'.zip' if zip_ else '.pdf'}"
+        # gravado em arquivo temporário (não em memória); o try/finally apaga se der erro
+        tmp = tempfile.NamedTemporaryFile(prefix="checklists-", suffix=".zip" if zip_ else ".pdf", delete=False)
+        tmp.close()
+        try:
+            barra = st.progress(0.0, text=f"0/{len(ids)} OS")
+            if zip_:
+                n = exportar_zip(ids, tmp.name, progresso=lambda feitas: barra.progress(feitas / len(ids), text=f"{feitas}/{len(ids)} OS"))
+            else:
+                n = exportar_pdf_unico(ids, tmp.name)
+            barra.progress(1.0, text=f"{len(ids)} OS • {n} checklist(s)")
+            if not n:
+                st.info("Nenhum checklist criado nessas OS.")
+                return
+            tamanho = os.path.getsize(tmp.name)
+            if tamanho > LIMITE_DOWNLOAD_BYTES:
+                # o download_button guardaria o arquivo inteiro na memória do servidor
+                PASTA_EXPORTACOES.mkdir(parents=True, exist_ok=True)
+                destino = PASTA_EXPORTACOES / nome
+                shutil.move(tmp.name, destino)
+                st.warning(
+                    f"Exportação com {tamanho / 2**20:.0f} MB (acima de {LIMITE_DOWNLOAD_BYTES // 2**20} MB "
+                    f"para baixar pela página): gravada no servidor em `{destino}`. "
+                    "Estreite o filtro ou use `python -m src.cli.exportar_checklists`."
+                )
+                return
+            with open(tmp.name, "rb") as f:
+                st.download_button(
+                    "⬇️ Baixar exportação",
+                    data=f.read(),
+                    file_name=nome,
+                    mime="application/zip" if zip_ else "application/pdf",
+                    key="lote_baixar",
+                )
+        finally:
+            if os.path.exists(tmp.name):
+                os.unlink(tmp.name)
+
+
 def page_operacao():
     st.header("Operação / Ordem de Serviço")
+    _exportacao_em_lote()
+
+    # lista só com o índice (doc, cliente, status...); a OS inteira é lida ao abrir
+    resumo = vivas = indice(DB_OS)
+    colF, colArq = st.columns([3, 1])
+    status_filtro = colF.selectbox("Status", ["Todas"] + STATUS_OS)
+    if colArq.checkbox("Incluir OS arquivadas", help="OS concluídas que já foram para o arquivo morto."):
+        # índice do arquivo (pequeno); a OS arquivada só é lida se for aberta
+        resumo = {**arquivo.indice(DB_OS), **resumo}
+    if status_filtro != "Todas":
+        # ids pelo índice secundário de status; arquivadas pelo resumo delas
+        ids_status = set(buscar_ids(DB_OS, status=status_filtro))
+        resumo = {k: v for k, v in resumo.items() if k in ids_status or (v.get("ano") and v.get("status") == status_filtro)}
+    if not resumo:
+        st.info("Nenhuma OS encontrada ainda.")
+        return
 
-    os_db = load(DB_OS)
-    items = list(os_db.values())
-    items.sort(key=lambda x: x.get("doc", ""), reverse=True)
+    # só a página atual vira tabela; checklists, horas e PDFs só da OS aberta
+    os_sel = lista_paginada(
+        "operacao",
+        [{"id": k, **v} for k, v in resumo.items()],
+        {"doc": "Documento", "cliente_nome": "Cliente", "titulo": "Título", "status": "Status", "updated_at": "Atualizada em"},
+        ordem_padrao="doc",
+        decrescente=True,
+        rotulo=lambda r: f"{r.get('doc','')} • {r.get('cliente_nome','')} • {r.get('status','')}",
+    )
+    if os_sel is None:
+        return
+    registro = get(DB_OS, os_sel)
+    if registro is None:
+        st.warning("OS não encontrada (pode ter sido excluída). Recarregue a página.")
+        return
 
-    if not items:
-        st.info("Nenhuma OS encontrada ainda.")
+    arquivada = os_sel not in vivas
+    st.markdown(
+        f"### {registro.get('doc','')} • {registro.get('cliente_nome','')} • {registro.get('status','')}"
+        f"{' • arquivada' if arquivada else ''}"
+    )
+    if arquivada:
+        # gravar aqui poria a OS de volta na coleção viva, com a cópia antiga
+        # ainda no arquivo: arquivada é só consulta
+        _detalhe_os_arquivada(os_sel, registro)
         return
+    _detalhe_os(os_sel, registro)
 
-    for o in items:
-        with st.expander(f"{o.get('doc','')} • {o.get('cliente_nome','')} • {o.get('status','')}"):
-            os_id = o.get("id", "")
-            if not os_id:
-                continue
-
-            _ensure_checklists_struct(os_db, os_id)
-
-            # sempre trabalhe com o objeto “vivo” do banco
-            os_live = os_db[os_id]
-            prod = os_live["checklists"]["produto"]
-            molde = os_live["checklists"]["molde"]
-
-            tab_prod, tab_molde, tab_horas, tab_os = st.tabs(["📦 Produto", "🧰 Molde", "⏱️ Horas", "⚙️ OS"])
-
-            # ----------------- TAB OS -----------------
-            with tab_os:
-                st.subheader("Dados da OS")
-                st.write(f"**OS:** {os_live.get('doc','')}")
-                st.write(f"**Cliente:** {os_live.get('cliente_nome','')}")
-                st.write(f"**Título:** {os_live.get('titulo','')}")
-                st.write(f"**PV:** {os_live.get('pv_doc','')}")
-                st.write(f"**ORC:** {os_live.get('orc_doc','')}")
-                st.write(f"**Criado em:** {os_live.get('created_at','')}")
-                st.write(f"**Atualizado em:** {os_live.get('updated_at','')}")
-
-                st.divider()
-                st.subheader("Status da OS")
-                status_opts = ["ABERTA", "EM_ANDAMENTO", "PAUSADA", "CONCLUIDA"]
-                status_atual = os_live.get("status", "ABERTA")
-                if status_atual not in status_opts:
-                    status_atual = "ABERTA"
-
-                novo_status = st.selectbox(
-                    "Status", status_opts, index=status_opts.index(status_atual), key=f"status_{os_id}"
-                )
 
-                if st.button("Salvar status", key=f"save_status_{os_id}"):
-                    os_db[os_id]["status"] = novo_status
-                    os_db[os_id]["updated_at"] = _now()
-                    save(DB_OS, os_db)
-                    st.success("Status atualizado!")
-                    st.rerun()
-
-            # ----------------- TAB HORAS -----------------
-            with tab_horas:
-                st.subheader("Apontamento de horas")
-
-                col1, col2 = st.columns(2)
-                horas_txt = col1.text_input("Horas (ex.: 2h30, 1h, 0h45)", key=f"horas_txt_{os_id}")
-                desc = col2.text_input("Descrição", placeholder="Ex.: Ajustes CAD / Reunião / DFM", key=f"horas_desc_{os_id}")
-
-                if st.button("Lançar horas", key=f"add_horas_{os_id}"):
-                    os_db[os_id].setdefault("horas", [])
-                    os_db[os_id]["horas"].append({"quando": _now(), "horas": horas_txt.strip(), "descricao": desc.strip()})
-                    os_db[os_id]["updated_at"] = _now()
-                    save(DB_OS, os_db)
-                    st.success("Horas lançadas!")
-                    st.rerun()
-
-                horas = os_db.get(os_id, {}).get("horas", [])
-                st.divider()
-                if horas:
-                    st.write("**Lançamentos:**")
-                    st.dataframe(horas, use_container_width=True)
-                else:
-                    st.caption("Nenhuma hora lançada ainda.")
-
-            # ----------------- TAB PRODUTO -----------------
-            with tab_prod:
-                st.subheader("Checklist Produto")
-                st.write(f"Status: **{prod.get('status','')}**")
-
-                if prod.get("status") != "CRIADO":
-                    if st.button("🧩 Criar Checklist Produto", key=f"mk_prod_{os_id}"):
-                        os_db[os_id]["checklists"]["produto"]["status"] = "CRIADO"
-                        _init_checklist_produto_items(os_db, os_id)
-                        os_db[os_id]["updated_at"] = _now()
-                        save(DB_OS, os_db)
-                        st.success("Checklist Produto criado!")
-                        st.rerun()
-                else:
-                    _init_checklist_produto_items(os_db, os_id)
-                    prod = os_db[os_id]["checklists"]["produto"]  # recarrega
-
-                    for item in prod["itens"]:
-                        rid = item.get("ref_id", "sem_ref_id")
-                        colA, colB = st.columns([1, 3])
-                        with colA:
-                            item["ok"] = st.checkbox(
-                                item["nome"],
-                                value=item.get("ok", False),
-                                key=f"prod_ok_{os_id}_{rid}",
-                            )
-                        with colB:
-                            item["obs"] = st.text_input(
-                                "Observação",
-                                value=item.get("obs", ""),
-                                key=f"prod_obs_{os_id}_{rid}",
-                            )
-
-                    prod["riscos"] = st.text_area("Riscos", value=prod.get("riscos", ""), key=f"prod_r_{os_id}")
-                    prod["pendencias"] = st.text_area("Pendências", value=prod.get("pendencias", ""), key=f"prod_p_{os_id}")
-                    prod["decisoes"] = st.text_area("Decisões", value=prod.get("decisoes", ""), key=f"prod_d_{os_id}")
-
-                    aprov_opts = ["", "APROVADO", "APROVADO COM RESSALVAS", "REPROVADO"]
-                    aprov_val = prod.get("aprovacao", "")
-                    if aprov_val not in aprov_opts:
-                        aprov_val = ""
-                    prod["aprovacao"] = st.selectbox("Aprovação", aprov_opts, index=aprov_opts.index(aprov_val), key=f"prod_a_{os_id}")
-
-                    colS1, colS2 = st.columns(2)
-                    if colS1.button("💾 Salvar Produto", key=f"save_prod_{os_id}"):
-                        os_db[os_id]["updated_at"] = _now()
-                        save(DB_OS, os_db)
-                        st.success("Checklist Produto salvo!")
-                        st.rerun()
-
-                    pdf_bytes = _build_checklist_produto_pdf(os_db[os_id], prod)
-                    colS2.download_button(
-                        "📄 Baixar PDF Produto",
-                        data=pdf_bytes,
-                        file_name=f"Checklist_Produto_{os_db[os_id].get('doc','OS')}.pdf",
-                        mime="application/pdf",
-                        key=f"dl_prod_{os_id}",
-                    )
+def _detalhe_os_arquivada(os_id: str, os_item: dict):
+    st.caption("OS arquivada: somente leitura.")
+    st.write(f"**Título:** {os_item.get('titulo','')}")
+    st.write(f"**PV:** {os_item.get('pv_doc','')} • **ORC:** {os_item.get('orc_doc','')}")
+    st.write(f"**Criado em:** {os_item.get('created_at','')} • **Atualizado em:** {os_item.get('updated_at','')}")
+
+    horas = os_item.get("horas", [])
+    if horas:
+        st.write("**Lançamentos:**")
+        st.dataframe(horas, use_container_width=True)
+
+    criados = checklists_criados(os_item)
+    cols = st.columns(len(criados) + 1)
+    botao_pdf(
+        cols[0], "OS", os_item, lambda: pdf_os(os_item),
+        f"OS_{os_item.get('doc','OS')}.pdf", f"dl_os_{os_id}",
+    )
+    for col, (tipo, checklist) in zip(cols[1:], criados):
+        rotulo, montar, _ = CHECKLISTS[tipo]
+        botao_pdf(
+            col, rotulo, _conteudo_checklist(os_item, checklist),
+            lambda montar=montar, checklist=checklist: montar(os_item, checklist),
+            f"Checklist_{rotulo}_{os_item.get('doc','OS')}.pdf", f"dl_{tipo}_{os_id}",
+        )
+
+
+def _detalhe_os(os_id: str, os_live: dict):
+    """
+    Abas da OS aberta (checklists, horas, status e PDFs), sobre o próprio
+    registro: os botões de salvar gravam `os_live` inteiro com put().
+    """
+    _ensure_checklists_struct(os_live)
+    prod = os_live["checklists"]["produto"]
+    molde = os_live["checklists"]["molde"]
+
+    tab_prod, tab_molde, tab_horas, tab_os = st.tabs(["📦 Produto", "🧰 Molde", "⏱️ Horas", "⚙️ OS"])
+
+    # ----------------- TAB OS -----------------
+    with tab_os:
+        st.subheader("Dados da OS")
+        st.write(f"**OS:** {os_live.get('doc','')}")
+        st.write(f"**Cliente:** {os_live.get('cliente_nome','')}")
+        st.write(f"**Título:** {os_live.get('titulo','')}")
+        st.write(f"**PV:** {os_live.get('pv_doc','')}")
+        st.write(f"**ORC:** {os_live.get('orc_doc','')}")
+        st.write(f"**Criado em:** {os_live.get('created_at','')}")
+        st.write(f"**Atualizado em:** {os_live.get('updated_at','')}")
+
+        st.divider()
+        st.subheader("Status da OS")
+        status_opts = STATUS_OS
+        status_atual = os_live.get("status", "ABERTA")
+        if status_atual not in status_opts:
+            status_atual = "ABERTA"
+
+        novo_status = st.selectbox(
+            "Status", status_opts, index=status_opts.index(status_atual), key=f"status_{os_id}"
+        )
 
-            # ----------------- TAB MOLDE -----------------
-            with tab_molde:
-                st.subheader("Checklist Molde")
-                st.write(f"Status: **{molde.get('status','')}**")
-
-                if molde.get("status") != "CRIADO":
-                    if st.button("🧩 Criar Checklist Molde", key=f"mk_molde_{os_id}"):
-                        os_db[os_id]["checklists"]["molde"]["status"] = "CRIADO"
-                        _init_checklist_molde(os_db, os_id)
-                        os_db[os_id]["updated_at"] = _now()
-                        save(DB_OS, os_db)
-                        st.success("Checklist Molde criado!")
-                        st.rerun()
-                else:
-                    _init_checklist_molde(os_db, os_id)
-                    molde = os_db[os_id]["checklists"]["molde"]  # recarrega
-
-                    for secao, itens in molde["secoes"].items():
-                        st.markdown(f"### {secao}")
-                        for it in itens:
-                            rid = it.get("ref_id", "sem_ref_id")
-                            colA, colB = st.columns([1, 3])
-                            with colA:
-                                it["ok"] = st.checkbox(
-                                    it["nome"],
-                                    value=it.get("ok", False),
-                                    key=f"{os_id}_{rid}_ok",
-                                )
-                            with colB:
-                                it["obs"] = st.text_input(
-                                    "Observação",
-                                    value=it.get("obs", ""),
-                                    key=f"{os_id}_{rid}_obs",
-                                )
-
-                    molde["riscos"] = st.text_area("Riscos", value=molde.get("riscos", ""), key=f"mol_r_{os_id}")
-                    molde["pendencias"] = st.text_area("Pendências", value=molde.get("pendencias", ""), key=f"mol_p_{os_id}")
-                    molde["decisoes"] = st.text_area("Decisões", value=molde.get("decisoes", ""), key=f"mol_d_{os_id}")
-
-                    aprov_opts = ["", "APROVADO", "APROVADO COM RESSALVAS", "REPROVADO"]
-                    aprov_val = molde.get("aprovacao", "")
-                    if aprov_val not in aprov_opts:
-                        aprov_val = ""
-                    molde["aprovacao"] = st.selectbox("Aprovação", aprov_opts, index=aprov_opts.index(aprov_val), key=f"mol_a_{os_id}")
-
-                    colM1, colM2 = st.columns(2)
-                    if colM1.button("💾 Salvar Molde", key=f"save_molde_{os_id}"):
-                        os_db[os_id]["updated_at"] = _now()
-                        save(DB_OS, os_db)
-                        st.success("Checklist Molde salvo!")
-                        st.rerun()
-
-                    pdf_bytes = _build_checklist_molde_pdf(os_db[os_id], molde)
-                    colM2.download_button(
-                        "📄 Baixar PDF Molde",
-                        data=pdf_bytes,
-                        file_name=f"Checklist_Molde_{os_db[os_id].get('doc','OS')}.pdf",
-                        mime="application/pdf",
-                        key=f"dl_molde_{os_id}",
+        if st.button("Salvar status", key=f"save_status_{os_id}"):
+            os_live["status"] = novo_status
+            os_live["updated_at"] = _now()
+            put(DB_OS, os_id, os_live)
+            st.success("Status atualizado!")
+            st.rerun()
+
+        botao_pdf(
+            st, "OS", os_live, lambda: pdf_os(os_live),
+            f"OS_{os_live.get('doc','OS')}.pdf", f"dl_os_{os_id}",
+        )
+
+    # ----------------- TAB HORAS -----------------
+    with tab_horas:
+        st.subheader("Apontamento de horas")
+
+        col1, col2 = st.columns(2)
+        horas_txt = col1.text_input("Horas (ex.: 2h30, 1h, 0h45)", key=f"horas_txt_{os_id}")
+        desc = col2.text_input("Descrição", placeholder="Ex.: Ajustes CAD / Reunião / DFM", key=f"horas_desc_{os_id}")
+
+        if st.button("Lançar horas", key=f"add_horas_{os_id}"):
+            os_live.setdefault("horas", [])
+            os_live["horas"].append({"quando": _now(), "horas": horas_txt.strip(), "descricao": desc.strip()})
+            os_live["updated_at"] = _now()
+            put(DB_OS, os_id, os_live)
+            st.success("Horas lançadas!")
+            st.rerun()
+
+        horas = os_live.get("horas", [])
+        st.divider()
+        if horas:
+            st.write("**Lançamentos:**")
+            st.dataframe(horas, use_container_width=True)
+        else:
+            st.caption("Nenhuma hora lançada ainda.")
+
+    # ----------------- TAB PRODUTO -----------------
+    with tab_prod:
+        st.subheader("Checklist Produto")
+        st.write(f"Status: **{prod.get('status','')}**")
+
+        if prod.get("status") != "CRIADO":
+            if st.button("🧩 Criar Checklist Produto", key=f"mk_prod_{os_id}"):
+                os_live["checklists"]["produto"]["status"] = "CRIADO"
+                _init_checklist_produto_items(os_live)
+                os_live["updated_at"] = _now()
+                put(DB_OS, os_id, os_live)
+                st.success("Checklist Produto criado!")
+                st.rerun()
+        else:
+            _init_checklist_produto_items(os_live)
+            prod = os_live["checklists"]["produto"]  # recarrega
+
+            for item in prod["itens"]:
+                rid = item.get("ref_id", "sem_ref_id")
+                colA, colB = st.columns([1, 3])
+                with colA:
+                    item["ok"] = st.checkbox(
+                        item["nome"],
+                        value=item.get("ok", False),
+                        key=f"prod_ok_{os_id}_{rid}",
                     )
+                with colB:
+                    item["obs"] = st.text_input(
+                        "Observação",
+                        value=item.get("obs", ""),
+                        key=f"prod_obs_{os_id}_{rid}",
+                    )
+
+            prod["riscos"] = st.text_area("Riscos", value=prod.get("riscos", ""), key=f"prod_r_{os_id}")
+            prod["pendencias"] = st.text_area("Pendências", value=prod.get("pendencias", ""), key=f"prod_p_{os_id}")
+            prod["decisoes"] = st.text_area("Decisões", value=prod.get("decisoes", ""), key=f"prod_d_{os_id}")
+
+            aprov_opts = ["", "APROVADO", "APROVADO COM RESSALVAS", "REPROVADO"]
+            aprov_val = prod.get("aprovacao", "")
+            if aprov_val not in aprov_opts:
+                aprov_val = ""
+            prod["aprovacao"] = st.selectbox("Aprovação", aprov_opts, index=aprov_opts.index(aprov_val), key=f"prod_a_{os_id}")
+
+            colS1, colS2 = st.columns(2)
+            if colS1.button("💾 Salvar Produto", key=f"save_prod_{os_id}"):
+                os_live["updated_at"] = _now()
+                put(DB_OS, os_id, os_live)
+                st.success("Checklist Produto salvo!")
+                st.rerun()
+
+            botao_pdf(
+                colS2, "Produto", _conteudo_checklist(os_live, prod),
+                lambda: build_checklist_produto_pdf(os_live, prod),
+                f"Checklist_Produto_{os_live.get('doc','OS')}.pdf", f"dl_prod_{os_id}",
+            )
+
+    # ----------------- TAB MOLDE -----------------
+    with tab_molde:
+        st.subheader("Checklist Molde")
+        st.write(f"Status: **{molde.get('status','')}**")
+
+        if molde.get("status") != "CRIADO":
+            if st.button("🧩 Criar Checklist Molde", key=f"mk_molde_{os_id}"):
+                os_live["checklists"]["molde"]["status"] = "CRIADO"
+                _init_checklist_molde(os_live)
+                os_live["updated_at"] = _now()
+                put(DB_OS, os_id, os_live)
+                st.success("Checklist Molde criado!")
+                st.rerun()
+        else:
+            _init_checklist_molde(os_live)
+            molde = os_live["checklists"]["molde"]  # recarrega
+
+            for secao, itens in molde["secoes"].items():
+                st.markdown(f"### {secao}")
+                for it in itens:
+                    rid = it.get("ref_id", "sem_ref_id")
+                    colA, colB = st.columns([1, 3])
+                    with colA:
+                        it["ok"] = st.checkbox(
+                            it["nome"],
+                            value=it.get("ok", False),
+                            key=f"{os_id}_{rid}_ok",
+                        )
+                    with colB:
+                        it["obs"] = st.text_input(
+                            "Observação",
+                            value=it.get("obs", ""),
+                            key=f"{os_id}_{rid}_obs",
+                        )
+
+            molde["riscos"] = st.text_area("Riscos", value=molde.get("riscos", ""), key=f"mol_r_{os_id}")
+            molde["pendencias"] = st.text_area("Pendências", value=molde.get("pendencias", ""), key=f"mol_p_{os_id}")
+            molde["decisoes"] = st.text_area("Decisões", value=molde.get("decisoes", ""), key=f"mol_d_{os_id}")
+
+            aprov_opts = ["", "APROVADO", "APROVADO COM RESSALVAS", "REPROVADO"]
+            aprov_val = molde.get("aprovacao", "")
+            if aprov_val not in aprov_opts:
+                aprov_val = ""
+            molde["aprovacao"] = st.selectbox("Aprovação", aprov_opts, index=aprov_opts.index(aprov_val), key=f"mol_a_{os_id}")
+
+            colM1, colM2 = st.columns(2)
+            if colM1.button("💾 Salvar Molde", key=f"save_molde_{os_id}"):
+                os_live["updated_at"] = _now()
+                put(DB_OS, os_id, os_live)
+                st.success("Checklist Molde salvo!")
+                st.rerun()
+
+            botao_pdf(
+                colM2, "Molde", _conteudo_checklist(os_live, molde),
+                lambda: build_checklist_molde_pdf(os_live, molde),
+                f"Checklist_Molde_{os_live.get('doc','OS')}.pdf", f"dl_molde_{os_id}",
+            )
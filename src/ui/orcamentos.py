@@ -2,13 +2,18 @@ import streamlit as st
 from datetime import datetime
 from uuid import uuid4
 
-from src.data.storage_json import load, save
+from src.data import arquivo
+from src.data.storage import buscar_ids, delete, get, indice, put, transacao
 from src.models.sequencias import next_doc
+from src.pdf.motor import pdf_orcamento, pdf_pv
+from src.ui.lista import lista_paginada
+from src.ui.pdf_sob_demanda import botao_pdf
 
 DB_ORC = "orcamentos"
 DB_PV = "vendas_pv"
 DB_OS = "ordens_servico"
 DB_CLIENTES = "clientes"
+STATUS_ORC = ["RASCUNHO", "ENVIADO", "APROVADO"]
 
 
 def _now() -> str:
@@ -67,8 +72,8 @@ def _editor_items(name: str, title: str, version: int):
     return st.session_state[data_key]
 
 
-def _cliente_nome(clientes_db, cliente_id: str) -> str:
-    c = clientes_db.get(cliente_id, {})
+def _cliente_nome(clientes_idx, cliente_id: str) -> str:
+    c = clientes_idx.get(cliente_id, {})
     return c.get("nome", "(cliente não encontrado)")
 
 
@@ -78,12 +83,12 @@ def page_orcamentos():
     st.session_state.setdefault("orc_editor_v", 1)
     v = st.session_state["orc_editor_v"]
 
-    clientes_db = load(DB_CLIENTES)
-    orc_db = load(DB_ORC)
-    pv_db = load(DB_PV)
-    os_db = load(DB_OS)
+    # listas só com os índices (nome/cidade dos clientes; doc, status, total...
+    # dos orçamentos); o orçamento inteiro é lido ao abrir
+    clientes_idx = indice(DB_CLIENTES)
+    orc_idx = indice(DB_ORC)
 
-    clientes_lista = list(clientes_db.values())
+    clientes_lista = [{"id": k, **c} for k, c in clientes_idx.items()]
     clientes_lista.sort(key=lambda c: c.get("nome", "").lower())
 
     tab1, tab2 = st.tabs(["📋 Lista", "➕ Novo orçamento"])
@@ -141,7 +146,7 @@ def page_orcamentos():
                 oid = str(uuid4())[:8]
                 status = "ENVIADO" if salvar_enviar else "RASCUNHO"
 
-                orc_db[oid] = {
+                novo = {
                     "id": oid,
                     "doc": doc,
                     "cliente_id": cliente_id,
@@ -165,7 +170,7 @@ def page_orcamentos():
                     "created_at": _now(),
                     "updated_at": _now(),
                 }
-                save(DB_ORC, orc_db)
+                put(DB_ORC, oid, novo)
 
                 st.session_state["orc_servicos_data"] = []
                 st.session_state["orc_materiais_data"] = []
@@ -180,132 +185,180 @@ def page_orcamentos():
     # -------------------------
     with tab1:
         st.subheader("Lista de orçamentos")
-        q = st.text_input("Buscar", placeholder="ORC-2026-0001, cliente, título...")
-
-        items = list(orc_db.values())
-
-        for o in items:
-            o["_cliente_nome"] = _cliente_nome(clientes_db, o.get("cliente_id", ""))
-
-        if q.strip():
-            q2 = q.strip().lower()
-            items = [
-                o for o in items
-                if q2 in ((o.get("doc","") + " " + o.get("_cliente_nome","") + " " + o.get("titulo","")).lower())
+        colS, colArq = st.columns([3, 1])
+        status_filtro = colS.selectbox("Status", ["Todos"] + STATUS_ORC)
+        incluir_arquivados = colArq.checkbox("Incluir arquivados", help="Procura também nos anos já arquivados (mais lento).")
+
+        # status vem do índice secundário, sem varrer a coleção
+        filtros = {} if status_filtro == "Todos" else {"status": status_filtro}
+        if filtros:
+            items = [{"id": k, **orc_idx[k]} for k in buscar_ids(DB_ORC, **filtros) if k in orc_idx]
+        else:
+            items = [{"id": k, **v} for k, v in orc_idx.items()]
+        if incluir_arquivados:
+            # arquivo morto só é lido aqui; somente leitura
+            items += [
+                {**o, "totais.geral": (o.get("totais") or {}).get("geral")}
+                for o in arquivo.buscar(DB_ORC, lambda o: o.get("id") not in orc_idx and all(o.get(c) == v for c, v in filtros.items()))
             ]
 
-        items.sort(key=lambda x: x.get("doc", ""), reverse=True)
-        st.caption(f"Total: {len(items)}")
-
         if not items:
             st.info("Nenhum orçamento encontrado.")
             return
 
-        for o in items:
-            total = float(o.get("totais", {}).get("geral", 0.0) or 0.0)
-            cliente_nome = o.get("_cliente_nome", "")
-            with st.expander(f"{o.get('doc','')} • {cliente_nome} • {_money(total)}"):
-                st.write(f"**Título:** {o.get('titulo','')}")
-                st.write(f"**Status:** {o.get('status','')}")
-                st.write(f"**Criado em:** {o.get('created_at','')}")
-                st.write(f"**Observações:** {o.get('observacoes','') or '-'}")
-
-                st.divider()
-                st.markdown("### Itens")
-                col1, col2, col3 = st.columns(3)
-                col1.write("**Serviços**")
-                col1.dataframe(o.get("itens", {}).get("servicos", []), use_container_width=True)
-                col2.write("**Materiais**")
-                col2.dataframe(o.get("itens", {}).get("materiais", []), use_container_width=True)
-                col3.write("**Terceiros**")
-                col3.dataframe(o.get("itens", {}).get("terceiros", []), use_container_width=True)
-
-                st.divider()
-                st.markdown("### Fluxo do MVP (PV e OS)")
-
-                pv_id = o.get("pv_id") or ""
-                os_id = o.get("os_id") or ""
-
-                colA, colB, colC = st.columns(3)
-
-                # 1) Gerar PV (snapshot)
-                if not pv_id:
-                    if colA.button("✅ Gerar PV (aprovar)", key=f"gerar_pv_{o['id']}"):
-                        pv_doc = next_doc("PV")
-                        pvid = str(uuid4())[:8]
-                        pv_db[pvid] = {
-                            "id": pvid,
-                            "doc": pv_doc,
-                            "orc_id": o["id"],
-                            "orc_doc": o.get("doc",""),
-                            "cliente_id": o.get("cliente_id",""),
-                            "cliente_nome": cliente_nome,
-                            "titulo": o.get("titulo",""),
-                            "validade_dias": o.get("validade_dias", 0),
-                            "itens": o.get("itens", {}),
-                            "totais": o.get("totais", {}),
-                            "observacoes": o.get("observacoes",""),
-                            "status": "ABERTO",
-                            "created_at": _now(),
-                            "updated_at": _now(),
-                        }
-                        save(DB_PV, pv_db)
-
-                        orc_db[o["id"]]["pv_id"] = pvid
-                        orc_db[o["id"]]["status"] = "APROVADO"
-                        orc_db[o["id"]]["updated_at"] = _now()
-                        save(DB_ORC, orc_db)
-
-                        st.success(f"PV gerado: {pv_doc}")
-                        st.rerun()
-                else:
-                    pv = pv_db.get(pv_id, {})
-                    colA.success(f"PV: {pv.get('doc','(não encontrado)')}")
-
-                # 2) Gerar OS
-                if pv_id and not os_id:
-                    if colB.button("🧾 Gerar OS", key=f"gerar_os_{o['id']}"):
-                        os_doc = next_doc("OS")
-                        osid = str(uuid4())[:8]
-
-                        # puxa PV pra garantir snapshot
-                        pv = pv_db.get(pv_id, {})
-                        os_db[osid] = {
-                            "id": osid,
-                            "doc": os_doc,
-                            "pv_id": pv_id,
-                            "pv_doc": pv.get("doc",""),
-                            "orc_id": o["id"],
-                            "orc_doc": o.get("doc",""),
-                            "cliente_id": o.get("cliente_id",""),
-                            "cliente_nome": cliente_nome,
-                            "titulo": pv.get("titulo", o.get("titulo","")),
-                            "status": "ABERTA",
-                            "horas": [],
-                            "compras": [],
-                            "anexos": [],
-                            "checklists": {
-                                "produto": {"status": "NAO_CRIADO", "itens": []},
-                                "molde": {"status": "NAO_CRIADO", "itens": []},
-                            },
-                            "created_at": _now(),
-                            "updated_at": _now(),
-                        }
-                        save(DB_OS, os_db)
-
-                        orc_db[o["id"]]["os_id"] = osid
-                        orc_db[o["id"]]["updated_at"] = _now()
-                        save(DB_ORC, orc_db)
-
-                        st.success(f"OS gerada: {os_doc}")
-                        st.rerun()
-                elif os_id:
-                    osx = os_db.get(os_id, {})
-                    colB.success(f"OS: {osx.get('doc','(não encontrado)')}")
-
-                # 3) Ações simples
-                if colC.button("🗑️ Excluir orçamento", key=f"excluir_{o['id']}"):
-                    del orc_db[o["id"]]
-                    save(DB_ORC, orc_db)
-                    st.success("Excluído!")
-                    st.rerun()
+        # só a página atual vira tabela; itens, PV e OS só do orçamento aberto
+        linhas = [
+            {
+                "id": o["id"],
+                "doc": o.get("doc") or "",
+                "cliente": _cliente_nome(clientes_idx, o.get("cliente_id") or ""),
+                "titulo": o.get("titulo") or "",
+                "status": (o.get("status") or "") + ("" if o["id"] in orc_idx else " (arquivado)"),
+                "total": float(o.get("totais.geral") or 0.0),
+            }
+            for o in items
+        ]
+        sel = lista_paginada(
+            "orcamentos",
+            linhas,
+            {"doc": "Documento", "cliente": "Cliente", "titulo": "Título", "status": "Status", "total": "Total (R$)"},
+            ordem_padrao="doc",
+            decrescente=True,
+        )
+        if sel is None:
+            return
+
+        o = get(DB_ORC, sel)
+        if o is None:
+            st.warning("Orçamento não encontrado (pode ter sido excluído).")
+            return
+        arquivado = sel not in orc_idx
+        total = float(o.get("totais", {}).get("geral", 0.0) or 0.0)
+        cliente_nome = _cliente_nome(clientes_idx, o.get("cliente_id", ""))
+        st.markdown(f"### {o.get('doc','')} • {cliente_nome} • {_money(total)}{' • arquivado' if arquivado else ''}")
+
+        st.write(f"**Título:** {o.get('titulo','')}")
+        st.write(f"**Status:** {o.get('status','')}")
+        st.write(f"**Criado em:** {o.get('created_at','')}")
+        st.write(f"**Observações:** {o.get('observacoes','') or '-'}")
+
+        st.divider()
+        st.markdown("### Itens")
+        col1, col2, col3 = st.columns(3)
+        col1.write("**Serviços**")
+        col1.dataframe(o.get("itens", {}).get("servicos", []), use_container_width=True)
+        col2.write("**Materiais**")
+        col2.dataframe(o.get("itens", {}).get("materiais", []), use_container_width=True)
+        col3.write("**Terceiros**")
+        col3.dataframe(o.get("itens", {}).get("terceiros", []), use_container_width=True)
+
+        colP1, colP2 = st.columns(2)
+        botao_pdf(
+            colP1, "Orçamento", [o, cliente_nome], lambda: pdf_orcamento(o, cliente_nome),
+            f"Orcamento_{o.get('doc','ORC')}.pdf", f"dl_orc_{o['id']}",
+        )
+        pv = get(DB_PV, o["pv_id"]) if o.get("pv_id") else None
+        if pv:
+            botao_pdf(
+                colP2, "PV", pv, lambda: pdf_pv(pv),
+                f"PV_{pv.get('doc','PV')}.pdf", f"dl_pv_{o['id']}",
+            )
+
+        if arquivado:
+            st.caption("Orçamento arquivado: somente leitura.")
+            return
+
+        st.divider()
+        st.markdown("### Fluxo do MVP (PV e OS)")
+
+        pv_id = o.get("pv_id") or ""
+        os_id = o.get("os_id") or ""
+
+        colA, colB, colC = st.columns(3)
+
+        # 1) Gerar PV (snapshot)
+        if not pv_id:
+            if colA.button("✅ Gerar PV (aprovar)", key=f"gerar_pv_{o['id']}"):
+                pv_doc = next_doc("PV")
+                pvid = str(uuid4())[:8]
+                pv_novo = {
+                    "id": pvid,
+                    "doc": pv_doc,
+                    "orc_id": o["id"],
+                    "orc_doc": o.get("doc",""),
+                    "cliente_id": o.get("cliente_id",""),
+                    "cliente_nome": cliente_nome,
+                    "titulo": o.get("titulo",""),
+                    "validade_dias": o.get("validade_dias", 0),
+                    "itens": o.get("itens", {}),
+                    "totais": o.get("totais", {}),
+                    "observacoes": o.get("observacoes",""),
+                    "status": "ABERTO",
+                    "created_at": _now(),
+                    "updated_at": _now(),
+                }
+                o["pv_id"] = pvid
+                o["status"] = "APROVADO"
+                o["updated_at"] = _now()
+
+                # PV e orçamento atualizado num lote atômico: depois de uma
+                # queda, ou os dois estão gravados ou nenhum (o número do PV,
+                # já reservado, vira lacuna como a de um bloco não usado)
+                with transacao():
+                    put(DB_PV, pvid, pv_novo)
+                    put(DB_ORC, o["id"], o)
+
+                st.success(f"PV gerado: {pv_doc}")
+                st.rerun()
+        else:
+            pv = get(DB_PV, pv_id, {})
+            colA.success(f"PV: {pv.get('doc','(não encontrado)')}")
+
+        # 2) Gerar OS
+        if pv_id and not os_id:
+            if colB.button("🧾 Gerar OS", key=f"gerar_os_{o['id']}"):
+                os_doc = next_doc("OS")
+                osid = str(uuid4())[:8]
+
+                # puxa PV pra garantir snapshot
+                pv = get(DB_PV, pv_id, {})
+                os_nova = {
+                    "id": osid,
+                    "doc": os_doc,
+                    "pv_id": pv_id,
+                    "pv_doc": pv.get("doc",""),
+                    "orc_id": o["id"],
+                    "orc_doc": o.get("doc",""),
+                    "cliente_id": o.get("cliente_id",""),
+                    "cliente_nome": cliente_nome,
+                    "titulo": pv.get("titulo", o.get("titulo","")),
+                    "status": "ABERTA",
+                    "horas": [],
+                    "compras": [],
+                    "anexos": [],
+                    "checklists": {
+                        "produto": {"status": "NAO_CRIADO", "itens": []},
+                        "molde": {"status": "NAO_CRIADO", "itens": []},
+                    },
+                    "created_at": _now(),
+                    "updated_at": _now(),
+                }
+                o["os_id"] = osid
+                o["updated_at"] = _now()
+
+                # OS e orçamento atualizado num lote atômico
+                with transacao():
+                    put(DB_OS, osid, os_nova)
+                    put(DB_ORC, o["id"], o)
+
+                st.success(f"OS gerada: {os_doc}")
+                st.rerun()
+        elif os_id:
+            osx = get(DB_OS, os_id, {})
+            colB.success(f"OS: {osx.get('doc','(não encontrado)')}")
+
+        # 3) Ações simples
+        if colC.button("🗑️ Excluir orçamento", key=f"excluir_{o['id']}"):
+            delete(DB_ORC, o["id"])
+            st.success("Excluído!")
+            st.rerun()
@@ -0,0 +1,36 @@
+import hashlib
+import json
+from typing import Any, Callable
+
+from utils.cache_lru import CacheLRU
+
+# PDFs já montados (processo inteiro, todas as sessões), pela assinatura do
+# conteúdo: baixar de novo um documento que não mudou não chama o ReportLab
+CACHE_PDF = CacheLRU(max_itens=64, max_bytes=32 * 2**20, tamanho=len)
+
+
+def assinatura(tipo: str, conteudo: Any) -> str:
+    raw = json.dumps([tipo, conteudo], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def botao_pdf(col, tipo: str, conteudo: Any, montar: Callable[[], bytes], file_name: str, key: str):
+    """
+    PDF só sob demanda: "Gerar PDF" monta (ou acha no cache) e aí vira o botão
+    de download. Enquanto `conteudo` (tudo o que aparece no PDF) não muda, os
+    próximos reruns já mostram o download direto do cache, sem montar nada.
+    """
+    chave = assinatura(tipo, conteudo)
+    pdf_bytes = CACHE_PDF.get(chave)
+    if pdf_bytes is None:
+        if not col.button(f"📄 Gerar PDF {tipo}", key=f"gerar_{key}"):
+            return
+        pdf_bytes = montar()
+        CACHE_PDF.put(chave, pdf_bytes)
+    col.download_button(
+        f"📄 Baixar PDF {tipo}",
+        data=pdf_bytes,
+        file_name=file_name,
+        mime="application/pdf",
+        key=key,
+    )
@@ -0,0 +1,75 @@
+# utils/cache_lru.py
+
+import threading
+from collections import OrderedDict
+
+
+class CacheLRU:
+    """
+    Cache em memória (por processo) com descarte do item menos usado.
+
+    Limites opcionais:
+    - max_itens: quantidade de entradas
+    - max_bytes: soma de `tamanho(valor)` (ex.: len para bytes)
+
+    Seguro para uso entre sessões do Streamlit (threads do mesmo processo).
+    """
+
+    def __init__(self, max_itens: int | None = 128, max_bytes: int | None = None, tamanho=None):
+        self.max_itens = max_itens
+        self.max_bytes = max_bytes
+        self._tamanho = tamanho or (lambda valor: 0)
+        self._dados = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, chave, default=None):
+        with self._lock:
+            if chave not in self._dados:
+                self.misses += 1
+                return default
+            self._dados.move_to_end(chave)
+            self.hits += 1
+            return self._dados[chave]
+
+    def put(self, chave, valor) -> None:
+        with self._lock:
+            if chave in self._dados:
+                self._bytes -= self._tamanho(self._dados.pop(chave))
+            self._dados[chave] = valor
+            self._bytes += self._tamanho(valor)
+            self._descartar()
+
+    def pop(self, chave, default=None):
+        with self._lock:
+            if chave not in self._dados:
+                return default
+            valor = self._dados.pop(chave)
+            self._bytes -= self._tamanho(valor)
+            return valor
+
+    def clear(self) -> None:
+        with self._lock:
+            self._dados.clear()
+            self._bytes = 0
+
+    def _descartar(self) -> None:
+        # mantém sempre o item mais recente, mesmo que sozinho estoure max_bytes
+        while len(self._dados) > 1 and (
+            (self.max_itens is not None and len(self._dados) > self.max_itens)
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, valor = self._dados.popitem(last=False)
+            self._bytes -= self._tamanho(valor)
+
+    def __contains__(self, chave) -> bool:
+        with self._lock:
+            return chave in self._dados
+
+    def __len__(self) -> int:
+        return len(self._dados)
+
+    def stats(self) -> dict:
+        return {"itens": len(self._dados), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,8 @@
+# utils/formatacao.py
+
+def format_pt(value: float, decimals: int = 2) -> str:
+    """
+    Número no padrão brasileiro: 1.234,56
+    """
+    s = f"{value:,.{decimals}f}"
+    return s.replace(",", "X").replace(".", ",").replace("X", ".")
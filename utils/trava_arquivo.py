@@ -0,0 +1,45 @@
+# utils/trava_arquivo.py
+
+from contextlib import contextmanager
+
+
+@contextmanager
+def trava_arquivo(caminho, compartilhada: bool = False, esperar: bool = True):
+    """
+    Trava entre processos num arquivo auxiliar (criado se não existir).
+
+    compartilhada=True: várias ao mesmo tempo; a exclusiva espera todas saírem
+    (no Windows toda trava é exclusiva). esperar=False: não espera; o valor do
+    `with` diz se conseguiu a trava.
+    """
+    with open(caminho, "a+b") as f:
+        try:
+            import fcntl
+        except ImportError:  # Windows
+            import msvcrt
+
+            f.seek(0)
+            try:
+                msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if esperar else msvcrt.LK_NBLCK, 1)
+            except OSError:
+                if esperar:
+                    raise
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            return
+
+        modo = fcntl.LOCK_SH if compartilhada else fcntl.LOCK_EX
+        try:
+            fcntl.flock(f.fileno(), modo if esperar else modo | fcntl.LOCK_NB)
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(f.fileno(), fcntl.LOCK_UN)